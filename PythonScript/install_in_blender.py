@@ -13,15 +13,27 @@ import ctypes
 import json
 import os
 import subprocess
-import threading
 import time
 import shutil
 import tempfile
+import traceback
 from ctypes import wintypes
 
 import bpy
+from bpy.app.handlers import persistent
 from bpy.types import Operator, Panel
 
+from . import (
+    ipc_transport,
+    layout_codec,
+    layout_scheduler,
+    main_thread_dispatch,
+    parameter_binder,
+    script_cache as script_cache_module,
+    script_runner,
+)
+from . import script_server as script_server_module
+
 user32 = ctypes.WinDLL("user32", use_last_error=True)
 kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
 
@@ -41,16 +53,22 @@ OPEN_EXISTING = 3
 INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
 PIPE_NAME = "\\\\.\\pipe\\BlenderWebViewPipe"
 SCRIPT_PIPE_NAME = "\\\\.\\pipe\\BlenderScriptPipe"
-UPDATE_THRESHOLD = 0.5
 PIPE_ACCESS_INBOUND = 0x00000001
 ERROR_PIPE_CONNECTED = 535
+PIPE_BUFFER_SIZE = 65536
+SCRIPT_PIPE_INSTANCES = 4
+SCRIPT_LOAD_PREFIX = b"SCRIPT_LOAD:"
+SCRIPT_RUN_PREFIX = b"SCRIPT_RUN:"
+SCRIPT_RESULT_PREFIX = b"SCRIPT_RESULT:"
+LAYOUT_WIRE_FORMAT = "json"
 
-last_window_rect = None
-last_update_time = 0
-stop_ipc = True
 webview_process = None
-script_listener_thread = None
 temp_run_dir = None
+layout_encoder = (
+    layout_codec.LayoutBinaryEncoder()
+    if LAYOUT_WIRE_FORMAT == "binary"
+    else layout_codec.LayoutDeltaEncoder()
+)
 
 
 def get_window_rect(hwnd):
@@ -62,46 +80,46 @@ def get_window_rect(hwnd):
     )
 
 
-def get_blender_layout_info():
-    window_info = get_blender_window_info() or (0, 0, 1920, 1080)
+def get_blender_layout_snapshot(window_info):
     x, y, width, height = window_info
 
-    return {
-        "windows": [
-            {
-                "x": x,
-                "y": y,
-                "width": width,
-                "height": height,
-                "screen": {
-                    "name": window.screen.name,
-                    "areas": [
-                        {
-                            "type": area.type,
-                            "x": area.x,
-                            "y": area.y,
-                            "width": area.width,
-                            "height": area.height,
-                            "regions": [
-                                {
-                                    "type": region.type,
-                                    "x": area.x + region.x,
-                                    "y": area.y + region.y,
-                                    "width": region.width,
-                                    "height": region.height,
-                                    "alignment": region.alignment,
-                                }
-                                for region in area.regions
-                                if region.width > 0 and region.height > 0
-                            ],
-                        }
-                        for area in window.screen.areas
-                    ],
-                },
-            }
-            for window in bpy.context.window_manager.windows
-        ]
-    }
+    return tuple(
+        (
+            x,
+            y,
+            width,
+            height,
+            window.screen.name,
+            tuple(
+                (
+                    area.type,
+                    area.x,
+                    area.y,
+                    area.width,
+                    area.height,
+                    tuple(
+                        (
+                            region.type,
+                            area.x + region.x,
+                            area.y + region.y,
+                            region.width,
+                            region.height,
+                            region.alignment,
+                        )
+                        for region in area.regions
+                        if region.width > 0 and region.height > 0
+                    ),
+                )
+                for area in window.screen.areas
+            ),
+        )
+        for window in bpy.context.window_manager.windows
+    )
+
+
+def get_blender_layout_info():
+    window_info = get_blender_window_info() or (0, 0, 1920, 1080)
+    return layout_codec.snapshot_to_dict(get_blender_layout_snapshot(window_info))
 
 
 def get_blender_window_info():
@@ -117,87 +135,171 @@ def get_blender_window_info():
     return (left, top, right - left, bottom - top)
 
 
-def send_window_info():
-    global last_window_rect, last_update_time
+class NamedPipeConnection:
+    def __init__(self, handle):
+        self.handle = handle
+
+    def write_all(self, data):
+        bytes_written = wintypes.DWORD()
+        offset = 0
+        while offset < len(data):
+            if not kernel32.WriteFile(
+                self.handle,
+                data[offset:],
+                len(data) - offset,
+                ctypes.byref(bytes_written),
+                None,
+            ):
+                raise ctypes.WinError(ctypes.get_last_error())
+            offset += bytes_written.value
+
+    def readinto(self, view):
+        buffer = (ctypes.c_char * len(view)).from_buffer(view)
+        bytes_read = wintypes.DWORD(0)
+        if not kernel32.ReadFile(
+            self.handle, buffer, len(view), ctypes.byref(bytes_read), None
+        ):
+            return 0
+        return bytes_read.value
+
+    def close(self):
+        kernel32.CloseHandle(self.handle)
+
 
-    current_time = time.time()
+def connect_layout_pipe():
+    pipe_handle = kernel32.CreateFileW(
+        PIPE_NAME, GENERIC_WRITE, 0, None, OPEN_EXISTING, 0, None
+    )
+    if pipe_handle == INVALID_HANDLE_VALUE:
+        return None
+    return NamedPipeConnection(pipe_handle)
+
+
+layout_transport = ipc_transport.FramedTransport(
+    connect_layout_pipe, on_connect=layout_encoder.reset
+)
+
+
+def send_window_info():
     window_info = get_blender_window_info()
+    if not window_info or not layout_transport.ensure_connected():
+        return
 
-    if not window_info or (
-        last_window_rect == window_info
-        and current_time - last_update_time < UPDATE_THRESHOLD
-    ):
+    message = layout_encoder.encode(
+        window_info, get_blender_layout_snapshot(window_info)
+    )
+    if message is None:
         return
 
-    x, y, width, height = window_info
+    if isinstance(message, str):
+        message = message.encode("utf-8")
+    if not layout_transport.send(message):
+        layout_encoder.reset()
+
+
+def accept_script_pipe():
+    pipe_handle = kernel32.CreateNamedPipeW(
+        SCRIPT_PIPE_NAME,
+        PIPE_ACCESS_INBOUND,
+        0,
+        SCRIPT_PIPE_INSTANCES,
+        PIPE_BUFFER_SIZE,
+        PIPE_BUFFER_SIZE,
+        0,
+        None,
+    )
+    if pipe_handle == INVALID_HANDLE_VALUE:
+        return None
+
+    if not kernel32.ConnectNamedPipe(pipe_handle, None):
+        if kernel32.GetLastError() != ERROR_PIPE_CONNECTED:
+            kernel32.CloseHandle(pipe_handle)
+            return None
+
+    return NamedPipeConnection(pipe_handle)
 
+
+def wake_script_pipe():
     pipe_handle = kernel32.CreateFileW(
-        PIPE_NAME, GENERIC_WRITE, 0, None, OPEN_EXISTING, 0, None
+        SCRIPT_PIPE_NAME, GENERIC_WRITE, 0, None, OPEN_EXISTING, 0, None
     )
     if pipe_handle != INVALID_HANDLE_VALUE:
-        layout_info = get_blender_layout_info()
-        message = f"LAYOUT:{x},{y},{width},{height}|{json.dumps(layout_info, separators=(',', ':'))}"
-        message_bytes = message.encode("utf-8")
-        bytes_written = wintypes.DWORD()
-        kernel32.WriteFile(
-            pipe_handle,
-            message_bytes,
-            len(message_bytes),
-            ctypes.byref(bytes_written),
-            None,
-        )
         kernel32.CloseHandle(pipe_handle)
-        last_window_rect = window_info
-        last_update_time = current_time
 
 
-def script_listener_worker():
-    global stop_ipc
+def decode_script_frame(frame):
+    message = ipc_transport.decode_json_frame(frame, SCRIPT_LOAD_PREFIX)
+    if message is None:
+        message = ipc_transport.decode_json_frame(frame, SCRIPT_RUN_PREFIX)
+        if message is not None:
+            message["run"] = True
+    return message
 
-    while not stop_ipc:
-        pipe_handle = kernel32.CreateNamedPipeW(
-            SCRIPT_PIPE_NAME, PIPE_ACCESS_INBOUND, 0, 1, 8192, 8192, 0, None
-        )
-        if pipe_handle == INVALID_HANDLE_VALUE:
-            time.sleep(0.05)
-            continue
 
-        if not kernel32.ConnectNamedPipe(pipe_handle, None):
-            if kernel32.GetLastError() != ERROR_PIPE_CONNECTED:
-                kernel32.CloseHandle(pipe_handle)
-                time.sleep(0.05)
-                continue
+def script_queue_key(message):
+    # Pending loads of the same script collapse into the newest one; every run
+    # request is kept.
+    return None if message.get("run") else message.get("name")
 
-        buffer = ctypes.create_string_buffer(8192)
-        bytes_read = wintypes.DWORD(0)
-        data = bytearray()
-        while kernel32.ReadFile(
-            pipe_handle, buffer, 8192, ctypes.byref(bytes_read), None
-        ):
-            if bytes_read.value == 0:
-                break
-            data.extend(buffer.raw[: bytes_read.value])
 
-        kernel32.CloseHandle(pipe_handle)
+def push_layout_update():
+    if _is_blender_context_valid():
+        send_window_info()
+
+
+def get_layout_probe():
+    return (
+        get_blender_window_info(),
+        tuple(
+            (area.x, area.y, area.width, area.height)
+            for window in bpy.context.window_manager.windows
+            for area in window.screen.areas
+        ),
+    )
 
-        if not data:
-            continue
 
-        text = data.decode("utf-8")
-        if text.startswith("SCRIPT_LOAD:"):
-            json_data = text[12:]
-            script_data = json.loads(json_data)
-            handle_script_load_message(script_data)
+layout_push_scheduler = layout_scheduler.LayoutPushScheduler(
+    push_layout_update, bpy.app.timers, probe=get_layout_probe
+)
+layout_msgbus_owner = object()
 
 
-def ipc_update_thread():
-    global stop_ipc
+@persistent
+def on_layout_changed(*_args):
+    layout_push_scheduler.notify()
 
-    while not stop_ipc:
-        if not _is_blender_context_valid():
-            break
-        send_window_info()
-        time.sleep(UPDATE_THRESHOLD)
+
+@persistent
+def on_layout_file_loaded(*_args):
+    text_editor_cache.invalidate()
+    subscribe_layout_msgbus()
+    layout_push_scheduler.notify()
+
+
+def subscribe_layout_msgbus():
+    bpy.msgbus.clear_by_owner(layout_msgbus_owner)
+    for key in ((bpy.types.Window, "screen"), (bpy.types.Window, "workspace")):
+        bpy.msgbus.subscribe_rna(
+            key=key, owner=layout_msgbus_owner, args=(), notify=on_layout_changed
+        )
+
+
+def start_layout_updates():
+    if on_layout_changed not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_layout_changed)
+    if on_layout_file_loaded not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_layout_file_loaded)
+    subscribe_layout_msgbus()
+    layout_push_scheduler.start()
+
+
+def stop_layout_updates():
+    layout_push_scheduler.stop()
+    bpy.msgbus.clear_by_owner(layout_msgbus_owner)
+    if on_layout_changed in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_layout_changed)
+    if on_layout_file_loaded in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_layout_file_loaded)
 
 
 def _is_blender_context_valid():
@@ -215,7 +317,7 @@ class PANEL_INFO_OT_launch_webview(Operator):
     bl_description = "Launches the WebView application with position tracking"
 
     def execute(self, context):
-        global webview_process, stop_ipc, last_window_rect, script_listener_thread, temp_run_dir
+        global webview_process, temp_run_dir
 
         window_info = get_blender_window_info()
         addon_root = os.path.dirname(os.path.abspath(__file__))
@@ -240,12 +342,9 @@ class PANEL_INFO_OT_launch_webview(Operator):
                     "Missing WebView2Control.exe or WebView2Loader.dll in temp run dir"
                 )
 
-            stop_ipc = False
-            last_window_rect = window_info
-            script_listener_thread = threading.Thread(
-                target=script_listener_worker, daemon=True
-            )
-            script_listener_thread.start()
+            layout_encoder.reset()
+            script_dispatcher.start()
+            script_server.start()
 
             initial_params = (
                 f"{window_info[0]},{window_info[1]},{window_info[2]},{window_info[3]}"
@@ -260,7 +359,7 @@ class PANEL_INFO_OT_launch_webview(Operator):
                 cleanup_webview()
                 return {"CANCELLED"}
 
-            threading.Thread(target=ipc_update_thread, daemon=True).start()
+            start_layout_updates()
 
             return {"FINISHED"}
         except Exception as e:
@@ -291,65 +390,117 @@ class PANEL_INFO_PT_main_panel(Panel):
         row.operator("panel_info.launch_webview")
         row.operator("panel_info.stop_webview")
 
+        column = layout.column(align=True)
+        column.label(
+            text=f"Script cache: {script_cache.hits} hits, {script_cache.misses} misses"
+        )
+        column.label(
+            text=f"Text writes: {script_cache.writes}, "
+            f"skipped {script_cache.writes_skipped}"
+        )
+
 
-def handle_script_load_message(message_data):
+def prepare_script_message(message_data):
+    """Bind parameters on a server worker, then hand the script to the main thread."""
     script_name = message_data.get("name", "Unnamed Script")
     script_content = message_data.get("content", "")
     parameters = message_data.get("parameters", {})
 
-    if parameters and script_content:
-        script_content = apply_parameters_to_script(script_content, parameters)
-
-    text_block = bpy.data.texts.get(script_name)
-    if not text_block:
-        text_block = bpy.data.texts.new(name=script_name)
-
-    text_block.clear()
-    text_block.write(script_content)
-
-    for window in bpy.context.window_manager.windows:
-        for area in window.screen.areas:
-            if area.type == "TEXT_EDITOR":
-                area.spaces.active.text = text_block
-                return True
+    script = script_cache.lookup(script_name, script_content, parameters)
+    if message_data.get("run"):
+        try:
+            script.compiled()
+        except SyntaxError:
+            pass  # Reported by handle_script_run_message on the main thread.
+    script_dispatcher.post((script_name, script, message_data))
+
+
+def reject_script_message(message_data):
+    """Report a run request the full script queue refused back to the UI."""
+    if message_data.get("run"):
+        message_data["rejected"] = True
+        script_name = message_data.get("name", "Unnamed Script")
+        script_dispatcher.post((script_name, None, message_data))
+
+
+def handle_script_message(message):
+    script_name, script, message_data = message
+    if message_data.get("rejected"):
+        return handle_script_rejected_message(script_name, message_data)
+    if message_data.get("run"):
+        return handle_script_run_message(script_name, script, message_data)
+    return handle_script_load_message(script_name, script)
+
+
+def handle_script_run_message(script_name, script, message_data):
+    try:
+        code = script.compiled()
+    except SyntaxError:
+        result = script_runner.failed_result(script_name, traceback.format_exc())
+    else:
+        result = script_runner.run_script(
+            code, script_name, trace_memory=message_data.get("trace_memory", False)
+        )
+    result["timestamp"] = message_data.get("timestamp")
+    send_script_result(result)
+    return result["status"] == "ok"
 
-    return True
 
+def handle_script_rejected_message(script_name, message_data):
+    result = script_runner.failed_result(
+        script_name, "Script queue is full; the run request was rejected."
+    )
+    result["timestamp"] = message_data.get("timestamp")
+    send_script_result(result)
+    return False
 
-def apply_parameters_to_script(script_content, parameters):
-    lines = script_content.split("\n")
-    modified_lines = []
-    in_main_function = False
 
-    for line in lines:
-        if "def main():" in line:
-            in_main_function = True
-        elif (
-            in_main_function
-            and line.strip()
-            and not line.startswith(("    ", "\t", "#"))
-        ):
-            in_main_function = False
+def send_script_result(result):
+    payload = json.dumps(result, separators=(",", ":")).encode("utf-8")
+    layout_transport.send(SCRIPT_RESULT_PREFIX + payload)
 
-        modified_line = line
-        if in_main_function:
-            for param_name, param_value in parameters.items():
-                if f"{param_name} =" in line and "=" in line:
-                    indent = line[: len(line) - len(line.lstrip())]
 
-                    if isinstance(param_value, bool):
-                        value_str = "True" if param_value else "False"
-                    elif isinstance(param_value, str):
-                        value_str = f"'{param_value}'"
-                    else:
-                        value_str = str(param_value)
+def handle_script_load_message(script_name, script):
+    text_block = bpy.data.texts.get(script_name)
 
-                    modified_line = f"{indent}{param_name} = {value_str}"
-                    break
+    # The text is compared as well so edits made in Blender are overwritten.
+    if (
+        text_block
+        and script_cache.is_written(script_name, script)
+        and text_block.as_string() == script.source
+    ):
+        script_cache.mark_skipped()
+    else:
+        if not text_block:
+            text_block = bpy.data.texts.new(name=script_name)
+        text_block.clear()
+        text_block.write(script.source)
+        script_cache.mark_written(script_name, script)
+
+    area = text_editor_cache.find(bpy.context.window_manager)
+    if area is not None:
+        area.spaces.active.text = text_block
+    return True
 
-        modified_lines.append(modified_line)
 
-    return "\n".join(modified_lines)
+script_binder = parameter_binder.ParameterBinder()
+script_cache = script_cache_module.ScriptCache(script_binder.bind)
+text_editor_cache = main_thread_dispatch.TextEditorCache()
+script_dispatcher = main_thread_dispatch.MainThreadDispatcher(
+    handle_script_message, bpy.app.timers
+)
+script_server = script_server_module.ScriptIngestServer(
+    accept_script_pipe,
+    decode_script_frame,
+    prepare_script_message,
+    wake=wake_script_pipe,
+    reject=reject_script_message,
+    queue=script_server_module.BoundedMessageQueue(
+        policy=script_server_module.COALESCE,
+        key=script_queue_key,
+    ),
+    acceptors=SCRIPT_PIPE_INSTANCES,
+)
 
 
 classes = (
@@ -360,9 +511,10 @@ classes = (
 
 
 def cleanup_webview():
-    global webview_process, stop_ipc, script_listener_thread
+    global webview_process, temp_run_dir
 
-    stop_ipc = True
+    stop_layout_updates()
+    layout_transport.close()
 
     if webview_process:
         try:
@@ -372,9 +524,8 @@ def cleanup_webview():
             webview_process.kill()
         webview_process = None
 
-    if script_listener_thread and script_listener_thread.is_alive():
-        script_listener_thread.join(timeout=1.0)
-    global temp_run_dir
+    script_server.stop()
+    script_dispatcher.stop()
     if temp_run_dir and os.path.isdir(temp_run_dir):
         shutil.rmtree(temp_run_dir, ignore_errors=True)
     temp_run_dir = None
@@ -0,0 +1,213 @@
+"""Length-prefixed framing over a long-lived IPC connection.
+
+Every frame is a little-endian ``uint32`` payload length followed by the
+payload bytes. ``FramedTransport`` keeps one connection open across sends and
+reconnects lazily, so opening the pipe stays off the per-update path. The
+connection itself is supplied by a factory, which lets the same transport run
+over a Windows named pipe inside Blender or over ``socket.socketpair`` /
+``os.pipe`` when measured outside of it.
+"""
+
+import json
+import os
+import struct
+import time
+
+FRAME_HEADER = struct.Struct("<I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+INITIAL_BUFFER_SIZE = 64 * 1024
+RECONNECT_INTERVAL = 0.5
+
+
+def encode_frame(payload):
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_json_frame(frame, prefix):
+    """Decode a ``prefix`` + UTF-8 JSON frame without copying it out of the buffer.
+
+    Returns None when the frame does not start with ``prefix``.
+    """
+    if frame[: len(prefix)] != prefix:
+        return None
+    return json.loads(str(frame[len(prefix) :], "utf-8"))
+
+
+class FdConnection:
+    """Connection over a writable file descriptor such as the write end of ``os.pipe``."""
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def write_all(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SocketConnection:
+    """Connection over a connected stream socket."""
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def write_all(self, data):
+        self.sock.sendall(data)
+
+    def close(self):
+        self.sock.close()
+
+
+class FramedTransport:
+    """Sends frames over a persistent connection with automatic reconnect.
+
+    ``connect`` returns a connection exposing ``write_all(bytes)`` and
+    ``close()``, or None when the peer is not available yet. Connection
+    attempts are rate limited to one per ``reconnect_interval`` seconds and
+    ``on_connect`` runs after each successful connect, before anything is sent.
+    """
+
+    def __init__(
+        self,
+        connect,
+        on_connect=None,
+        reconnect_interval=RECONNECT_INTERVAL,
+        clock=time.monotonic,
+    ):
+        self._connect = connect
+        self.on_connect = on_connect
+        self.reconnect_interval = reconnect_interval
+        self.clock = clock
+        self.connection = None
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.connects = 0
+        self._last_attempt = None
+
+    @property
+    def connected(self):
+        return self.connection is not None
+
+    def ensure_connected(self):
+        if self.connection is not None:
+            return True
+
+        now = self.clock()
+        if (
+            self._last_attempt is not None
+            and now - self._last_attempt < self.reconnect_interval
+        ):
+            return False
+        self._last_attempt = now
+
+        try:
+            self.connection = self._connect()
+        except OSError:
+            self.connection = None
+        if self.connection is None:
+            return False
+
+        self.connects += 1
+        if self.on_connect:
+            self.on_connect()
+        return True
+
+    def send(self, payload):
+        if not self.ensure_connected():
+            return False
+
+        frame = encode_frame(payload)
+        try:
+            self.connection.write_all(frame)
+        except OSError:
+            self.close()
+            return False
+
+        self.frames_sent += 1
+        self.bytes_sent += len(frame)
+        return True
+
+    def close(self):
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
+
+
+class FrameReader:
+    """Reads frames into one reusable buffer that grows geometrically.
+
+    ``readinto`` fills a writable memoryview and returns the number of bytes
+    read, or 0 at end of stream (``socket.recv_into``, a ``ReadFile`` wrapper
+    and so on). Frames of any size up to ``max_frame_size`` are returned as
+    memoryviews into the buffer. A view stays valid until the next call to
+    ``read_frame`` or ``attach``, so callers decode it before reading again.
+    """
+
+    def __init__(
+        self,
+        readinto=None,
+        initial_size=INITIAL_BUFFER_SIZE,
+        max_frame_size=MAX_FRAME_SIZE,
+    ):
+        self.readinto = readinto
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray(initial_size)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    def attach(self, readinto):
+        """Read from a new source, discarding anything left from the previous one."""
+        self.readinto = readinto
+        self._start = 0
+        self._end = 0
+
+    def read_frame(self):
+        """Return the next frame payload, or None once the stream ends."""
+        header_size = FRAME_HEADER.size
+        if not self._fill(header_size):
+            return None
+
+        (length,) = FRAME_HEADER.unpack_from(self._buffer, self._start)
+        if length > self.max_frame_size:
+            raise ValueError(f"Frame of {length} bytes exceeds limit")
+        if not self._fill(header_size + length):
+            return None
+
+        start = self._start + header_size
+        self._start = start + length
+        return memoryview(self._buffer)[start : self._start]
+
+    def _fill(self, size):
+        while self._end - self._start < size:
+            if self._start + size > len(self._buffer):
+                self._make_room(size)
+            count = self.readinto(memoryview(self._buffer)[self._end :])
+            if not count:
+                return False
+            self._end += count
+        return True
+
+    def _make_room(self, size):
+        pending = self._end - self._start
+        if size <= len(self._buffer):
+            self._buffer[:pending] = self._buffer[self._start : self._end]
+        else:
+            capacity = len(self._buffer)
+            while capacity < size:
+                capacity *= 2
+            buffer = bytearray(capacity)
+            buffer[:pending] = self._buffer[self._start : self._end]
+            self._buffer = buffer
+        self._start = 0
+        self._end = pending
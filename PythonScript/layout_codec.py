@@ -0,0 +1,364 @@
+"""Layout snapshot encoding for the WebView overlay.
+
+A layout snapshot is a tuple of window tuples built straight from Blender's
+window manager:
+
+    window: (x, y, width, height, screen_name, areas)
+    area:   (type, x, y, width, height, regions)
+    region: (type, x, y, width, height, alignment)
+
+Tuples compare by value, so each area tuple doubles as the fingerprint of the
+area and all of its regions. Nothing in this module imports ``bpy`` so the
+encoders and decoders can be exercised and benchmarked outside Blender.
+
+Two wire formats are supported. The default is UTF-8 text (``LAYOUT:`` JSON
+keyframes and ``LAYOUT_DELTA:`` JSON deltas). The optional binary format
+starts with a version byte below any printable character, so a receiver can
+tell the two apart from the first byte:
+
+    header   <BBHiiiiIII>  version, flags, window count, x, y, width, height,
+                          seq, record count, string table offset
+    records  int32[6] each, in tree order:
+             window (x, y, width, height, screen name, area count)
+             area   (type, x, y, width, height, region count)
+             region (type, x, y, width, height, alignment)
+    strings  <H> count, then <H> length + UTF-8 bytes per entry
+
+String fields in records are indices into the string table.
+"""
+
+import json
+import struct
+import sys
+import time
+from array import array
+
+LAYOUT_PREFIX = "LAYOUT:"
+LAYOUT_DELTA_PREFIX = "LAYOUT_DELTA:"
+KEYFRAME_INTERVAL = 5.0
+
+LAYOUT_BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<BBHiiiiIII")
+BINARY_RECORD_FIELDS = 6
+
+_JSON_SEPARATORS = (",", ":")
+_STRING_LENGTH = struct.Struct("<H")
+
+
+def region_to_dict(region):
+    region_type, x, y, width, height, alignment = region
+    return {
+        "type": region_type,
+        "x": x,
+        "y": y,
+        "width": width,
+        "height": height,
+        "alignment": alignment,
+    }
+
+
+def area_to_dict(area):
+    area_type, x, y, width, height, regions = area
+    return {
+        "type": area_type,
+        "x": x,
+        "y": y,
+        "width": width,
+        "height": height,
+        "regions": [region_to_dict(region) for region in regions],
+    }
+
+
+def window_header(window):
+    x, y, width, height, screen_name, _areas = window
+    return {"x": x, "y": y, "width": width, "height": height, "name": screen_name}
+
+
+def snapshot_to_dict(snapshot):
+    return {
+        "windows": [
+            {
+                "x": window[0],
+                "y": window[1],
+                "width": window[2],
+                "height": window[3],
+                "screen": {
+                    "name": window[4],
+                    "areas": [area_to_dict(area) for area in window[5]],
+                },
+            }
+            for window in snapshot
+        ]
+    }
+
+
+def _format_message(prefix, rect, payload):
+    x, y, width, height = rect
+    return f"{prefix}{x},{y},{width},{height}|{json.dumps(payload, separators=_JSON_SEPARATORS)}"
+
+
+class LayoutDeltaEncoder:
+    """Turns successive layout snapshots into ``LAYOUT:``/``LAYOUT_DELTA:`` messages.
+
+    A full keyframe is emitted for the first snapshot, whenever the window count
+    changes and at least every ``keyframe_interval`` seconds so a restarted
+    receiver resyncs. Otherwise only the window headers and areas whose
+    fingerprint changed are sent, and unchanged snapshots produce no message.
+    """
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL, clock=time.monotonic):
+        self.keyframe_interval = keyframe_interval
+        self.clock = clock
+        self.seq = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self._rect = None
+        self._snapshot = None
+        self._last_keyframe = 0.0
+
+    def reset(self):
+        """Forget the previous snapshot so the next message is a keyframe."""
+        self._rect = None
+        self._snapshot = None
+
+    def encode(self, rect, snapshot):
+        now = self.clock()
+        previous = self._snapshot
+
+        if (
+            previous is None
+            or len(previous) != len(snapshot)
+            or now - self._last_keyframe >= self.keyframe_interval
+        ):
+            return self._encode_keyframe(rect, snapshot, now)
+
+        if rect == self._rect and snapshot == previous:
+            return None
+
+        windows = []
+        areas = []
+        for window_index, (window, old_window) in enumerate(zip(snapshot, previous)):
+            if window[:5] != old_window[:5]:
+                windows.append([window_index, window_header(window)])
+
+            old_areas = old_window[5]
+            for area_index, area in enumerate(window[5]):
+                if area_index >= len(old_areas) or area != old_areas[area_index]:
+                    areas.append([window_index, area_index, area_to_dict(area)])
+
+        self.seq += 1
+        self.deltas += 1
+        self._rect = rect
+        self._snapshot = snapshot
+        payload = {
+            "delta": True,
+            "seq": self.seq,
+            "windows": windows,
+            "areas": areas,
+            "area_counts": [len(window[5]) for window in snapshot],
+        }
+        return _format_message(LAYOUT_DELTA_PREFIX, rect, payload)
+
+    def _encode_keyframe(self, rect, snapshot, now):
+        self.seq += 1
+        self.keyframes += 1
+        self._rect = rect
+        self._snapshot = snapshot
+        self._last_keyframe = now
+        payload = snapshot_to_dict(snapshot)
+        payload["seq"] = self.seq
+        return _format_message(LAYOUT_PREFIX, rect, payload)
+
+
+class LayoutDeltaDecoder:
+    """Rebuilds full layout dicts from a stream of encoder messages.
+
+    Mirrors the frontend's handling: a delta whose ``seq`` does not directly
+    follow the last applied message drops the state until the next keyframe.
+    """
+
+    def __init__(self):
+        self.seq = None
+        self.layout = None
+
+    def decode(self, message):
+        """Return ``(rect, layout)`` for ``message`` or None if it cannot be applied."""
+        if message.startswith(LAYOUT_DELTA_PREFIX):
+            body = message[len(LAYOUT_DELTA_PREFIX) :]
+        elif message.startswith(LAYOUT_PREFIX):
+            body = message[len(LAYOUT_PREFIX) :]
+        else:
+            return None
+
+        header, _, json_data = body.partition("|")
+        rect = tuple(int(value) for value in header.split(","))
+        payload = json.loads(json_data)
+
+        if not payload.get("delta"):
+            self.seq = payload.pop("seq", None)
+            self.layout = payload
+            return rect, self.layout
+
+        if self.layout is None or payload["seq"] != self.seq + 1:
+            self.seq = None
+            self.layout = None
+            return None
+
+        windows = self.layout["windows"]
+        for window, area_count in zip(windows, payload["area_counts"]):
+            del window["screen"]["areas"][area_count:]
+
+        for window_index, header in payload["windows"]:
+            window = windows[window_index]
+            window["screen"]["name"] = header.pop("name")
+            window.update(header)
+
+        for window_index, area_index, area in payload["areas"]:
+            areas = windows[window_index]["screen"]["areas"]
+            if area_index < len(areas):
+                areas[area_index] = area
+            else:
+                areas.append(area)
+
+        self.seq = payload["seq"]
+        return rect, self.layout
+
+
+class LayoutBinaryEncoder:
+    """Encodes every changed snapshot as one binary keyframe.
+
+    Shares the ``encode``/``reset`` interface of ``LayoutDeltaEncoder`` but
+    returns ``bytes``. Unchanged snapshots still produce no message.
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self._rect = None
+        self._snapshot = None
+
+    def reset(self):
+        self._rect = None
+        self._snapshot = None
+
+    def encode(self, rect, snapshot):
+        if rect == self._rect and snapshot == self._snapshot:
+            return None
+        self.seq += 1
+        self._rect = rect
+        self._snapshot = snapshot
+        return encode_binary_layout(rect, snapshot, self.seq)
+
+
+def encode_binary_layout(rect, snapshot, seq=0):
+    strings = {}
+    intern = strings.setdefault
+    records = array("i")
+    append = records.extend
+
+    for x, y, width, height, screen_name, areas in snapshot:
+        append((x, y, width, height, intern(screen_name, len(strings)), len(areas)))
+        for area_type, ax, ay, aw, ah, regions in areas:
+            append((intern(area_type, len(strings)), ax, ay, aw, ah, len(regions)))
+            for region_type, rx, ry, rw, rh, alignment in regions:
+                append(
+                    (
+                        intern(region_type, len(strings)),
+                        rx,
+                        ry,
+                        rw,
+                        rh,
+                        intern(alignment, len(strings)),
+                    )
+                )
+
+    if sys.byteorder != "little":
+        records.byteswap()
+
+    string_table = bytearray(_STRING_LENGTH.pack(len(strings)))
+    for value in strings:
+        encoded = value.encode("utf-8")
+        string_table += _STRING_LENGTH.pack(len(encoded))
+        string_table += encoded
+
+    record_bytes = records.tobytes()
+    record_count = len(records) // BINARY_RECORD_FIELDS
+    header = BINARY_HEADER.pack(
+        LAYOUT_BINARY_VERSION,
+        0,
+        len(snapshot),
+        *rect,
+        seq,
+        record_count,
+        BINARY_HEADER.size + len(record_bytes),
+    )
+    return b"".join((header, record_bytes, string_table))
+
+
+def decode_binary_layout(payload):
+    """Return ``(rect, layout)`` for a binary message, with ``seq`` in the layout."""
+    (
+        version,
+        _flags,
+        window_count,
+        x,
+        y,
+        width,
+        height,
+        seq,
+        record_count,
+        strings_offset,
+    ) = BINARY_HEADER.unpack_from(payload)
+    if version != LAYOUT_BINARY_VERSION:
+        raise ValueError(f"Unsupported layout binary version {version}")
+
+    (string_count,) = _STRING_LENGTH.unpack_from(payload, strings_offset)
+    offset = strings_offset + _STRING_LENGTH.size
+    strings = []
+    for _ in range(string_count):
+        (length,) = _STRING_LENGTH.unpack_from(payload, offset)
+        offset += _STRING_LENGTH.size
+        strings.append(bytes(payload[offset : offset + length]).decode("utf-8"))
+        offset += length
+
+    records = array("i")
+    records.frombytes(payload[BINARY_HEADER.size : strings_offset])
+    if sys.byteorder != "little":
+        records.byteswap()
+    if len(records) != record_count * BINARY_RECORD_FIELDS:
+        raise ValueError("Truncated layout records")
+
+    cursor = iter(zip(*[iter(records)] * BINARY_RECORD_FIELDS))
+    windows = []
+    for _ in range(window_count):
+        wx, wy, ww, wh, name, area_count = next(cursor)
+        areas = []
+        for _ in range(area_count):
+            area_type, ax, ay, aw, ah, region_count = next(cursor)
+            areas.append(
+                area_to_dict(
+                    (
+                        strings[area_type],
+                        ax,
+                        ay,
+                        aw,
+                        ah,
+                        tuple(
+                            (strings[rt], rx, ry, rw, rh, strings[alignment])
+                            for rt, rx, ry, rw, rh, alignment in (
+                                next(cursor) for _ in range(region_count)
+                            )
+                        ),
+                    )
+                )
+            )
+        windows.append(
+            {
+                "x": wx,
+                "y": wy,
+                "width": ww,
+                "height": wh,
+                "screen": {"name": strings[name], "areas": areas},
+            }
+        )
+
+    return (x, y, width, height), {"seq": seq, "windows": windows}
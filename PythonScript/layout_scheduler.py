@@ -0,0 +1,106 @@
+"""Change-driven scheduling of layout pushes on Blender's main thread.
+
+Handlers call ``notify`` when something may have changed. The first
+notification of a burst registers a one-shot timer, and every further
+notification until it fires is coalesced into that single push. Window moves
+and area resizes raise no Blender event, so an optional ``probe`` is polled
+and treated as a notification whenever its value changes. While nothing
+changes, no push runs and no timer other than the probe is registered, and
+the probe backs off from ``watch_interval`` to ``idle_watch_interval``;
+a change or a notification brings it back to ``watch_interval``.
+
+The timer API is passed in (``bpy.app.timers`` inside Blender) so the
+scheduler can be driven by fakes outside of it.
+"""
+
+import time
+
+DEBOUNCE_INTERVAL = 1 / 60
+WATCH_INTERVAL = 0.05
+WATCH_IDLE_INTERVAL = 0.25
+
+
+class LayoutPushScheduler:
+    def __init__(
+        self,
+        push,
+        timers,
+        probe=None,
+        debounce=DEBOUNCE_INTERVAL,
+        watch_interval=WATCH_INTERVAL,
+        idle_watch_interval=WATCH_IDLE_INTERVAL,
+        clock=time.monotonic,
+    ):
+        self.push = push
+        self.timers = timers
+        self.probe = probe
+        self.debounce = debounce
+        self.watch_interval = watch_interval
+        self.idle_watch_interval = idle_watch_interval
+        self.clock = clock
+        self.running = False
+        self.notifications = 0
+        self.pushes = 0
+        self.probes = 0
+        self.last_push_latency = None
+        self._pending_since = None
+        self._last_probe = None
+        self._next_watch = watch_interval
+        # bpy.app.timers matches callbacks by identity, and every access to
+        # a method creates a new bound method, so bind them once
+        self._tick_callback = self._tick
+        self._watch_callback = self._watch
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._last_probe = None
+        self._next_watch = self.watch_interval
+        self.notify()
+        if self.probe is not None:
+            self.timers.register(
+                self._watch_callback, first_interval=0, persistent=True
+            )
+
+    def stop(self):
+        self.running = False
+        self._pending_since = None
+        for callback in (self._tick_callback, self._watch_callback):
+            if self.timers.is_registered(callback):
+                self.timers.unregister(callback)
+
+    def notify(self, *_args):
+        if not self.running:
+            return
+        self.notifications += 1
+        self._next_watch = self.watch_interval
+        if self._pending_since is not None:
+            return
+        self._pending_since = self.clock()
+        self.timers.register(
+            self._tick_callback, first_interval=self.debounce, persistent=True
+        )
+
+    def _tick(self):
+        pending_since, self._pending_since = self._pending_since, None
+        if not self.running or pending_since is None:
+            return None
+        self.pushes += 1
+        self.push()
+        self.last_push_latency = self.clock() - pending_since
+        return None
+
+    def _watch(self):
+        if not self.running:
+            return None
+        self.probes += 1
+        state = self.probe()
+        if state != self._last_probe:
+            self._last_probe = state
+            self.notify()
+            return self._next_watch
+        # Nothing moved: poll less often until something does
+        interval = self._next_watch
+        self._next_watch = min(interval * 2, self.idle_watch_interval)
+        return interval
@@ -0,0 +1,145 @@
+"""Hand-off of work from IPC threads to Blender's main thread.
+
+``bpy`` data and UI state may only be touched from the main thread, so IPC
+threads ``post`` messages to a ``MainThreadDispatcher`` and a persistent timer
+drains them. Each tick handles at most ``max_per_tick`` messages and stops
+early once ``budget`` seconds are spent, so a burst of scripts never stalls
+the UI for more than about one frame. While a backlog remains the timer
+re-runs on the next event loop iteration, otherwise it idles at
+``idle_interval``.
+
+``TextEditorCache`` remembers which ``TEXT_EDITOR`` area shows injected
+scripts, rescanning windows only after their screens change.
+
+The timer API and window manager are passed in (``bpy.app.timers`` and
+``bpy.context.window_manager`` inside Blender), so both classes can be driven
+by fakes outside of it.
+"""
+
+import time
+from collections import deque
+
+MAX_MESSAGES_PER_TICK = 8
+TICK_BUDGET = 0.004
+IDLE_INTERVAL = 0.05
+BUSY_INTERVAL = 0.0
+
+
+class MainThreadDispatcher:
+    def __init__(
+        self,
+        handle,
+        timers,
+        max_per_tick=MAX_MESSAGES_PER_TICK,
+        budget=TICK_BUDGET,
+        idle_interval=IDLE_INTERVAL,
+        clock=time.perf_counter,
+    ):
+        self.handle = handle
+        self.timers = timers
+        self.max_per_tick = max_per_tick
+        self.budget = budget
+        self.idle_interval = idle_interval
+        self.clock = clock
+        self.running = False
+        self.handled = 0
+        self.failed = 0
+        self.ticks = 0
+        self.max_tick_duration = 0.0
+        self._pending = deque()
+        # bpy.app.timers matches callbacks by identity, so bind _drain once
+        self._drain_callback = self._drain
+
+    def __len__(self):
+        return len(self._pending)
+
+    def post(self, message):
+        """Queue ``message`` for the main thread; safe to call from any thread."""
+        self._pending.append(message)
+
+    def start(self):
+        """Register the drain timer. Must be called on the main thread."""
+        if self.running:
+            return
+        self.running = True
+        self.timers.register(self._drain_callback, first_interval=0, persistent=True)
+
+    def stop(self):
+        self.running = False
+        self._pending.clear()
+        if self.timers.is_registered(self._drain_callback):
+            self.timers.unregister(self._drain_callback)
+
+    def drain(self):
+        """Handle pending messages within one tick's limits; returns the count."""
+        start = self.clock()
+        deadline = start + self.budget
+        count = 0
+        while self._pending and count < self.max_per_tick:
+            message = self._pending.popleft()
+            count += 1
+            try:
+                self.handle(message)
+                self.handled += 1
+            except Exception:
+                self.failed += 1
+            if self.clock() >= deadline:
+                break
+
+        if count:
+            self.ticks += 1
+            self.max_tick_duration = max(self.max_tick_duration, self.clock() - start)
+        return count
+
+    def _drain(self):
+        if not self.running:
+            return None
+        self.drain()
+        return BUSY_INTERVAL if self._pending else self.idle_interval
+
+
+class TextEditorCache:
+    """Finds a ``TEXT_EDITOR`` area and reuses it until the screens change.
+
+    The cache key is each window's screen name and area count, which changes
+    when a workspace is switched or areas are split or joined. A cached area
+    whose editor type was switched in place is detected and rescanned too, and
+    a miss is never cached, so a newly opened text editor is found at once.
+    """
+
+    def __init__(self):
+        self.scans = 0
+        self.hits = 0
+        self._key = None
+        self._area = None
+
+    def invalidate(self):
+        self._key = None
+        self._area = None
+
+    def find(self, window_manager):
+        """Return a ``TEXT_EDITOR`` area, or None if no window shows one."""
+        windows = window_manager.windows
+        key = tuple(
+            (window.screen.name, len(window.screen.areas)) for window in windows
+        )
+        if (
+            key == self._key
+            and self._area is not None
+            and self._area.type == "TEXT_EDITOR"
+        ):
+            self.hits += 1
+            return self._area
+
+        self.scans += 1
+        self._key = key
+        self._area = next(
+            (
+                area
+                for window in windows
+                for area in window.screen.areas
+                if area.type == "TEXT_EDITOR"
+            ),
+            None,
+        )
+        return self._area
@@ -0,0 +1,171 @@
+"""Binding of UI parameters into catalog scripts.
+
+A catalog script declares its parameters as literal assignments at the top
+of ``def main():``::
+
+    def main():
+        target_width = 1024
+        maintain_aspect_ratio = True
+
+``ScriptTemplate`` parses a script once with ``ast`` and records the source
+span of each such assignment's value. Binding then only splices literals into
+those spans, so the cost no longer depends on the script's length times its
+parameter count, a parameter never matches another whose name it prefixes, and
+strings are encoded with ``repr`` instead of naive quoting.
+
+``ParameterBinder`` caches templates by content hash, so a script sent again
+with new parameter values is never parsed twice.
+"""
+
+import ast
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+MAX_TEMPLATES = 64
+ENTRY_POINT = "main"
+
+
+def encode_literal(value):
+    """Return Python source that evaluates to ``value``."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return f'float("{value}")'
+    return repr(value)
+
+
+def _is_literal(node):
+    try:
+        ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return False
+    return True
+
+
+def _main_assignments(tree):
+    """Yield ``(name, value_node)`` for main()'s parameter assignments.
+
+    A parameter is the first assignment of a name directly in main()'s body
+    whose value is a literal; computed values are left alone.
+    """
+    main = next(
+        (
+            node
+            for node in tree.body
+            if isinstance(node, ast.FunctionDef) and node.name == ENTRY_POINT
+        ),
+        None,
+    )
+    if main is None:
+        return
+
+    seen = set()
+    for statement in main.body:
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+            target = statement.targets[0]
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            target = statement.target
+        else:
+            continue
+        if not isinstance(target, ast.Name) or target.id in seen:
+            continue
+        seen.add(target.id)
+        if _is_literal(statement.value):
+            yield target.id, statement.value
+
+
+class ScriptTemplate:
+    """A script split into literal chunks around its parameter values.
+
+    ``chunks`` always has one more entry than ``names``; the value of
+    ``names[i]`` sits between ``chunks[i]`` and ``chunks[i + 1]``. A script
+    that does not parse, or has no ``main()``, becomes a template without
+    parameters and binds to itself.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.names = []
+        self.defaults = []
+        self.chunks = [source]
+        self.slots = {}
+
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return
+
+        # ast column offsets count UTF-8 bytes, so spans are cut from the
+        # encoded source and decoded per chunk.
+        data = source.encode("utf-8")
+        line_starts = [0]
+        for line in data.splitlines(keepends=True):
+            line_starts.append(line_starts[-1] + len(line))
+
+        chunks = []
+        position = 0
+        for name, value in _main_assignments(tree):
+            start = line_starts[value.lineno - 1] + value.col_offset
+            end = line_starts[value.end_lineno - 1] + value.end_col_offset
+            chunks.append(data[position:start].decode("utf-8"))
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+            self.defaults.append(data[start:end].decode("utf-8"))
+            position = end
+        chunks.append(data[position:].decode("utf-8"))
+        self.chunks = chunks
+
+    def bind(self, parameters):
+        """Return the source with known ``parameters`` spliced in; others are ignored."""
+        if not self.names:
+            return self.source
+
+        values = list(self.defaults)
+        for name, value in parameters.items():
+            slot = self.slots.get(name)
+            if slot is not None:
+                values[slot] = encode_literal(value)
+
+        parts = [self.chunks[0]]
+        for value, chunk in zip(values, self.chunks[1:]):
+            parts.append(value)
+            parts.append(chunk)
+        return "".join(parts)
+
+
+class ParameterBinder:
+    """LRU cache of ``ScriptTemplate`` objects keyed by a hash of the script.
+
+    Safe to share between the script server's worker threads.
+    """
+
+    def __init__(self, max_templates=MAX_TEMPLATES):
+        self.max_templates = max_templates
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def template(self, source):
+        key = hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        template = ScriptTemplate(source)
+        with self._lock:
+            self._templates[key] = template
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        return template
+
+    def bind(self, source, parameters):
+        return self.template(source).bind(parameters)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
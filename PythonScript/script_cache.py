@@ -0,0 +1,101 @@
+"""Content-addressed cache of bound catalog scripts.
+
+Entries are keyed by a hash of the script and a hash of its parameters, so a
+script re-sent with the same values resolves to the same ``CachedScript``
+without binding it again. Each entry compiles its source at most once, on
+first use, so a run-immediately request can reuse the code object. The
+cache also remembers which entry was last written to each text block, so the
+add-on can skip rewriting a block that already holds it.
+
+Nothing here imports ``bpy``; lookups happen on the script server's workers
+and only the write bookkeeping runs on Blender's main thread.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 32
+
+
+def content_hash(data):
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).digest()
+
+
+def parameters_hash(parameters):
+    return content_hash(json.dumps(parameters, sort_keys=True, separators=(",", ":")))
+
+
+class CachedScript:
+    """A bound script; ``name`` is only used as the filename when compiling."""
+
+    def __init__(self, key, name, source):
+        self.key = key
+        self.name = name
+        self.source = source
+        self._code = None
+
+    def compiled(self):
+        """Return the code object, compiling on first use; raises SyntaxError."""
+        if self._code is None:
+            self._code = compile(self.source, self.name, "exec")
+        return self._code
+
+
+class ScriptCache:
+    """LRU of ``CachedScript`` keyed by ``(script hash, parameters hash)``.
+
+    ``bind`` turns ``(source, parameters)`` into the final script text; it
+    only runs on a miss. Safe to share between threads.
+    """
+
+    def __init__(self, bind, max_entries=MAX_ENTRIES):
+        self.bind = bind
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.writes_skipped = 0
+        self._entries = OrderedDict()
+        self._written = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def lookup(self, name, source, parameters):
+        key = (content_hash(source), parameters_hash(parameters))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        bound = self.bind(source, parameters) if parameters and source else source
+        entry = CachedScript(key, name, bound)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def is_written(self, text_name, entry):
+        """True if ``entry`` was the last thing written to ``text_name``."""
+        return self._written.get(text_name) == entry.key
+
+    def mark_written(self, text_name, entry):
+        self._written[text_name] = entry.key
+        self.writes += 1
+
+    def mark_skipped(self):
+        self.writes_skipped += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._written.clear()
@@ -0,0 +1,103 @@
+"""Instrumented execution of catalog scripts.
+
+``run_script`` executes a compiled script in a fresh ``__main__``-like
+namespace, so catalog scripts guarded by ``if __name__ == "__main__":`` run
+their ``main()`` and leave nothing behind between runs. It measures wall time
+and, optionally, the peak memory allocated through ``tracemalloc``, and
+captures everything printed to stdout. The result is a plain dict ready to be
+sent back to the UI as JSON.
+
+Scripts must be run on Blender's main thread; nothing here imports ``bpy``.
+"""
+
+import builtins
+import contextlib
+import io
+import time
+import traceback
+import tracemalloc
+
+MAX_CAPTURED_OUTPUT = 64 * 1024
+
+
+class _CappedOutput(io.StringIO):
+    """StringIO that keeps only the first ``limit`` characters written."""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.truncated = False
+
+    def write(self, text):
+        remaining = self.limit - self.tell()
+        if len(text) > remaining:
+            self.truncated = True
+            text = text[: max(remaining, 0)]
+        return super().write(text) if text else 0
+
+
+def run_script(
+    code,
+    name,
+    trace_memory=False,
+    max_output=MAX_CAPTURED_OUTPUT,
+    clock=time.perf_counter,
+):
+    """Execute ``code`` and return its result dict.
+
+    ``status`` is ``"ok"`` or ``"error"``; on error ``error`` holds the
+    formatted traceback. ``peak_memory`` is in bytes, or None when
+    ``trace_memory`` is off, and counts only memory allocated during the run.
+    ``memory_traced`` is True when ``tracemalloc`` was running, in which case
+    ``wall_time`` includes its overhead and is not comparable to untraced runs.
+    """
+    namespace = {"__name__": "__main__", "__file__": name, "__builtins__": builtins}
+    output = _CappedOutput(max_output)
+    error = None
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    start = clock()
+    try:
+        with contextlib.redirect_stdout(output):
+            exec(code, namespace)
+    except (Exception, SystemExit):
+        error = traceback.format_exc()
+    finally:
+        wall_time = clock() - start
+        peak_memory = (
+            tracemalloc.get_traced_memory()[1] - baseline if trace_memory else None
+        )
+        if started_tracing:
+            tracemalloc.stop()
+        namespace.clear()
+
+    return {
+        "name": name,
+        "status": "error" if error else "ok",
+        "wall_time": wall_time,
+        "peak_memory": peak_memory,
+        "memory_traced": trace_memory,
+        "stdout": output.getvalue(),
+        "stdout_truncated": output.truncated,
+        "error": error,
+    }
+
+
+def failed_result(name, error):
+    """Result for a script that could not be run at all, e.g. a SyntaxError."""
+    return {
+        "name": name,
+        "status": "error",
+        "wall_time": 0.0,
+        "peak_memory": None,
+        "memory_traced": False,
+        "stdout": "",
+        "stdout_truncated": False,
+        "error": error,
+    }
@@ -0,0 +1,244 @@
+"""Concurrent, backpressured ingest of script messages.
+
+``ScriptIngestServer`` runs one acceptor thread per pipe instance, so a sender
+is never refused while another script is still being read, and a bounded
+pool of workers that hands decoded messages to the handler. Between the two
+sits a ``BoundedMessageQueue`` whose overflow policy is explicit:
+
+* ``REJECT`` drops new messages while the queue is full.
+* ``COALESCE`` replaces a pending message with the same key (the script name)
+  by the newer one, and drops the oldest pending keyed message if the queue
+  is still full. Messages without a key (run requests) are never dropped;
+  when only those are pending, the new message is rejected instead.
+
+Refused messages go to the server's ``reject`` callable, so a sender can be
+told about the backpressure.
+
+The server only sees ``accept``/``decode``/``handle`` callables and
+connections exposing ``readinto`` and ``close``, so the concurrency logic runs
+the same over Windows named pipes and over local sockets.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from . import ipc_transport
+
+REJECT = "reject"
+COALESCE = "coalesce"
+MAX_QUEUE_DEPTH = 32
+ACCEPTOR_COUNT = 4
+WORKER_COUNT = 2
+ACCEPT_RETRY_INTERVAL = 0.05
+ACCEPT_RETRY_MAX_INTERVAL = 2.0
+STOP_TIMEOUT = 5.0
+
+
+class _Unkeyed:
+    """Pending key of a message that is never coalesced or dropped."""
+
+    __slots__ = ()
+
+
+class BoundedMessageQueue:
+    def __init__(self, max_depth=MAX_QUEUE_DEPTH, policy=COALESCE, key=None):
+        if policy not in (REJECT, COALESCE):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.max_depth = max_depth
+        self.policy = policy
+        self.key = key
+        self.accepted = 0
+        self.rejected = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.high_water = 0
+        self._pending = OrderedDict()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def __len__(self):
+        with self._condition:
+            return len(self._pending)
+
+    def put(self, message):
+        """Queue ``message``; returns False if the overflow policy refused it."""
+        key = self.key(message) if self.key and self.policy == COALESCE else None
+        if key is None:
+            key = _Unkeyed()
+
+        with self._condition:
+            if self._closed:
+                return False
+
+            if self.policy == COALESCE and key in self._pending:
+                self._pending[key] = message
+                self.coalesced += 1
+                return True
+
+            if len(self._pending) >= self.max_depth:
+                droppable = None
+                if self.policy == COALESCE:
+                    droppable = next(
+                        (k for k in self._pending if not isinstance(k, _Unkeyed)),
+                        None,
+                    )
+                if droppable is None:
+                    self.rejected += 1
+                    return False
+                del self._pending[droppable]
+                self.dropped += 1
+
+            self._pending[key] = message
+            self.accepted += 1
+            self.high_water = max(self.high_water, len(self._pending))
+            self._condition.notify()
+            return True
+
+    def get(self, timeout=None):
+        """Return the oldest pending message, or None once closed or on timeout."""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._pending or self._closed, timeout
+            ):
+                return None
+            if not self._pending:
+                return None
+            return self._pending.popitem(last=False)[1]
+
+    def open(self):
+        with self._condition:
+            self._closed = False
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+
+class ScriptIngestServer:
+    """Accepts framed messages on several connections at once.
+
+    ``accept`` blocks until a client connects and returns a connection, or
+    None on failure. ``wake`` must unblock one pending ``accept`` so ``stop``
+    can shut acceptors down. ``decode`` turns a frame (a memoryview valid only
+    during the call) into a message or None, and ``handle`` runs on a worker.
+    ``reject`` is called on the acceptor thread with every message the queue
+    refused.
+    """
+
+    def __init__(
+        self,
+        accept,
+        decode,
+        handle,
+        wake=None,
+        reject=None,
+        queue=None,
+        acceptors=ACCEPTOR_COUNT,
+        workers=WORKER_COUNT,
+    ):
+        self.accept = accept
+        self.decode = decode
+        self.handle = handle
+        self.wake = wake
+        self.reject = reject
+        self.queue = queue if queue is not None else BoundedMessageQueue()
+        self.acceptor_count = acceptors
+        self.worker_count = workers
+        self.connections = 0
+        self.malformed = 0
+        self.failed = 0
+        self._threads = []
+        self._acceptors = []
+        self._stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def running(self):
+        return bool(self._threads) and not self._stop_event.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        # Threads left over by a stop() that timed out must be gone first
+        if self._threads and not self.stop():
+            raise RuntimeError("Script server threads are still shutting down")
+        self._stop_event.clear()
+        self.queue.open()
+        self._acceptors = [
+            threading.Thread(target=self._accept_loop, daemon=True)
+            for _ in range(self.acceptor_count)
+        ]
+        self._threads = self._acceptors + [
+            threading.Thread(target=self._work_loop, daemon=True)
+            for _ in range(self.worker_count)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """Stop all threads; returns False if some were still alive at ``timeout``.
+
+        A wake only unblocks an acceptor that is waiting in ``accept`` at that
+        moment, so acceptors are woken again every ``ACCEPT_RETRY_INTERVAL``
+        until they have all exited. Threads still alive at the deadline stay
+        in ``_threads`` for the next ``stop`` or ``start`` to wait for.
+        """
+        if not self._threads:
+            return True
+        self._stop_event.set()
+        self.queue.close()
+        deadline = time.monotonic() + timeout
+
+        while True:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            remaining = deadline - time.monotonic()
+            if not self._threads or remaining <= 0:
+                break
+            if self.wake:
+                for thread in self._threads:
+                    if thread in self._acceptors:
+                        self.wake()
+            wait_until = time.monotonic() + min(ACCEPT_RETRY_INTERVAL, remaining)
+            for thread in self._threads:
+                thread.join(timeout=max(wait_until - time.monotonic(), 0))
+        return not self._threads
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _accept_loop(self):
+        reader = ipc_transport.FrameReader()
+        retry_interval = ACCEPT_RETRY_INTERVAL
+
+        while not self._stop_event.is_set():
+            connection = self.accept()
+            if connection is None:
+                if self._stop_event.wait(retry_interval):
+                    break
+                retry_interval = min(retry_interval * 2, ACCEPT_RETRY_MAX_INTERVAL)
+                continue
+            retry_interval = ACCEPT_RETRY_INTERVAL
+            self._count("connections")
+
+            reader.attach(connection.readinto)
+            try:
+                while (frame := reader.read_frame()) is not None:
+                    message = self.decode(frame)
+                    if message is not None and not self.queue.put(message):
+                        if self.reject:
+                            self.reject(message)
+            except ValueError:
+                self._count("malformed")
+            finally:
+                connection.close()
+
+    def _work_loop(self):
+        while (message := self.queue.get()) is not None:
+            try:
+                self.handle(message)
+            except Exception:
+                self._count("failed")
@@ -1,11 +1,348 @@
-import bpy
+import json
 import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+SNAPSHOT_NAME = "batch_render_snapshot.blend"
+# Each run saves its snapshot in a new directory with this prefix
+SNAPSHOT_DIR_PREFIX = "batch_render_snapshot_"
+MANIFEST_NAME = "batch_render_manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_WORKERS = 2
+DEFAULT_CHUNK_SIZE = 10
+LOG_LINES = 20
+POLL_INTERVAL = 0.5
+SAVED_PATTERN = re.compile(r"^Saved: '(.*)'")
+FRAME_PATTERN = re.compile(r"^Fra:(\d+)")
+# Runs inside each worker before rendering; the camera name follows "--"
+SET_CAMERA = (
+    "import bpy, sys; "
+    "bpy.context.scene.camera = bpy.data.objects[sys.argv[sys.argv.index('--') + 1]]"
+)
+
+
+# ---------------------------------------------------------------------------
+# Scheduler: plain Python, drives `blender -b` worker processes.
+# ---------------------------------------------------------------------------
+
+
+class RenderJob:
+    """
+    One camera rendered over a frame range by one worker process.
+    """
+
+    def __init__(self, camera, output_prefix, frame_start, frame_end=None):
+        self.camera = camera
+        self.output_prefix = output_prefix
+        self.frame_start = frame_start
+        self.frame_end = frame_start if frame_end is None else frame_end
+        self.frame = None
+        self.outputs = []
+        self.returncode = None
+        self.wall_time = None
+        self.log = deque(maxlen=LOG_LINES)
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+    @property
+    def key(self):
+        return f"{self.camera}:{self.frame_start}-{self.frame_end}"
+
+    def expected_outputs(self, extension):
+        """
+        Files Blender writes for this job: the prefix, the frame number
+        padded to four digits and the format's extension.
+        """
+        return [
+            f"{self.output_prefix}{frame:04d}{extension}"
+            for frame in range(self.frame_start, self.frame_end + 1)
+        ]
+
+
+def frame_chunks(frame_start, frame_end, chunk_size):
+    """
+    Splits an inclusive frame range into (start, end) chunks.
+    """
+    chunk_size = max(1, chunk_size)
+    return [
+        (start, min(start + chunk_size - 1, frame_end))
+        for start in range(frame_start, frame_end + 1, chunk_size)
+    ]
+
+
+def output_key(path):
+    """
+    Manifest key of an output file: its normalized, case-folded path.
+    """
+    return os.path.normcase(os.path.normpath(path))
+
+
+class RenderManifest:
+    """
+    JSON record of finished jobs kept in the output directory: the size of
+    every file each job wrote and how long it took. A job counts as done
+    when all of its files still exist with the recorded sizes, so a rerun
+    after a crash only renders what is missing. Safe to update from the
+    scheduler's pool threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.jobs = data.get("jobs", {})
+
+    def is_complete(self, job, extension):
+        entry = self.jobs.get(job.key)
+        if not entry:
+            return False
+        sizes = entry["outputs"]
+        for path in job.expected_outputs(extension):
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return False
+            if not size or sizes.get(output_key(path)) != size:
+                return False
+        return True
+
+    def record(self, job, extension):
+        """
+        Stores a successful job's output sizes and wall time and saves.
+        """
+        # Keyed like is_complete looks them up, not by the "Saved:" paths,
+        # which differ in separators and case on Windows
+        outputs = {}
+        for path in job.expected_outputs(extension):
+            if os.path.isfile(path):
+                outputs[output_key(path)] = os.path.getsize(path)
+        with self._lock:
+            self.jobs[job.key] = {
+                "camera": job.camera,
+                "frame_start": job.frame_start,
+                "frame_end": job.frame_end,
+                "outputs": outputs,
+                "wall_time": job.wall_time,
+            }
+            self._save()
+
+    def _save(self):
+        data = {"version": MANIFEST_VERSION, "jobs": self.jobs}
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+def threads_per_worker(workers, cpu_count=None):
+    """
+    Render threads for each worker so that all workers together use every
+    core once instead of each one starting a thread per core.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return max(1, cpu_count // max(1, workers))
+
+
+def worker_command(executable, blend_path, scene_name, job, threads):
+    """
+    Command line rendering job from the snapshot. executable is a path or a
+    list, so a wrapper (or a fake worker) can stand in for Blender.
+    """
+    if isinstance(executable, (list, tuple)):
+        command = list(executable)
+    else:
+        command = [executable]
+    command += ["-b", blend_path, "-S", scene_name, "-t", str(threads)]
+    command += ["--python-expr", SET_CAMERA, "-o", job.output_prefix]
+    if job.frame_start == job.frame_end:
+        command += ["-f", str(job.frame_start)]
+    else:
+        command += ["-s", str(job.frame_start), "-e", str(job.frame_end), "-a"]
+    return command + ["--", job.camera]
+
+
+class RenderScheduler:
+    """
+    Runs render jobs on a pool of worker processes, reading each worker's
+    output as it arrives. on_event(kind, job, detail) is called from the
+    pool threads with kind "started", "frame", "saved", "finished" or
+    "failed".
+    """
+
+    def __init__(
+        self,
+        executable,
+        blend_path,
+        scene_name,
+        workers=DEFAULT_WORKERS,
+        threads=None,
+        on_event=None,
+        popen=subprocess.Popen,
+    ):
+        self.executable = executable
+        self.blend_path = blend_path
+        self.scene_name = scene_name
+        self.workers = max(1, workers)
+        self.threads = threads or threads_per_worker(self.workers)
+        self.on_event = on_event
+        self.popen = popen
+        self.cancelled = False
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def run(self, jobs):
+        """
+        Renders all jobs and returns them with outputs and timings filled in.
+        """
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs) or 1)) as pool:
+            list(pool.map(self._run_job, jobs))
+        return jobs
+
+    def cancel(self):
+        """
+        Stops running workers; jobs not started yet are skipped.
+        """
+        self.cancelled = True
+        with self._lock:
+            for process in self._processes:
+                process.terminate()
+
+    def _emit(self, kind, job, detail=None):
+        if self.on_event:
+            self.on_event(kind, job, detail)
+
+    def _run_job(self, job):
+        if self.cancelled:
+            return job
+
+        command = worker_command(
+            self.executable, self.blend_path, self.scene_name, job, self.threads
+        )
+        start = time.perf_counter()
+        self._emit("started", job)
+        try:
+            process = self.popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+            )
+        except OSError as e:
+            job.returncode = -1
+            job.log.append(str(e))
+            job.wall_time = time.perf_counter() - start
+            self._emit("failed", job, str(e))
+            return job
+
+        with self._lock:
+            self._processes.add(process)
+        try:
+            for line in process.stdout:
+                self._read_line(job, line.rstrip())
+            job.returncode = process.wait()
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+        job.wall_time = time.perf_counter() - start
+        self._emit("finished" if job.ok else "failed", job, job.returncode)
+        return job
+
+    def _read_line(self, job, line):
+        job.log.append(line)
+        saved = SAVED_PATTERN.match(line)
+        if saved:
+            job.outputs.append(saved.group(1))
+            self._emit("saved", job, saved.group(1))
+            return
+        frame = FRAME_PATTERN.match(line)
+        if frame and int(frame.group(1)) != job.frame:
+            job.frame = int(frame.group(1))
+            self._emit("frame", job, job.frame)
+
+
+def describe_event(kind, job, detail):
+    if kind == "started":
+        return f"  {job.camera}: started"
+    if kind == "frame":
+        return f"  {job.camera}: rendering frame {detail}"
+    if kind == "saved":
+        return f"  {job.camera}: saved {detail}"
+    if kind == "finished":
+        return f"  {job.camera}: finished in {job.wall_time:.1f}s"
+    return f"  {job.camera}: failed ({detail})\n    " + "\n    ".join(job.log)
+
+
+def print_summary(jobs, elapsed, skipped=0):
+    outputs = [path for job in jobs for path in job.outputs]
+    failed = [job.key for job in jobs if not job.ok]
+    print("-" * 50)
+    print(f"Batch rendering completed in {elapsed:.1f}s!")
+    print(f"  - Jobs: {len(jobs) - len(failed)} of {len(jobs)} succeeded")
+    if skipped:
+        print(f"  - Skipped {skipped} jobs rendered by an earlier run")
+    if failed:
+        print(f"  - Failed jobs: {', '.join(failed)}")
+
+    camera_times = {}
+    for job in jobs:
+        if job.wall_time is not None:
+            camera_times[job.camera] = camera_times.get(job.camera, 0) + job.wall_time
+    if camera_times:
+        print("  - Render time per camera (slowest first):")
+        for camera, wall_time in sorted(
+            camera_times.items(), key=lambda item: -item[1]
+        ):
+            print(f"    {camera}: {wall_time:.1f}s")
+    print(f"  - Outputs ({len(outputs)}):")
+    for path in outputs:
+        print(f"    {path}")
 
 
-def batch_render_setup():
+# ---------------------------------------------------------------------------
+# Blender side: snapshot the file and watch the workers from a timer.
+# ---------------------------------------------------------------------------
+
+
+def batch_render_setup(
+    workers=DEFAULT_WORKERS,
+    blender_path=None,
+    wait=False,
+    animation=False,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    resume=True,
+):
     """
     Sets up batch rendering for multiple cameras with different output paths.
     Creates render jobs for each camera in the scene.
+
+    Parameters:
+    - workers: Number of background Blender processes (default: 2)
+    - blender_path: Blender executable for the workers (default: this Blender)
+    - wait: Block until all renders finish instead of reporting progress
+      from a timer while the UI stays responsive (default: False)
+    - animation: Render the scene's frame range instead of the current frame (default: False)
+    - chunk_size: Frames per job when rendering an animation (default: 10)
+    - resume: Skip jobs whose outputs an earlier run already wrote (default: True)
     """
     scene = bpy.context.scene
     cameras = [obj for obj in scene.objects if obj.type == "CAMERA"]
@@ -23,28 +360,123 @@ def batch_render_setup():
     base_dir = bpy.path.abspath(base_path)
     os.makedirs(base_dir, exist_ok=True)
 
-    print(f"Found {len(cameras)} cameras for batch rendering:")
-
-    for i, camera in enumerate(cameras):
-        # Set active camera
-        scene.camera = camera
+    if animation:
+        chunks = frame_chunks(scene.frame_start, scene.frame_end, chunk_size)
+    else:
+        chunks = [(scene.frame_current, scene.frame_current)]
 
-        # Set output path for this camera
+    extension = scene.render.file_extension
+    manifest = RenderManifest(os.path.join(base_dir, MANIFEST_NAME))
+    jobs = []
+    skipped = 0
+    for camera in cameras:
         camera_name = camera.name.replace(" ", "_")
         output_path = os.path.join(base_dir, f"{camera_name}_")
-        scene.render.filepath = output_path
+        for frame_start, frame_end in chunks:
+            job = RenderJob(camera.name, output_path, frame_start, frame_end)
+            if resume and manifest.is_complete(job, extension):
+                skipped += 1
+            else:
+                jobs.append(job)
 
-        print(f"  {i+1}. {camera.name} -> {output_path}")
+    if not jobs:
+        print(f"All {skipped} render jobs are already complete in {base_dir}")
+        return
+
+    # Workers render from a copy, so later edits don't affect them. Every
+    # run gets its own, removed with its directory once all jobs are done
+    snapshot_dir = tempfile.mkdtemp(prefix=SNAPSHOT_DIR_PREFIX, dir=base_dir)
+    snapshot = os.path.join(snapshot_dir, SNAPSHOT_NAME)
+    try:
+        bpy.ops.wm.save_as_mainfile(filepath=snapshot, copy=True)
+    except Exception:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+        raise
+
+    scheduler = RenderScheduler(
+        blender_path or bpy.app.binary_path, snapshot, scene.name, workers
+    )
+
+    print(f"Found {len(cameras)} cameras for batch rendering:")
+    for i, job in enumerate(jobs):
+        print(
+            f"  {i+1}. {job.camera} frames {job.frame_start}-{job.frame_end} "
+            f"-> {job.output_prefix}"
+        )
+    if skipped:
+        print(f"Skipping {skipped} jobs already rendered")
+    print(
+        f"Rendering with {scheduler.workers} workers, "
+        f"{scheduler.threads} threads each"
+    )
 
-        # Render the current frame
-        bpy.ops.render.render(write_still=True)
+    def recorded(report):
+        # Finished jobs are recorded right away, so a crash loses nothing
+        def on_event(kind, job, detail):
+            if kind == "finished":
+                manifest.record(job, extension)
+            report(kind, job, detail)
 
-    # Reset to original path
-    scene.render.filepath = base_path
+        return on_event
+
+    start = time.perf_counter()
+    if wait:
+        scheduler.on_event = recorded(lambda *event: print(describe_event(*event)))
+        try:
+            scheduler.run(jobs)
+        finally:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+        print_summary(jobs, time.perf_counter() - start, skipped)
+        return jobs
+
+    # Workers report from pool threads; a timer prints on the main thread
+    events = queue.Queue()
+    scheduler.on_event = recorded(lambda *event: events.put(event))
+
+    def render():
+        try:
+            scheduler.run(jobs)
+        finally:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+            events.put(None)
+
+    def report_progress():
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                return POLL_INTERVAL
+            if event is None:
+                print_summary(jobs, time.perf_counter() - start, skipped)
+                return None
+            print(describe_event(*event))
+
+    threading.Thread(target=render, daemon=True).start()
+    bpy.app.timers.register(report_progress, first_interval=POLL_INTERVAL)
+    return scheduler
+
+
+def main():
+    """
+    Main function to execute the batch render script.
+    This function will be called when the script is executed from the UI.
+    """
+    # Default parameters - these will be overridden by the UI
+    workers = 2
+    wait = False
+    animation = False
+    chunk_size = 10
+    resume = True
 
-    print("Batch rendering completed!")
+    batch_render_setup(
+        workers,
+        wait=wait,
+        animation=animation,
+        chunk_size=chunk_size,
+        resume=resume,
+    )
 
 
 # Run the function
 if __name__ == "__main__":
-    batch_render_setup()
+    main()
@@ -1,68 +1,520 @@
+import concurrent.futures
+import hashlib
+import marshal
+import sys
+import time
+
 import bpy
+import numpy as np
+
+DEFAULT_TOLERANCE = 0.001
+# Long curves are reduced in independent runs of at most this many keys
+SEGMENT_KEYS = 1024
+# Blender's enum value for linear keyframe interpolation
+INTERPOLATION_LINEAR = 1
+# Keyframe attributes copied through foreach_get/foreach_set, with their
+# dtype and values per key, so kept keys keep their handles and easing
+KEY_ATTRIBUTES = {
+    "co": (np.float32, 2),
+    "handle_left": (np.float32, 2),
+    "handle_right": (np.float32, 2),
+    "handle_left_type": (np.int32, 1),
+    "handle_right_type": (np.int32, 1),
+    "interpolation": (np.int32, 1),
+    "easing": (np.int32, 1),
+    "type": (np.int32, 1),
+    "back": (np.float32, 1),
+    "amplitude": (np.float32, 1),
+    "period": (np.float32, 1),
+}
+# Rounds of putting keys back when the written curve misses the tolerance
+REFINE_ROUNDS = 3
+# Action custom property holding the content hash of its last optimization
+HASH_PROPERTY = "curve_optimizer_hash"
+# Name the reduction functions are registered under in pool processes
+WORKER_MODULE = "curve_optimizer_worker"
+
 
+# ---------------------------------------------------------------------------
+# Reduction: plain NumPy, no Blender types.
+# ---------------------------------------------------------------------------
 
-def optimize_animation_curves():
+
+def curve_bounds(count, offsets=None):
     """
-    Optimizes animation curves by removing redundant keyframes
-    and smoothing curve interpolation.
+    Keys every reduction starts from: every SEGMENT_KEYS-th key of each
+    curve and its last key, curve i being the rows offsets[i]:offsets[i + 1]
+    (one curve when offsets is None).
     """
-    # Get the active object
-    obj = bpy.context.active_object
+    if offsets is None:
+        offsets = (0, count)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    starts, ends = offsets[:-1], offsets[1:]
+    starts, ends = starts[ends > starts], ends[ends > starts]
 
-    if not obj or not obj.animation_data or not obj.animation_data.action:
-        print("No animation data found on active object")
-        return
+    segments = (ends - starts + SEGMENT_KEYS - 1) // SEGMENT_KEYS
+    first = np.cumsum(segments) - segments
+    steps = np.arange(segments.sum()) - np.repeat(first, segments)
+    segment_starts = np.repeat(starts, segments) + steps * SEGMENT_KEYS
+    return np.unique(np.concatenate([segment_starts, ends - 1]))
 
-    action = obj.animation_data.action
-    fcurves = action.fcurves
 
-    if not fcurves:
-        print("No animation curves found")
-        return
+def decimate_keys(times, values, tolerance=DEFAULT_TOLERANCE, offsets=None):
+    """
+    Ramer-Douglas-Peucker over (time, value) keys: a mask of the keys to
+    keep so that linear interpolation between them stays within tolerance
+    of every original value. The first and last keys are always kept.
+
+    All segments at the same depth are split together, so each pass is a
+    handful of vectorized operations over the whole curve. Curves longer
+    than SEGMENT_KEYS start out split every SEGMENT_KEYS keys, which bounds
+    the number of passes at the cost of keeping those few boundary keys.
+    Several curves packed end to end (see curve_bounds) are reduced
+    together the same way.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    count = len(times)
+    keep = np.zeros(count, dtype=bool)
+    if count < 3:
+        keep[:] = True
+        return keep
+
+    bounds = curve_bounds(count, offsets)
+    keep[bounds] = True
+    starts, ends = bounds[:-1], bounds[1:]
+    while len(starts):
+        inner = ends - starts - 1
+        starts, ends, inner = starts[inner > 0], ends[inner > 0], inner[inner > 0]
+        if not len(starts):
+            break
+
+        # Every interior key with the segment it belongs to
+        segment = np.repeat(np.arange(len(starts)), inner)
+        first = np.cumsum(inner) - inner
+        points = np.arange(inner.sum()) - np.repeat(first, inner)
+        points += np.repeat(starts + 1, inner)
+
+        t0, t1 = times[starts][segment], times[ends][segment]
+        v0, v1 = values[starts][segment], values[ends][segment]
+        span = t1 - t0
+        slope = np.divide(v1 - v0, span, out=np.zeros_like(span), where=span != 0)
+        error = np.abs(values[points] - (v0 + (times[points] - t0) * slope))
+
+        # Split each segment at its worst key if that is out of tolerance
+        worst = np.maximum.reduceat(error, first)
+        at_worst = np.flatnonzero(error == worst[segment])
+        worst_segment = segment[at_worst]
+        first_worst = np.flatnonzero(np.diff(worst_segment, prepend=-1))
+        splits = points[at_worst[first_worst]]
+        split = worst > tolerance
+
+        keep[splits[split]] = True
+        starts, ends = (
+            np.concatenate([starts[split], splits[split]]),
+            np.concatenate([splits[split], ends[split]]),
+        )
+    return keep
+
+
+def max_error(times, values, keep):
+    """
+    Largest distance between the original values and linear interpolation
+    through the kept keys.
+    """
+    if keep.all():
+        return 0.0
+    approximation = np.interp(times, times[keep], values[keep])
+    return float(np.abs(approximation - values).max())
+
+
+def decimated_interpolation(interpolation, keep):
+    """
+    Interpolation of the kept keys, LINEAR where the segment to the next
+    kept key spans removed keys. That is the curve decimate_keys bounded,
+    so the written curve stays within tolerance at every original key.
+    Segments between keys that were neighbours already keep their mode.
+    """
+    kept = np.flatnonzero(keep)
+    result = np.array(interpolation[kept], dtype=np.int32)
+    result[:-1][np.diff(kept) > 1] = INTERPOLATION_LINEAR
+    return result
+
+
+def curve_errors(times, values, keep, offsets):
+    """
+    max_error of every curve packed end to end, curve i being the rows
+    offsets[i]:offsets[i + 1]. The first and last key of each curve must
+    be kept.
+    """
+    kept = np.flatnonzero(keep)
+    keys = np.arange(len(times))
+    after = kept[np.minimum(np.searchsorted(kept, keys), len(kept) - 1)]
+    before = kept[np.searchsorted(kept, keys, side="right") - 1]
+
+    t0, t1 = times[before], times[after]
+    span = t1 - t0
+    slope = np.divide(
+        values[after] - values[before], span, out=np.zeros_like(span), where=span != 0
+    )
+    error = np.abs(values - (values[before] + (times - t0) * slope))
+
+    offsets = np.asarray(offsets, dtype=np.int64)
+    errors = np.zeros(len(offsets) - 1)
+    filled = offsets[1:] > offsets[:-1]
+    if filled.any():
+        errors[filled] = np.maximum.reduceat(error, offsets[:-1][filled])
+    return errors
+
+
+def reduce_curves(co, offsets, tolerance=DEFAULT_TOLERANCE):
+    """
+    Decimates every curve packed in co (N, 2), curve i being the rows
+    offsets[i]:offsets[i + 1]. Returns the keep mask over all rows and the
+    max error of each curve under linear interpolation of the kept keys.
+    """
+    times = co[:, 0].astype(np.float64)
+    values = co[:, 1].astype(np.float64)
+    keep = decimate_keys(times, values, tolerance, offsets)
+    return keep, curve_errors(times, values, keep, offsets)
+
+
+# ---------------------------------------------------------------------------
+# Process pool: the script is exec'd from text, so its functions cannot be
+# pickled by reference. Their code objects are rebuilt into a named module in
+# every process instead, which makes calls to them picklable.
+# ---------------------------------------------------------------------------
+
+WORKER_FUNCTIONS = (curve_bounds, decimate_keys, curve_errors, reduce_curves)
+
+WORKER_BOOTSTRAP = """
+import marshal
+import sys
+import types
+
+import numpy as np
+
+module = types.ModuleType(name)
+module.__builtins__ = __builtins__
+module.np = np
+module.__dict__.update(constants)
+for function_name, (code, defaults) in functions.items():
+    module.__dict__[function_name] = types.FunctionType(
+        marshal.loads(code), module.__dict__, function_name, defaults
+    )
+sys.modules[name] = module
+"""
+
+
+def worker_namespace():
+    """
+    Variables WORKER_BOOTSTRAP runs with to build the worker module.
+    """
+    return {
+        "name": WORKER_MODULE,
+        "constants": {
+            "DEFAULT_TOLERANCE": DEFAULT_TOLERANCE,
+            "SEGMENT_KEYS": SEGMENT_KEYS,
+        },
+        "functions": {
+            function.__name__: (marshal.dumps(function.__code__), function.__defaults__)
+            for function in WORKER_FUNCTIONS
+        },
+    }
+
+
+def worker_pool(processes):
+    """
+    A process pool whose processes (and this one) can import WORKER_MODULE.
+    Returns the pool and the module's reduce_curves.
+    """
+    exec(WORKER_BOOTSTRAP, worker_namespace())
+    pool = concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=exec,
+        initargs=(WORKER_BOOTSTRAP, worker_namespace()),
+    )
+    return pool, sys.modules[WORKER_MODULE].reduce_curves
+
 
-    optimized_count = 0
+# ---------------------------------------------------------------------------
+# Blender side: keyframes in and out through foreach_get/foreach_set.
+# ---------------------------------------------------------------------------
 
-    for fcurve in fcurves:
-        keyframes = fcurve.keyframe_points
 
-        if len(keyframes) < 3:
+def read_keys(fcurve):
+    """
+    Every KEY_ATTRIBUTES array of an fcurve's keyframes, (N, 2) or (N,).
+    """
+    points = fcurve.keyframe_points
+    keys = {}
+    for name, (dtype, width) in KEY_ATTRIBUTES.items():
+        array = np.empty(len(points) * width, dtype=dtype)
+        points.foreach_get(name, array)
+        keys[name] = array.reshape(-1, 2) if width == 2 else array
+    return keys
+
+
+def write_keys(fcurve, keys):
+    """
+    Replaces all keyframes of an fcurve in one pass with the given
+    KEY_ATTRIBUTES arrays. fcurve.update() then recalculates auto handles.
+    """
+    points = fcurve.keyframe_points
+    points.clear()
+    points.add(len(keys["co"]))
+    for name, (dtype, width) in KEY_ATTRIBUTES.items():
+        points.foreach_set(name, np.ascontiguousarray(keys[name], dtype=dtype).ravel())
+    fcurve.update()
+
+
+def written_error(fcurve, times, values):
+    """
+    Distance between the curve Blender plays and the original values, at
+    the original key times.
+    """
+    evaluated = np.fromiter(
+        (fcurve.evaluate(time) for time in times), dtype=np.float64, count=len(times)
+    )
+    return np.abs(evaluated - values)
+
+
+def write_decimated(fcurve, keys, keep, tolerance):
+    """
+    Writes the kept keys with their own attributes and LINEAR segments
+    across removed keys, then checks the written curve at the removed keys'
+    times. Keys still out of tolerance are put back, for a few rounds, after
+    which the curve is written unchanged. Returns the final keep mask and
+    the written curve's largest error at the original key times.
+    """
+    times = keys["co"][:, 0].astype(np.float64)
+    values = keys["co"][:, 1].astype(np.float64)
+    # float32 keys cannot resolve differences below a few ulps
+    limit = tolerance + 4 * np.finfo(np.float32).eps * max(np.abs(values).max(), 1)
+    keep = keep.copy()
+    for _ in range(REFINE_ROUNDS + 1):
+        kept = {name: array[keep] for name, array in keys.items()}
+        kept["interpolation"] = decimated_interpolation(keys["interpolation"], keep)
+        write_keys(fcurve, kept)
+        removed = np.flatnonzero(~keep)
+        error = written_error(fcurve, times[removed], values[removed])
+        if not len(error) or error.max() <= limit:
+            return keep, float(error.max(initial=0.0))
+        keep[removed[error > limit]] = True
+
+    keep[:] = True
+    write_keys(fcurve, keys)
+    return keep, 0.0
+
+
+def target_actions(all_actions):
+    """
+    Every local action, or the actions of the selected (or active) objects.
+    """
+    if all_actions:
+        return [action for action in bpy.data.actions if not action.library]
+
+    objects = list(bpy.context.selected_objects)
+    if not objects and bpy.context.active_object:
+        objects = [bpy.context.active_object]
+
+    actions = []
+    for obj in objects:
+        action = obj.animation_data.action if obj.animation_data else None
+        if action and not action.library and action not in actions:
+            actions.append(action)
+    return actions
+
+
+class ActionKeys:
+    """
+    Keyframes of one action packed into flat buffers: every KEY_ATTRIBUTES
+    array of all its curves with 3 or more keys and no modifiers, curve i
+    being rows offsets[i]:offsets[i + 1]. co is kept separately for the
+    reduction.
+    """
+
+    def __init__(self, action, tolerance):
+        self.action = action
+        self.fcurves = []
+        parts = []
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(float(tolerance)).encode())
+
+        for fcurve in action.fcurves:
+            keys = read_keys(fcurve)
+            digest.update(f"{fcurve.data_path}[{fcurve.array_index}]".encode())
+            for name in KEY_ATTRIBUTES:
+                digest.update(keys[name].tobytes())
+            # Modifiers change what the keys evaluate to; leave those alone
+            if len(keys["co"]) < 3 or len(fcurve.modifiers):
+                continue
+            self.fcurves.append(fcurve)
+            parts.append(keys)
+
+        self.hash = digest.hexdigest()
+        lengths = [len(keys["co"]) for keys in parts]
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.keys = {}
+        for name, (dtype, width) in KEY_ATTRIBUTES.items():
+            empty = np.empty((0, 2) if width == 2 else 0, dtype=dtype)
+            self.keys[name] = np.concatenate([keys[name] for keys in parts] or [empty])
+        self.co = self.keys["co"]
+
+    @property
+    def is_current(self):
+        """
+        True when the action is unchanged since it was last optimized with
+        the same tolerance.
+        """
+        return self.action.get(HASH_PROPERTY) == self.hash
+
+    def write(self, keep, tolerance):
+        """
+        Writes the kept keys of every changed curve back (see
+        write_decimated) and records the hash of the result on the action.
+        Returns the keep mask of what was actually written and the measured
+        error of every written curve, 0 for curves left unchanged.
+        """
+        keep = keep.copy()
+        errors = np.zeros(len(self.fcurves))
+        for i, (fcurve, begin, end) in enumerate(
+            zip(self.fcurves, self.offsets[:-1], self.offsets[1:])
+        ):
+            mask = keep[begin:end]
+            if not mask.all():
+                keys = {name: array[begin:end] for name, array in self.keys.items()}
+                keep[begin:end], errors[i] = write_decimated(
+                    fcurve, keys, mask, tolerance
+                )
+        self.action[HASH_PROPERTY] = ActionKeys(self.action, tolerance).hash
+        return keep, errors
+
+
+def curve_report(keys, keep, errors):
+    """
+    One (action, curve, keys before, keys after, max error) row per curve,
+    the error being that of the written curve as Blender evaluates it.
+    """
+    rows = []
+    for fcurve, begin, end, error in zip(
+        keys.fcurves, keys.offsets[:-1], keys.offsets[1:], errors
+    ):
+        rows.append(
+            (
+                keys.action.name,
+                f"{fcurve.data_path}[{fcurve.array_index}]",
+                int(end - begin),
+                int(keep[begin:end].sum()),
+                float(error),
+            )
+        )
+    return rows
+
+
+def print_report(rows):
+    """
+    Prints the per-curve report, changed curves only.
+    """
+    action_name = None
+    for name, curve, before, after, error in rows:
+        if before == after:
             continue
+        if name != action_name:
+            print(f"{name}:")
+            action_name = name
+        print(f"  {curve}: {before} -> {after} keys (max evaluated error {error:.6f})")
+
 
-        # Store original keyframe count
-        original_count = len(keyframes)
+def optimize_animation_curves(
+    tolerance=DEFAULT_TOLERANCE, all_actions=False, processes=0
+):
+    """
+    Optimizes animation curves by removing redundant keyframes.
 
-        # Select all keyframes
-        for keyframe in keyframes:
-            keyframe.select_control_point = True
+    Keys are removed with an error-bounded reduction at the data level.
+    Segments that lost keys are written as LINEAR, the remaining keys keep
+    their handles, easing and type, and the written curve is checked with
+    fcurve.evaluate, so at every original key time the curve stays within
+    tolerance of the original value.
 
-        # Set the fcurve as active
-        fcurve.select = True
+    Every action is read into flat buffers on the main thread, reduced
+    (in a process pool when processes > 0) and written back in one pass.
+    Actions whose content matches the hash stored by their last
+    optimization with the same tolerance are skipped.
 
-        # Decimate keyframes (remove redundant ones)
-        bpy.ops.graph.decimate(mode="RATIO", factor=0.1)
+    Parameters:
+    - tolerance: Largest allowed value error (default: 0.001)
+    - all_actions: Optimize every action in the file instead of the
+      selected objects' actions (default: False)
+    - processes: Worker processes for the reduction, 0 to reduce in
+      Blender's own process (default: 0)
+    """
+    actions = target_actions(all_actions)
 
-        # Smooth the curve
-        bpy.ops.graph.smooth()
+    if not actions:
+        print("No animation data found on selected objects")
+        return
 
-        # Set interpolation to bezier for smoother curves
-        for keyframe in keyframes:
-            keyframe.interpolation = "BEZIER"
-            keyframe.handle_left_type = "AUTO"
-            keyframe.handle_right_type = "AUTO"
+    start = time.perf_counter()
+    pending = []
+    for action in actions:
+        keys = ActionKeys(action, tolerance)
+        if not keys.is_current:
+            pending.append(keys)
+    skipped = len(actions) - len(pending)
 
-        new_count = len(keyframes)
-        removed = original_count - new_count
+    results = {}
+    if processes > 0 and pending:
+        pool, reduce = worker_pool(processes)
+        with pool:
+            futures = {
+                pool.submit(reduce, keys.co, keys.offsets, tolerance): keys
+                for keys in pending
+            }
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = future.result()
+    else:
+        for keys in pending:
+            results[keys] = reduce_curves(keys.co, keys.offsets, tolerance)
 
-        if removed > 0:
-            optimized_count += 1
-            print(f"Optimized {fcurve.data_path}: removed {removed} keyframes")
+    rows = []
+    for keys in pending:
+        keep, _ = results[keys]
+        keep, errors = keys.write(keep, tolerance)
+        rows.extend(curve_report(keys, keep, errors))
 
     # Update the scene
     bpy.context.scene.frame_set(bpy.context.scene.frame_current)
 
-    print(f"Animation optimization completed! Optimized {optimized_count} curves.")
+    print_report(rows)
+    optimized_count = sum(1 for row in rows if row[3] < row[2])
+    print(
+        f"Animation optimization completed! Optimized {optimized_count} curves "
+        f"in {len(pending)} actions ({skipped} unchanged since last run)."
+    )
+    print(
+        f"Keyframes: {sum(row[2] for row in rows)} -> {sum(row[3] for row in rows)} "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    if rows:
+        print(f"Max evaluated error: {max(row[4] for row in rows):.6f}")
+    return rows
+
+
+def main():
+    """
+    Main function to execute the curve optimizer script.
+    This function will be called when the script is executed from the UI.
+    """
+    # Default parameters - these will be overridden by the UI
+    tolerance = 0.001
+    all_actions = False
+    processes = 0
+
+    optimize_animation_curves(tolerance, all_actions, processes)
 
 
 # Run the function
 if __name__ == "__main__":
-    optimize_animation_curves()
+    main()
@@ -1,11 +1,447 @@
-import bpy
+import hashlib
+import json
 import os
+import time
+
+import bpy
+import numpy as np
+
+DEFAULT_FORMATS = ("obj", "fbx", "stl", "ply")
+INDEX_NAME = "export_index.json"
+INDEX_VERSION = 2
+FBX_SETTINGS = {
+    "use_selection": True,
+    "use_mesh_modifiers": True,
+    "use_armature_deform_only": True,
+}
+# Anything that changes the written files; bump "writer" when a writer changes
+EXPORT_SETTINGS = {
+    "obj": {"writer": 1, "axes": "-Z,Y", "uvs": True, "normals": True},
+    "stl": {"writer": 1, "binary": True},
+    "ply": {"writer": 1, "binary": True, "uvs": True, "colors": True},
+    "fbx": FBX_SETTINGS,
+}
+STL_RECORD = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+)
+# Blender's OBJ exporter defaults: forward -Z, up Y
+OBJ_AXES = np.array([[1, 0, 0], [0, 0, 1], [0, -1, 0]], dtype=np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Writers: plain Python over NumPy buffers, no Blender types.
+# ---------------------------------------------------------------------------
+
+
+class ExportMesh:
+    """
+    Evaluated mesh of one object in world space. Per-corner arrays follow
+    the mesh loops; polygons are given by loop starts and sizes, and
+    triangles as loop indices.
+    """
+
+    def __init__(
+        self,
+        name,
+        positions,
+        loop_vertices,
+        loop_normals,
+        poly_starts,
+        poly_sizes,
+        triangles,
+        loop_uvs=None,
+        loop_colors=None,
+        poly_materials=None,
+        materials=(),
+    ):
+        self.name = name
+        self.positions = positions
+        self.loop_vertices = loop_vertices
+        self.loop_normals = loop_normals
+        self.poly_starts = poly_starts
+        self.poly_sizes = poly_sizes
+        self.triangles = triangles
+        self.loop_uvs = loop_uvs
+        self.loop_colors = loop_colors
+        self.poly_materials = poly_materials
+        self.materials = materials
+
+
+def write_stl(path, mesh):
+    """
+    Binary STL of the mesh's triangles with face normals.
+    """
+    corners = mesh.positions[mesh.loop_vertices[mesh.triangles]]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    records = np.zeros(len(corners), dtype=STL_RECORD)
+    records["normal"] = normals
+    records["vertices"] = corners
+    with open(path, "wb") as file:
+        file.write(f"Exported from Blender: {mesh.name}".encode()[:80].ljust(80))
+        file.write(np.uint32(len(records)).tobytes())
+        records.tofile(file)
+
+
+def unique_corners(*columns):
+    """
+    Distinct combinations of per-corner values, and the index of each
+    corner's combination.
+    """
+    keys = np.column_stack([np.asarray(column, dtype=np.float64) for column in columns])
+    # Adding 0.0 turns -0.0 into 0.0, so rows compare equal byte for byte
+    keys = np.ascontiguousarray(keys + 0.0)
+    rows = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1])))
+    _, first, inverse = np.unique(rows.ravel(), return_index=True, return_inverse=True)
+    return keys[first], inverse.reshape(-1)
+
+
+def format_rows(template, rows):
+    """
+    Formats every row of a 2D array with one %-template in a single call.
+    """
+    return (template * len(rows)) % tuple(np.asarray(rows).ravel().tolist())
+
+
+def write_ply(path, mesh):
+    """
+    Binary PLY with a vertex per distinct position, normal, UV and colour
+    combination, and the mesh's polygons as faces.
+    """
+    columns = [mesh.loop_vertices[:, None], mesh.loop_normals]
+    properties = ["float x", "float y", "float z", "float nx", "float ny", "float nz"]
+    fields = [("position", "<f4", (3,)), ("normal", "<f4", (3,))]
+    if mesh.loop_uvs is not None:
+        columns.append(mesh.loop_uvs)
+        properties += ["float s", "float t"]
+        fields.append(("uv", "<f4", (2,)))
+    if mesh.loop_colors is not None:
+        columns.append(mesh.loop_colors)
+        properties += ["uchar red", "uchar green", "uchar blue", "uchar alpha"]
+        fields.append(("color", "u1", (4,)))
+    unique, corner_vertex = unique_corners(*columns)
+
+    vertices = np.zeros(len(unique), dtype=np.dtype(fields))
+    vertices["position"] = mesh.positions[unique[:, 0].astype(np.int64)]
+    vertices["normal"] = unique[:, 1:4]
+    if mesh.loop_uvs is not None:
+        vertices["uv"] = unique[:, 4:6]
+    if mesh.loop_colors is not None:
+        vertices["color"] = np.clip(unique[:, -4:] * 255 + 0.5, 0, 255)
+
+    # Each face is a count byte followed by its uint32 vertex indices
+    sizes = mesh.poly_sizes
+    face_offsets = mesh.poly_starts * 4 + np.arange(len(sizes))
+    faces = np.empty(len(sizes) + 4 * len(corner_vertex), dtype=np.uint8)
+    faces[face_offsets] = sizes
+    corner_offsets = np.repeat(face_offsets - mesh.poly_starts * 4 + 1, sizes)
+    corner_offsets += np.arange(len(corner_vertex)) * 4
+    faces[corner_offsets[:, None] + np.arange(4)] = (
+        corner_vertex.astype("<u4").view(np.uint8).reshape(-1, 4)
+    )
+
+    header = [
+        "ply",
+        "format binary_little_endian 1.0",
+        f"comment Exported from Blender: {mesh.name}",
+        f"element vertex {len(vertices)}",
+        *(f"property {prop}" for prop in properties),
+        f"element face {len(sizes)}",
+        "property list uchar uint vertex_indices",
+        "end_header",
+    ]
+    with open(path, "wb") as file:
+        file.write(("\n".join(header) + "\n").encode("ascii"))
+        vertices.tofile(file)
+        faces.tofile(file)
+
+
+def write_obj(path, mesh):
+    """
+    OBJ (Y up) with UVs, normals and a companion .mtl for the materials.
+    """
+    positions = mesh.positions @ OBJ_AXES.T
+    normals, normal_index = unique_corners(np.round(mesh.loop_normals @ OBJ_AXES.T, 4))
+    lines = [f"# Exported from Blender: {mesh.name}\n"]
+
+    material_names = [name for name, _ in mesh.materials]
+    if any(material_names):
+        mtl_path = os.path.splitext(path)[0] + ".mtl"
+        lines.append(f"mtllib {os.path.basename(mtl_path)}\n")
+        with open(mtl_path, "w", encoding="utf-8") as file:
+            for name, color in mesh.materials:
+                if name:
+                    file.write(f"newmtl {name}\n")
+                    file.write("Kd %.6f %.6f %.6f\n\n" % tuple(color[:3]))
+
+    lines.append(f"o {mesh.name}\n")
+    lines.append(format_rows("v %.6f %.6f %.6f\n", positions))
+
+    corner_columns = [mesh.loop_vertices + 1]
+    if mesh.loop_uvs is not None:
+        uvs, uv_index = unique_corners(np.round(mesh.loop_uvs, 6))
+        lines.append(format_rows("vt %.6f %.6f\n", uvs))
+        corner_columns.append(uv_index + 1)
+        corner = " %d/%d/%d"
+    else:
+        corner = " %d//%d"
+    corner_columns.append(normal_index + 1)
+    corners = np.column_stack(corner_columns)
+    lines.append(format_rows("vn %.4f %.4f %.4f\n", normals))
+
+    # Faces are written in runs of equal size and material, one format call
+    # per run
+    sizes = mesh.poly_sizes
+    materials = mesh.poly_materials
+    if materials is None or not material_names:
+        materials = np.zeros(len(sizes), dtype=np.int32)
+    materials = np.minimum(materials, max(len(material_names) - 1, 0))
+    changes = np.flatnonzero((np.diff(sizes) != 0) | (np.diff(materials) != 0)) + 1
+    run_starts = np.concatenate(([0], changes)) if len(sizes) else changes
+    run_ends = np.concatenate((changes, [len(sizes)])) if len(sizes) else changes
+
+    current = None
+    for begin, end in zip(run_starts.tolist(), run_ends.tolist()):
+        if material_names and material_names[materials[begin]] != current:
+            current = material_names[materials[begin]]
+            lines.append(f"usemtl {current}\n" if current else "usemtl None\n")
+        first = mesh.poly_starts[begin]
+        last = mesh.poly_starts[end - 1] + sizes[end - 1]
+        template = "f" + corner * int(sizes[begin]) + "\n"
+        lines.append(
+            format_rows(template, corners[first:last].reshape(end - begin, -1))
+        )
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("".join(lines))
+
+
+MESH_WRITERS = {"obj": write_obj, "stl": write_stl, "ply": write_ply}
+
+
+def timed_write(writer, path, mesh):
+    start = time.perf_counter()
+    writer(path, mesh)
+    return time.perf_counter() - start
+
+
+def mesh_digest(mesh):
+    """
+    Hash of everything the writers read from an ExportMesh: world space
+    geometry (so transforms are included), attributes and materials.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (
+        mesh.positions,
+        mesh.loop_vertices,
+        mesh.loop_normals,
+        mesh.poly_starts,
+        mesh.poly_sizes,
+        mesh.triangles,
+        mesh.loop_uvs,
+        mesh.loop_colors,
+        mesh.poly_materials,
+    ):
+        digest.update(b"-" if array is None else np.ascontiguousarray(array).tobytes())
+    digest.update(repr(mesh.materials).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def export_digest(mesh_hash, fmt):
+    settings = json.dumps(EXPORT_SETTINGS[fmt], sort_keys=True)
+    return hashlib.blake2b(
+        f"{mesh_hash}:{fmt}:{settings}".encode("utf-8"), digest_size=16
+    ).hexdigest()
 
 
-def batch_export_manager():
+class ExportIndex:
+    """
+    JSON index kept in the export directory. For every object and format it
+    records the digest the file was written from, its path and how long it
+    took, so unchanged files can be skipped and the time saved reported.
+
+    Several .blend files can share an export directory, so entries are kept
+    per source file and only the source's own entries are read, pruned and
+    replaced.
+    """
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.sources = {}
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") == INDEX_VERSION:
+            self.sources = data.get("sources", {})
+        self.objects = self.sources.setdefault(source, {})
+
+    def is_current(self, name, fmt, digest, path):
+        entry = self.objects.get(name, {}).get(fmt)
+        return bool(
+            entry
+            and entry["digest"] == digest
+            and entry["path"] == path
+            and os.path.isfile(path)
+        )
+
+    def seconds(self, name, fmt):
+        return self.objects.get(name, {}).get(fmt, {}).get("seconds", 0.0)
+
+    def record(self, name, fmt, digest, path, seconds):
+        self.objects.setdefault(name, {})[fmt] = {
+            "digest": digest,
+            "path": path,
+            "seconds": seconds,
+        }
+
+    def forget(self, name, fmt):
+        self.objects.get(name, {}).pop(fmt, None)
+
+    def prune(self, existing_names):
+        """
+        Deletes the files of objects that no longer exist and returns the
+        names of those objects.
+        """
+        removed = [name for name in self.objects if name not in existing_names]
+        # Files another source exported since are not ours to delete
+        shared = {
+            entry["path"]
+            for source, objects in self.sources.items()
+            if source != self.source
+            for formats in objects.values()
+            for entry in formats.values()
+        }
+        for name in removed:
+            for entry in self.objects.pop(name).values():
+                if entry["path"] in shared:
+                    continue
+                for path in (
+                    entry["path"],
+                    os.path.splitext(entry["path"])[0] + ".mtl",
+                ):
+                    if os.path.isfile(path):
+                        os.remove(path)
+        return removed
+
+    def save(self):
+        data = {"version": INDEX_VERSION, "sources": self.sources}
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Blender side: evaluate each object once, FBX through its operator.
+# ---------------------------------------------------------------------------
+
+
+def export_mesh(obj, depsgraph):
+    """
+    Reads an object's evaluated mesh into an ExportMesh in world space.
+    """
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        if hasattr(mesh, "calc_normals_split"):
+            mesh.calc_normals_split()
+
+        def read(collection, attribute, count, dtype, width=1):
+            values = np.empty(count * width, dtype=dtype)
+            collection.foreach_get(attribute, values)
+            return values.reshape(-1, width) if width > 1 else values
+
+        loop_count = len(mesh.loops)
+        positions = read(mesh.vertices, "co", len(mesh.vertices), np.float32, 3)
+        loop_vertices = read(mesh.loops, "vertex_index", loop_count, np.int32)
+        if hasattr(mesh, "corner_normals"):
+            normals = read(mesh.corner_normals, "vector", loop_count, np.float32, 3)
+        else:
+            normals = read(mesh.loops, "normal", loop_count, np.float32, 3)
+
+        polygon_count = len(mesh.polygons)
+        poly_starts = read(mesh.polygons, "loop_start", polygon_count, np.int32)
+        poly_sizes = read(mesh.polygons, "loop_total", polygon_count, np.int32)
+        poly_materials = read(mesh.polygons, "material_index", polygon_count, np.int32)
+        triangles = read(
+            mesh.loop_triangles, "loops", len(mesh.loop_triangles), np.int32, 3
+        )
+
+        uvs = None
+        if mesh.uv_layers.active:
+            uvs = read(mesh.uv_layers.active.data, "uv", loop_count, np.float32, 2)
+
+        colors = None
+        color_attribute = mesh.color_attributes.active_color
+        if color_attribute:
+            colors = read(
+                color_attribute.data, "color", len(color_attribute.data), np.float32, 4
+            )
+            if color_attribute.domain == "POINT":
+                colors = colors[loop_vertices]
+    finally:
+        evaluated.to_mesh_clear()
+
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    normal_matrix = np.linalg.inv(matrix[:3, :3]).T
+    normals = normals @ normal_matrix.T
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    materials = [
+        (
+            (slot.material.name, tuple(slot.material.diffuse_color))
+            if slot.material
+            else (None, (0.8, 0.8, 0.8, 1.0))
+        )
+        for slot in obj.material_slots
+    ]
+    return ExportMesh(
+        obj.name,
+        positions @ matrix[:3, :3].T + matrix[:3, 3],
+        loop_vertices,
+        normals,
+        poly_starts,
+        poly_sizes,
+        triangles,
+        uvs,
+        colors,
+        poly_materials,
+        materials,
+    )
+
+
+def export_fbx(obj, path):
+    # Deselect all and select only current object
+    bpy.ops.object.select_all(action="DESELECT")
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+
+    bpy.ops.export_scene.fbx(filepath=path, **FBX_SETTINGS)
+
+
+def batch_export_manager(formats=DEFAULT_FORMATS, incremental=True):
     """
     Exports selected objects to multiple formats (OBJ, FBX, STL, PLY).
     Creates organized output directory structure.
+
+    Each object's modifier stack is evaluated once and shared by the OBJ,
+    STL and PLY writers. The writers run one after another: the OBJ writer
+    is string formatting that holds the GIL, so a thread pool only added
+    overhead. With incremental export, files whose object data and
+    export settings are unchanged since the last run are skipped, and
+    files of deleted objects are removed.
+
+    Parameters:
+    - formats: Formats to export (default: obj, fbx, stl, ply)
+    - incremental: Skip unchanged objects using the export index (default: True)
     """
     # Get selected objects
     selected_objects = [
@@ -16,6 +452,9 @@ def batch_export_manager():
         print("No mesh objects selected for export")
         return
 
+    formats = [fmt for fmt in DEFAULT_FORMATS if fmt in formats]
+    start = time.perf_counter()
+
     # Get export directory
     blend_filepath = bpy.data.filepath
     if blend_filepath:
@@ -24,71 +463,84 @@ def batch_export_manager():
         export_dir = os.path.join(os.path.expanduser("~"), "Desktop", "blender_exports")
 
     # Create export directories
-    formats = ["obj", "fbx", "stl", "ply"]
     for fmt in formats:
         fmt_dir = os.path.join(export_dir, fmt)
         os.makedirs(fmt_dir, exist_ok=True)
 
+    index = ExportIndex(os.path.join(export_dir, INDEX_NAME), blend_filepath)
     exported_files = []
+    failed_files = []
+    exported_objects = set()
+    skipped_files = 0
+    time_saved = 0.0
+    active = bpy.context.view_layer.objects.active
+    depsgraph = bpy.context.evaluated_depsgraph_get()
 
     for obj in selected_objects:
         # Clean object name for filename
         obj_name = obj.name.replace(" ", "_").replace(".", "_")
 
-        # Deselect all and select only current object
-        bpy.ops.object.select_all(action="DESELECT")
-        obj.select_set(True)
-        bpy.context.view_layer.objects.active = obj
-
-        # Export OBJ
-        obj_path = os.path.join(export_dir, "obj", f"{obj_name}.obj")
-        bpy.ops.export_scene.obj(
-            filepath=obj_path,
-            use_selection=True,
-            use_materials=True,
-            use_uvs=True,
-            use_normals=True,
-        )
-        exported_files.append(obj_path)
-
-        # Export FBX
-        fbx_path = os.path.join(export_dir, "fbx", f"{obj_name}.fbx")
-        bpy.ops.export_scene.fbx(
-            filepath=fbx_path,
-            use_selection=True,
-            use_mesh_modifiers=True,
-            use_armature_deform_only=True,
-        )
-        exported_files.append(fbx_path)
+        # Evaluated once, shared by the digest and every mesh writer
+        mesh = export_mesh(obj, depsgraph)
+        mesh_hash = mesh_digest(mesh)
 
-        # Export STL
-        stl_path = os.path.join(export_dir, "stl", f"{obj_name}.stl")
-        bpy.ops.export_mesh.stl(
-            filepath=stl_path, use_selection=True, use_mesh_modifiers=True
-        )
-        exported_files.append(stl_path)
-
-        # Export PLY
-        ply_path = os.path.join(export_dir, "ply", f"{obj_name}.ply")
-        bpy.ops.export_mesh.ply(
-            filepath=ply_path,
-            use_selection=True,
-            use_mesh_modifiers=True,
-            use_normals=True,
-            use_uv_coords=True,
-            use_colors=True,
-        )
-        exported_files.append(ply_path)
+        written = []
+        for fmt in formats:
+            path = os.path.join(export_dir, fmt, f"{obj_name}.{fmt}")
+            digest = export_digest(mesh_hash, fmt)
+            if incremental and index.is_current(obj.name, fmt, digest, path):
+                skipped_files += 1
+                time_saved += index.seconds(obj.name, fmt)
+                continue
+            written.append(fmt)
 
-        print(f"Exported {obj.name} to 4 formats")
+            try:
+                if fmt in MESH_WRITERS:
+                    seconds = timed_write(MESH_WRITERS[fmt], path, mesh)
+                else:
+                    fbx_start = time.perf_counter()
+                    export_fbx(obj, path)
+                    seconds = time.perf_counter() - fbx_start
+                index.record(obj.name, fmt, digest, path, seconds)
+                exported_files.append(path)
+            except Exception as e:
+                print(f"Error exporting {path}: {str(e)}")
+                index.forget(obj.name, fmt)
+                failed_files.append(path)
+
+        if written:
+            exported_objects.add(obj.name)
+            print(f"Exported {obj.name} to {', '.join(written)}")
+        else:
+            print(f"Skipped {obj.name} (unchanged)")
+
+    # Files of objects deleted from the file since the last export; unsaved
+    # files all share the "" source, so none of them may prune it
+    removed_objects = []
+    if blend_filepath:
+        removed_objects = index.prune({obj.name for obj in bpy.data.objects})
+    try:
+        index.save()
+    except OSError as e:
+        print(f"Could not save export index: {str(e)}")
 
     # Restore original selection
-    bpy.ops.object.select_all(action="DESELECT")
-    for obj in selected_objects:
-        obj.select_set(True)
+    if "fbx" in formats:
+        bpy.ops.object.select_all(action="DESELECT")
+        for obj in selected_objects:
+            obj.select_set(True)
+        bpy.context.view_layer.objects.active = active
 
-    print(f"\nBatch export completed!")
-    print(f"Exported {len(selected_objects)} objects to {len(exported_files)} files")
+    print(f"\nBatch export completed in {time.perf_counter() - start:.2f}s!")
+    print(f"Exported {len(exported_objects)} objects to {len(exported_files)} files")
+    print(
+        f"Skipped {len(selected_objects) - len(exported_objects)} unchanged objects "
+        f"({skipped_files} files, about {time_saved:.2f}s saved)"
+    )
+    if removed_objects:
+        print(f"Removed files of {len(removed_objects)} deleted objects")
+    if failed_files:
+        print(f"Failed to write {len(failed_files)} files")
     print(f"Export directory: {export_dir}")
 
     # Open export directory in file explorer (Windows)
@@ -96,6 +548,18 @@ def batch_export_manager():
         os.startfile(export_dir)
 
 
+def main():
+    """
+    Main function to execute the export manager script.
+    This function will be called when the script is executed from the UI.
+    """
+    # Default parameters - these will be overridden by the UI
+    formats = "obj,fbx,stl,ply"
+    incremental = True
+
+    batch_export_manager(formats.split(","), incremental)
+
+
 # Run the function
 if __name__ == "__main__":
-    batch_export_manager()
+    main()
@@ -1,10 +1,421 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import bpy
-import bmesh
-from mathutils import Vector
+import numpy as np
+
+AREA = "area"
+BILINEAR = "bilinear"
+AUTO = "auto"
+DEFAULT_MAX_IMAGE_MB = 512
+MANIFEST_NAME = "image_resizer_manifest.json"
+MANIFEST_VERSION = 2
+CACHE_DIR_NAME = "image_resizer_cache"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# ---------------------------------------------------------------------------
+# Resampling core: pure NumPy, no bpy. Pixel arrays are float32 with shape
+# (height, width, channels), rows bottom to top as in Blender's image.pixels.
+# ---------------------------------------------------------------------------
+
+
+def fit_size(width, height, target_width, target_height, maintain_aspect_ratio):
+    """
+    Return the output size for an image of width x height.
+    With maintain_aspect_ratio the result fits inside the target box.
+    """
+    if not maintain_aspect_ratio or width <= 0 or height <= 0:
+        return target_width, target_height
+
+    aspect_ratio = width / height
+    if aspect_ratio > 1:  # Landscape
+        new_width, new_height = target_width, int(target_width / aspect_ratio)
+        if new_height > target_height:
+            new_width, new_height = int(target_height * aspect_ratio), target_height
+    else:  # Portrait or square
+        new_width, new_height = int(target_height * aspect_ratio), target_height
+        if new_width > target_width:
+            new_width, new_height = target_width, int(target_width / aspect_ratio)
+
+    return max(new_width, 1), max(new_height, 1)
+
+
+def _axis_method(method, source, target):
+    if method == AUTO:
+        return AREA if target < source else BILINEAR
+    return method
+
+
+def _sample_coords(method, source, target):
+    """
+    Source coordinates for one axis: box edges (target + 1 values) for area
+    averaging, sample centres (target values) for bilinear.
+    """
+    scale = source / target
+    if method == AREA:
+        return np.arange(target + 1, dtype=np.float64) * scale
+    positions = (np.arange(target, dtype=np.float64) + 0.5) * scale - 0.5
+    return np.clip(positions, 0.0, source - 1)
+
+
+def _source_span(method, coords, source):
+    """Range of source indices [lo, hi) read by the given coordinates."""
+    if method == AREA:
+        lo = int(np.floor(coords[0]))
+        hi = int(np.ceil(coords[-1]))
+    else:
+        lo = int(np.floor(coords[0]))
+        hi = int(np.floor(coords[-1])) + 2
+    return max(lo, 0), min(max(hi, lo + 1), source)
+
+
+def _broadcast(values, axis, ndim):
+    shape = [1] * ndim
+    shape[axis] = len(values)
+    return values.reshape(shape)
+
+
+def _integer_area_axis(pixels, factor, axis):
+    """Box filter for a whole-number factor: a sum of strided slices."""
+    index = [slice(None)] * pixels.ndim
+    index[axis] = slice(0, None, factor)
+    total = pixels[tuple(index)].astype(np.float32, copy=True)
+    for offset in range(1, factor):
+        index[axis] = slice(offset, None, factor)
+        total += pixels[tuple(index)]
+    total *= 1.0 / factor
+    return total
+
+
+def _area_axis(pixels, edges, axis):
+    """
+    Exact box filter along one axis. Each output box [start, end) overlaps
+    at most `taps` source pixels, so the result is accumulated from that many
+    gathers, each weighted by its pixel's overlap with the box.
+    """
+    source = pixels.shape[axis]
+    count = len(edges) - 1
+    step = edges[1] - edges[0]
+    if edges[0] == 0 and float(step).is_integer() and count * step == source:
+        return _integer_area_axis(pixels, int(step), axis)
+
+    starts, ends = edges[:-1], edges[1:]
+    first = np.floor(starts).astype(np.intp)
+    taps = int((np.ceil(ends).astype(np.intp) - first).max())
+    scale = _broadcast(1.0 / (ends - starts), axis, pixels.ndim)
+
+    total = None
+    for tap in range(taps):
+        index = first + tap
+        overlap = np.minimum(index + 1, ends) - np.maximum(index, starts)
+        weight = _broadcast(np.maximum(overlap, 0.0), axis, pixels.ndim) * scale
+        gathered = np.take(pixels, np.minimum(index, source - 1), axis=axis)
+        gathered *= weight.astype(np.float32)
+        if total is None:
+            total = gathered
+        else:
+            total += gathered
+    return total
+
+
+def _bilinear_axis(pixels, positions, axis):
+    source = pixels.shape[axis]
+    lower = positions.astype(np.intp)
+    upper = np.minimum(lower + 1, source - 1)
+    weight = _broadcast((positions - lower).astype(np.float32), axis, pixels.ndim)
+    start = np.take(pixels, lower, axis=axis)
+    return start + weight * (np.take(pixels, upper, axis=axis) - start)
+
+
+def _resample_axis(pixels, method, coords, axis):
+    if method == AREA:
+        return _area_axis(pixels, coords, axis)
+    return _bilinear_axis(pixels, coords, axis)
+
+
+def resample(pixels, width, height, method=AUTO, max_bytes=None, out=None):
+    """
+    Resample a (height, width, channels) float32 array to the given size.
+
+    method is "area", "bilinear" or "auto" (area averaging on axes that
+    shrink, bilinear on axes that grow). Rows are processed in bands so that
+    temporary buffers stay within max_bytes; out may be a preallocated
+    (height, width, channels) float32 array.
+    """
+    source_height, source_width, channels = pixels.shape
+    if out is None:
+        out = np.empty((height, width, channels), dtype=np.float32)
+
+    x_method = _axis_method(method, source_width, width)
+    y_method = _axis_method(method, source_height, height)
+    x_coords = _sample_coords(x_method, source_width, width)
+    y_coords = _sample_coords(y_method, source_height, height)
+
+    # Shrink rows first when the height is reduced, so the second pass runs
+    # on fewer rows; each output row of a band then holds a few rows of
+    # temporaries at the wider of the two widths.
+    rows_first = height < source_height
+    row_bytes = max(width, source_width if rows_first else width) * channels * 4 * 6
+    source_rows_per_row = 1.0 if rows_first else max(source_height / height, 1.0)
+    band = height
+    if max_bytes is not None:
+        band = int(max_bytes / (row_bytes * (source_rows_per_row + 2)))
+        band = min(max(band, 1), height)
+
+    for top in range(0, height, band):
+        bottom = min(top + band, height)
+        band_coords = y_coords[top : bottom + 1 if y_method == AREA else bottom]
+        lo, hi = _source_span(y_method, band_coords, source_height)
+        strip = pixels[lo:hi]
+        if rows_first:
+            strip = _resample_axis(strip, y_method, band_coords - lo, axis=0)
+            out[top:bottom] = _resample_axis(strip, x_method, x_coords, axis=1)
+        else:
+            strip = _resample_axis(strip, x_method, x_coords, axis=1)
+            out[top:bottom] = _resample_axis(strip, y_method, band_coords - lo, axis=0)
+
+    return out
+
+
+def working_bytes(width, height, channels, new_width, new_height):
+    """
+    Memory held for one image by its source and output arrays. Whatever is
+    left under the cap is the budget for resample's banded temporaries.
+    """
+    return 4 * channels * (width * height + new_width * new_height)
+
+
+# ---------------------------------------------------------------------------
+# Manifest: plain Python record of source hashes and cached resize results.
+# ---------------------------------------------------------------------------
+
+
+class ResizeManifest:
+    """
+    JSON manifest kept next to the .blend file. It records the content hash
+    of each source file (reused while the file's size and mtime are
+    unchanged) and, per content hash, output size, method and colour
+    settings, an image file in the cache directory holding the resized
+    result.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR_NAME)
+        self.files = {}
+        self.results = {}
+        self.files_hashed = 0
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.files = data.get("files", {})
+            self.results = data.get("results", {})
+
+    @staticmethod
+    def data_hash(data):
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def file_hash(self, filepath):
+        stat = os.stat(filepath)
+        entry = self.files.get(filepath)
+        if entry and entry["bytes"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["hash"]
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filepath, "rb") as file:
+            while chunk := file.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        self.files_hashed += 1
+        self.files[filepath] = {
+            "bytes": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": digest.hexdigest(),
+        }
+        return digest.hexdigest()
+
+    @staticmethod
+    def result_key(content_hash, width, height, method, colorspace, alpha_mode):
+        """
+        The colour space and alpha mode change the pixels Blender reads from
+        the same file, so results read under other settings are not reused.
+        """
+        return f"{content_hash}:{width}x{height}:{method}:{colorspace}:{alpha_mode}"
+
+    def cached_result(self, key):
+        """Path of the cached result for key, or None if it is missing."""
+        entry = self.results.get(key)
+        if not entry:
+            return None
+        path = os.path.join(self.cache_dir, entry["file"])
+        return path if os.path.isfile(path) else None
+
+    def result_path(self, key, extension):
+        # Colour space names are free text, so the file is named by key hash
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return os.path.join(
+            self.cache_dir, f"{self.data_hash(key.encode())}.{extension}"
+        )
+
+    def record_result(self, key, path):
+        self.results[key] = {"file": os.path.basename(path)}
+
+    def save(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": self.files,
+            "results": self.results,
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Blender side: pixel transfer and batch scheduling on the main thread.
+# ---------------------------------------------------------------------------
+
+
+def read_pixels(image):
+    """
+    Copy image.pixels into a new (height, width, channels) float32 array.
+    """
+    width, height = image.size
+    channels = image.channels
+    pixels = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, channels)
+
+
+def match_channels(pixels, channels):
+    """
+    Convert a (height, width, n) pixel array to the given channel count:
+    grey is spread to RGB, missing alpha is opaque and extra alpha dropped.
+    """
+    height, width, count = pixels.shape
+    if count == channels:
+        return pixels
+    if count < 3 <= channels:  # Grey, or grey and alpha
+        pixels = pixels[:, :, [0, 0, 0] + list(range(1, count))]
+    elif channels < 3 <= count:  # To grey (and alpha) from the red channel
+        pixels = pixels[:, :, [0] + list(range(3, count))]
+    count = pixels.shape[2]
+    if count < channels:
+        alpha = np.ones((height, width, channels - count), dtype=np.float32)
+        pixels = np.concatenate((pixels, alpha), axis=2)
+    return pixels[:, :, :channels]
+
+
+def write_pixels(image, pixels):
+    """
+    Resize image in place and fill it with pixels. The data-block keeps its
+    name, users, source, filepath, packing and colour settings; as with
+    image.scale() alone, the result is left unsaved.
+
+    Generated images are reallocated through their generated size. Other
+    images have no API to reallocate without resampling, so scale() runs
+    once on the main thread and its result is overwritten; see
+    benchmarks/bench_image_resize_blender.py for what that costs.
+    """
+    height, width = pixels.shape[:2]
+    if image.source == "GENERATED" and not image.packed_file:
+        image.generated_width = width
+        image.generated_height = height
+    else:
+        image.scale(width, height)
+    pixels = match_channels(pixels, image.channels)
+    image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+    image.update()
+    return image
+
+
+def manifest_path():
+    """
+    Manifest location: next to the saved .blend, or the temp directory.
+    """
+    directory = os.path.dirname(bpy.data.filepath) or tempfile.gettempdir()
+    return os.path.join(directory, MANIFEST_NAME)
+
+
+def source_hash(image, manifest):
+    """
+    Content hash of a packed or file-backed image, or None for generated ones.
+    """
+    if image.packed_file:
+        return manifest.data_hash(image.packed_file.data)
+    if image.source == "FILE":
+        path = os.path.normpath(bpy.path.abspath(image.filepath, library=image.library))
+        if os.path.isfile(path):
+            return manifest.file_hash(path)
+    return None
+
+
+def save_result(image, path):
+    """
+    Write image to path without changing its filepath or file format.
+    """
+    file_format = image.file_format
+    image.file_format = "OPEN_EXR" if image.is_float else "PNG"
+    try:
+        image.save(filepath=path)
+    finally:
+        image.file_format = file_format
+
+
+def load_result(path, colorspace):
+    """
+    Read a cached result into a pixel array and drop its data-block again.
+    """
+    cached = bpy.data.images.load(path, check_existing=False)
+    try:
+        cached.colorspace_settings.name = colorspace
+        return read_pixels(cached)
+    finally:
+        bpy.data.images.remove(cached)
+
+
+def can_share(image, duplicate):
+    """
+    True when duplicate, an image with the same result key, can be replaced
+    by image and removed: it holds the same kind of pixel buffer and is a
+    local data-block the user has not kept with a fake user.
+    """
+    return (
+        duplicate.library is None
+        and not duplicate.use_fake_user
+        and duplicate.channels == image.channels
+        and duplicate.is_float == image.is_float
+    )
+
+
+class ResizeJob:
+    def __init__(self, image, width, height, band_bytes, key=None):
+        self.image = image
+        self.name = image.name
+        self.source_size = (image.size[0], image.size[1])
+        self.width = width
+        self.height = height
+        self.band_bytes = band_bytes
+        self.key = key
+        self.duplicates = []
 
 
 def resize_all_images(
-    target_width=1024, target_height=1024, maintain_aspect_ratio=True
+    target_width=1024,
+    target_height=1024,
+    maintain_aspect_ratio=True,
+    method=AUTO,
+    workers=None,
+    max_image_mb=DEFAULT_MAX_IMAGE_MB,
+    use_manifest=True,
 ):
     """
     Resize all images in the current Blender scene to the specified resolution.
@@ -13,23 +424,34 @@ def resize_all_images(
     - target_width: Target width in pixels (default: 1024)
     - target_height: Target height in pixels (default: 1024)
     - maintain_aspect_ratio: Whether to maintain the original aspect ratio (default: True)
+    - method: "area", "bilinear" or "auto" resampling (default: "auto")
+    - workers: Resampling threads (default: one per CPU)
+    - max_image_mb: Memory cap per image; larger images are skipped (default: 512)
+    - use_manifest: Reuse cached results and share duplicates (default: True)
     """
 
     # Get all images in the scene
-    images = bpy.data.images
+    images = list(bpy.data.images)
 
     if not images:
         print("No images found in the scene.")
         return
 
-    resized_count = 0
+    max_bytes = max_image_mb * 1024 * 1024
+    workers = workers or os.cpu_count() or 1
+    manifest = ResizeManifest(manifest_path()) if use_manifest else None
     skipped_count = 0
 
     print(f"Starting image resize operation...")
     print(f"Target resolution: {target_width}x{target_height}")
     print(f"Maintain aspect ratio: {maintain_aspect_ratio}")
+    print(f"Resampling: {method}, {workers} threads, {max_image_mb} MB per image")
+    if manifest:
+        print(f"Manifest: {manifest.path}")
     print("-" * 50)
 
+    jobs = []
+    jobs_by_key = {}
     for image in images:
         # Skip render results and viewer nodes
         if image.type in ["RENDER_RESULT", "COMPOSITING"]:
@@ -37,61 +459,123 @@ def resize_all_images(
             skipped_count += 1
             continue
 
-        # Skip images that don't have pixel data
-        if not hasattr(image, "size") or len(image.size) < 2:
-            print(f"Skipping {image.name} (no size data)")
+        # Movies, sequences and UDIM tiles do not expose one pixel buffer
+        if image.source not in ["FILE", "GENERATED"]:
+            print(f"Skipping {image.name} (source: {image.source})")
             skipped_count += 1
             continue
 
+        # Skip images that don't have pixel data
         original_width, original_height = image.size[0], image.size[1]
+        if original_width == 0 or original_height == 0:
+            print(f"Skipping {image.name} (no pixel data)")
+            skipped_count += 1
+            continue
+
+        new_width, new_height = fit_size(
+            original_width,
+            original_height,
+            target_width,
+            target_height,
+            maintain_aspect_ratio,
+        )
 
         # Skip if image is already the target size
-        if original_width == target_width and original_height == target_height:
+        if (original_width, original_height) == (new_width, new_height):
             print(f"Skipping {image.name} (already target size)")
             skipped_count += 1
             continue
 
-        new_width = target_width
-        new_height = target_height
+        needed = working_bytes(
+            original_width, original_height, image.channels, new_width, new_height
+        )
+        if needed > max_bytes:
+            print(
+                f"Skipping {image.name} (needs {needed // 2**20} MB, "
+                f"cap {max_image_mb} MB)"
+            )
+            skipped_count += 1
+            continue
+
+        key = None
+        if manifest:
+            content_hash = source_hash(image, manifest)
+            if content_hash:
+                key = manifest.result_key(
+                    content_hash,
+                    new_width,
+                    new_height,
+                    method,
+                    image.colorspace_settings.name,
+                    image.alpha_mode,
+                )
 
-        # Calculate new dimensions while maintaining aspect ratio
-        if maintain_aspect_ratio and original_width > 0 and original_height > 0:
-            aspect_ratio = original_width / original_height
+        # Identical sources are resized once and share the result
+        if key in jobs_by_key and can_share(jobs_by_key[key].image, image):
+            jobs_by_key[key].duplicates.append(image)
+            continue
 
-            if aspect_ratio > 1:  # Landscape
-                new_height = int(target_width / aspect_ratio)
-                if new_height > target_height:
-                    new_height = target_height
-                    new_width = int(target_height * aspect_ratio)
-            else:  # Portrait or square
-                new_width = int(target_height * aspect_ratio)
-                if new_width > target_width:
-                    new_width = target_width
-                    new_height = int(target_width / aspect_ratio)
+        job = ResizeJob(image, new_width, new_height, max_bytes - needed, key)
+        jobs.append(job)
+        if key and key not in jobs_by_key:
+            jobs_by_key[key] = job
 
+    # Results cached by an earlier run are loaded instead of resampled
+    resized = {}
+    resample_jobs = []
+    for job in jobs:
+        cached_path = manifest.cached_result(job.key) if manifest else None
+        if not cached_path:
+            resample_jobs.append(job)
+            continue
         try:
-            # Resize the image
-            print(
-                f"Resizing {image.name}: {original_width}x{original_height} -> {new_width}x{new_height}"
-            )
+            pixels = load_result(cached_path, job.image.colorspace_settings.name)
+            resized[job] = write_pixels(job.image, pixels)
+            print(f"Reused cached result for {job.name}")
+        except Exception as e:
+            print(f"Error loading cached result for {job.name}: {str(e)}")
+            resample_jobs.append(job)
+    cached_count = len(resized)
 
-            # Scale the image
-            image.scale(new_width, new_height)
+    resampled = _run_jobs(resample_jobs, method, workers)
+    if manifest:
+        for job, image in resampled.items():
+            if not job.key:
+                continue
+            try:
+                path = manifest.result_path(job.key, "exr" if image.is_float else "png")
+                save_result(image, path)
+                manifest.record_result(job.key, path)
+            except Exception as e:
+                print(f"Could not cache result for {job.name}: {str(e)}")
+    resized.update(resampled)
 
-            # Mark the image as dirty to ensure it gets updated
-            image.update()
+    shared_count = 0
+    for job, image in resized.items():
+        for duplicate in job.duplicates:
+            print(f"Sharing {job.name} with duplicate {duplicate.name}")
+            duplicate.user_remap(image)
+            bpy.data.images.remove(duplicate)
+            shared_count += 1
 
-            resized_count += 1
+    if manifest:
+        try:
+            manifest.save()
+        except OSError as e:
+            print(f"Could not save manifest: {str(e)}")
 
-        except Exception as e:
-            print(f"Error resizing {image.name}: {str(e)}")
-            skipped_count += 1
+    resized_count = len(resized)
+    skipped_count += len(jobs) - resized_count
 
     print("-" * 50)
     print(f"Resize operation completed!")
     print(f"Images resized: {resized_count}")
+    print(f"  from cache: {cached_count}")
+    print(f"Duplicates shared: {shared_count}")
     print(f"Images skipped: {skipped_count}")
-    print(f"Total images processed: {resized_count + skipped_count}")
+    print(f"Total images processed: {resized_count + shared_count + skipped_count}")
+    if manifest:
+        print(f"Source files hashed: {manifest.files_hashed}")
 
     # Update the viewport to reflect changes
     for area in bpy.context.screen.areas:
@@ -99,6 +583,60 @@ def resize_all_images(
             area.tag_redraw()
 
 
+def _run_jobs(jobs, method, workers):
+    """
+    Read pixels and write results on the main thread while a thread pool
+    resamples. At most `workers` images are in flight, which bounds memory to
+    workers times the per-image cap. Returns {job: resized image}.
+    """
+    window_manager = bpy.context.window_manager
+    window_manager.progress_begin(0, max(len(jobs), 1))
+    start = time.perf_counter()
+    resized = {}
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        queue = iter(jobs)
+
+        def submit_next():
+            for job in queue:
+                try:
+                    pixels = read_pixels(job.image)
+                except Exception as e:
+                    print(f"Error reading {job.name}: {str(e)}")
+                    continue
+                future = pool.submit(
+                    resample, pixels, job.width, job.height, method, job.band_bytes
+                )
+                pending[future] = job
+                return
+
+        for _ in range(workers):
+            submit_next()
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = pending.pop(future)
+                done += 1
+                try:
+                    resized[job] = write_pixels(job.image, future.result())
+                    width, height = job.source_size
+                    print(
+                        f"[{done}/{len(jobs)}] Resized {job.name}: "
+                        f"{width}x{height} -> {job.width}x{job.height}"
+                    )
+                except Exception as e:
+                    print(f"Error resizing {job.name}: {str(e)}")
+                window_manager.progress_update(done)
+                submit_next()
+
+    window_manager.progress_end()
+    print(f"Resampled {len(resized)} images in {time.perf_counter() - start:.2f}s")
+    return resized
+
+
 def main():
     """
     Main function to execute the image resizing script.
@@ -108,8 +646,11 @@ def main():
     target_width = 1024
     target_height = 1024
     maintain_aspect_ratio = True
+    use_manifest = True
 
-    resize_all_images(target_width, target_height, maintain_aspect_ratio)
+    resize_all_images(
+        target_width, target_height, maintain_aspect_ratio, use_manifest=use_manifest
+    )
 
 
 if __name__ == "__main__":
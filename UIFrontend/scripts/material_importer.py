@@ -1,98 +1,609 @@
-import bpy
+import hashlib
+import json
 import os
+import tempfile
+import time
+from collections import deque
+
+import bpy
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11 (Blender < 4.1)
+    tomllib = None
+
+# Material custom properties holding the signature it was built from and a
+# hash of the input values it was built with, to notice later hand edits
+SIGNATURE_PROPERTY = "material_importer_signature"
+STATE_PROPERTY = "material_importer_state"
+TEMPLATE_NAME = "Material_Importer_Template"
+# Material custom property naming the library file and entry it came from
+SOURCE_PROPERTY = "material_importer_source"
+INDEX_NAME = "material_library_index.json"
+INDEX_VERSION = 1
+# Material previews rendered per timer tick, and the seconds between ticks
+PREVIEWS_PER_TICK = 4
+PREVIEW_INTERVAL = 0.1
+# Definition keys and the Principled BSDF inputs they set; the first name
+# the running Blender has wins (inputs were renamed in 4.0)
+PRINCIPLED_INPUTS = {
+    "base_color": ("Base Color",),
+    "metallic": ("Metallic",),
+    "roughness": ("Roughness",),
+    "specular": ("Specular IOR Level", "Specular"),
+    "ior": ("IOR",),
+    "transmission": ("Transmission Weight", "Transmission"),
+    "alpha": ("Alpha",),
+    "emission_color": ("Emission Color", "Emission"),
+    "emission_strength": ("Emission Strength",),
+}
+COLOR_KEYS = ("base_color", "emission_color")
+
+# Used when no library file is given
+DEFAULT_LIBRARY = [
+    {
+        "name": "Metal_Steel",
+        "base_color": (0.7, 0.7, 0.8, 1.0),
+        "metallic": 1.0,
+        "roughness": 0.2,
+    },
+    {
+        "name": "Wood_Oak",
+        "base_color": (0.6, 0.4, 0.2, 1.0),
+        "metallic": 0.0,
+        "roughness": 0.8,
+    },
+    {
+        "name": "Plastic_Red",
+        "base_color": (0.8, 0.1, 0.1, 1.0),
+        "metallic": 0.0,
+        "roughness": 0.4,
+    },
+    {
+        "name": "Glass_Clear",
+        "base_color": (1.0, 1.0, 1.0, 0.1),
+        "metallic": 0.0,
+        "roughness": 0.0,
+        "transmission": 1.0,
+    },
+    {
+        "name": "Concrete_Gray",
+        "base_color": (0.5, 0.5, 0.5, 1.0),
+        "metallic": 0.0,
+        "roughness": 0.9,
+    },
+]
+
+
+# ---------------------------------------------------------------------------
+# Library definitions: plain Python, no Blender types.
+# ---------------------------------------------------------------------------
+
+
+def normalize_definition(definition):
+    """
+    A definition with float values and RGBA colors. Raises ValueError for
+    a missing name or unknown keys.
+    """
+    if not isinstance(definition, dict) or not definition.get("name"):
+        raise ValueError(f"Material definition without a name: {definition!r}")
+    unknown = set(definition) - set(PRINCIPLED_INPUTS) - {"name"}
+    if unknown:
+        raise ValueError(
+            f"Unknown keys in material {definition['name']}: "
+            f"{', '.join(sorted(unknown))}"
+        )
+
+    normalized = {"name": str(definition["name"])}
+    for key in PRINCIPLED_INPUTS:
+        if key not in definition:
+            continue
+        if key in COLOR_KEYS:
+            color = [float(channel) for channel in definition[key]]
+            if len(color) == 3:
+                color.append(1.0)
+            if len(color) != 4:
+                raise ValueError(f"{key} of {definition['name']} is not RGB(A)")
+            normalized[key] = tuple(color)
+        else:
+            normalized[key] = float(definition[key])
+    return normalized
+
+
+def load_library(path):
+    """
+    Material definitions from a JSON or TOML file: a list of definitions
+    (JSON only) or a "materials" list of them, for example
+
+        [[materials]]
+        name = "Metal_Steel"
+        base_color = [0.7, 0.7, 0.8, 1.0]
+        metallic = 1.0
+    """
+    if path.lower().endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("TOML libraries need Python 3.11 (Blender 4.1+)")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    definitions = data.get("materials") if isinstance(data, dict) else data
+    if not isinstance(definitions, list):
+        raise ValueError(f"{path} has no list of materials")
+    return [normalize_definition(definition) for definition in definitions]
+
+
+def material_signature(definition):
+    """
+    Hash of a definition's shading values. The name is left out, so
+    definitions that only differ in name share one material.
+    """
+    values = {key: value for key, value in definition.items() if key != "name"}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(values, sort_keys=True).encode())
+    return digest.hexdigest()
 
 
-def import_material_library():
+def wanted_names(names, requested="", count=None):
+    """
+    The library entries to load: the comma-separated requested names, else
+    the first count entries (one per mesh to assign), else all of them.
+    """
+    if requested:
+        wanted = list(dict.fromkeys(n.strip() for n in requested.split(",")))
+        known = set(names)
+        for name in wanted:
+            if name and name not in known:
+                print(f"Material {name} is not in the library")
+        return [name for name in wanted if name in known]
+    if count is not None:
+        return names[:count]
+    return list(names)
+
+
+# ---------------------------------------------------------------------------
+# Blender side: materials from a template, assignment through mesh data.
+# ---------------------------------------------------------------------------
+
+
+def principled_node(material):
+    """
+    The material's Principled BSDF node, or None.
+    """
+    if not material.node_tree:
+        return None
+    for node in material.node_tree.nodes:
+        if node.bl_idname == "ShaderNodeBsdfPrincipled":
+            return node
+    return None
+
+
+def input_indices(node):
+    """
+    Index of the Principled BSDF input each definition key sets.
+    """
+    names = [socket.name for socket in node.inputs]
+    indices = {}
+    for key, candidates in PRINCIPLED_INPUTS.items():
+        for name in candidates:
+            if name in names:
+                indices[key] = names.index(name)
+                break
+    return indices
+
+
+def material_state(material):
+    """
+    Hash of the material's current Principled BSDF input values, or None
+    without such a node.
+    """
+    node = principled_node(material)
+    if node is None:
+        return None
+    values = {}
+    for key, index in input_indices(node).items():
+        value = node.inputs[index].default_value
+        values[key] = (
+            round(value, 5)
+            if isinstance(value, float)
+            else [round(channel, 5) for channel in value]
+        )
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(values, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class MaterialTemplate:
+    """
+    A node tree built once per import; new materials are copies of it.
+    Input indices are resolved once, and every definition key missing from
+    a definition is reset to the template's default value.
+    """
+
+    def __init__(self):
+        self.material = bpy.data.materials.new(TEMPLATE_NAME)
+        self.material.use_nodes = True
+        node = principled_node(self.material)
+        self.inputs = input_indices(node)
+        self.defaults = {}
+        for key, index in self.inputs.items():
+            value = node.inputs[index].default_value
+            self.defaults[key] = value if isinstance(value, float) else tuple(value)
+
+    def apply(self, node, definition):
+        """
+        Sets every known input of a Principled BSDF node.
+        """
+        for key, index in self.inputs.items():
+            node.inputs[index].default_value = definition.get(key, self.defaults[key])
+
+    def create(self, definition):
+        """
+        A new material for a definition, copied from the template.
+        """
+        material = self.material.copy()
+        material.name = definition["name"]
+        self.apply(principled_node(material), definition)
+        return material
+
+    def remove(self):
+        """
+        Deletes the template material.
+        """
+        bpy.data.materials.remove(self.material)
+
+
+def import_materials(definitions):
+    """
+    A material for every definition name. Materials built from the same
+    signature earlier are reused as they are. One whose node values were
+    edited by hand since is left alone and loses its signature, so it is
+    never reused or overwritten, and a fresh material is built instead. A
+    material of ours with the definition's name but an outdated signature
+    is updated in place; only the rest are created. Returns (materials by
+    name, created, updated, reused).
+    """
+    by_signature = {}
+    for material in bpy.data.materials:
+        signature = material.get(SIGNATURE_PROPERTY)
+        if signature and not material.library:
+            by_signature.setdefault(signature, material)
+    wanted = {material_signature(definition) for definition in definitions}
+
+    template = None
+    materials = {}
+    created = updated = reused = 0
+    try:
+        for definition in definitions:
+            signature = material_signature(definition)
+            material = by_signature.get(signature)
+            state = material_state(material) if material else None
+            if state is not None and material.get(STATE_PROPERTY) == state:
+                reused += 1
+                materials[definition["name"]] = material
+                continue
+
+            if template is None:
+                template = MaterialTemplate()
+
+            if material is not None:
+                # Edited by hand, or its Principled BSDF is gone: it is the
+                # user's material now
+                del material[SIGNATURE_PROPERTY]
+                if STATE_PROPERTY in material:
+                    del material[STATE_PROPERTY]
+                print(f"Left hand-edited material alone: {material.name}")
+
+            material = bpy.data.materials.get(definition["name"])
+            node = principled_node(material) if material else None
+            if (
+                node
+                and not material.library
+                and material.get(SIGNATURE_PROPERTY) not in (None, *wanted)
+            ):
+                template.apply(node, definition)
+                updated += 1
+                print(f"Updated material: {material.name}")
+            else:
+                material = template.create(definition)
+                created += 1
+                print(f"Created material: {material.name}")
+
+            material[SIGNATURE_PROPERTY] = signature
+            material[STATE_PROPERTY] = material_state(material)
+            by_signature[signature] = material
+            materials[definition["name"]] = material
+    finally:
+        if template is not None:
+            template.remove()
+
+    return materials, created, updated, reused
+
+
+def assign_material(mesh, material):
+    """
+    Makes material the only slot of a mesh and points every face at it
+    with one foreach_set. Returns True when anything changed.
+    """
+    changed = False
+    if len(mesh.materials) != 1 or mesh.materials[0] != material:
+        mesh.materials.clear()
+        mesh.materials.append(material)
+        changed = True
+
+    count = len(mesh.polygons)
+    if count:
+        indices = np.empty(count, dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", indices)
+        if indices.any():
+            mesh.polygons.foreach_set("material_index", np.zeros(count, np.int32))
+            mesh.update()
+            changed = True
+    return changed
+
+
+def assign_to_meshes(objects, materials):
+    """
+    Gives each mesh data-block used by the objects one of the materials
+    in turn. Objects sharing a mesh share its material, so every mesh is
+    written at most once however many objects use it. Returns the number
+    of meshes changed.
+    """
+    meshes = list(dict.fromkeys(obj.data for obj in objects))
+    changed = 0
+    for i, mesh in enumerate(meshes):
+        material = materials[i % len(materials)]
+        if assign_material(mesh, material):
+            changed += 1
+    return changed
+
+
+def blend_material_names(path):
+    """
+    Names of the materials in a .blend file, read without loading them.
+    """
+    with bpy.data.libraries.load(path) as (data_from, data_to):
+        return list(data_from.materials)
+
+
+class LibraryIndex:
+    """
+    JSON index of external material libraries kept in the temp directory.
+    Each entry lists a library's material names (and, for JSON or TOML
+    files, their definitions) and is reused while the file's size and
+    mtime are unchanged, so a large library is only read once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.libraries = {}
+        self.changed = False
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.libraries = data.get("libraries", {})
+
+    def entry(self, library_path):
+        """
+        The index entry of a library file, (re)reading the file if needed.
+        Returns (entry, True if it was read).
+        """
+        stat = os.stat(library_path)
+        entry = self.libraries.get(library_path)
+        if entry and entry["bytes"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry, False
+
+        entry = {"bytes": stat.st_size, "mtime": stat.st_mtime}
+        if library_path.lower().endswith(".blend"):
+            entry["materials"] = blend_material_names(library_path)
+        else:
+            definitions = load_library(library_path)
+            entry["materials"] = [definition["name"] for definition in definitions]
+            entry["definitions"] = definitions
+        self.libraries[library_path] = entry
+        self.changed = True
+        return entry, True
+
+    def save(self):
+        if not self.changed:
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"version": INDEX_VERSION, "libraries": self.libraries},
+                file,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(temp_path, self.path)
+        self.changed = False
+
+
+def index_path():
+    """
+    Library index location, shared by every .blend file.
+    """
+    return os.path.join(tempfile.gettempdir(), INDEX_NAME)
+
+
+def load_blend_materials(path, names, link):
+    """
+    Materials of a .blend library by name. Ones linked or appended from it
+    before are reused; only the others are loaded, in one
+    bpy.data.libraries.load call. Returns (materials by name, loaded,
+    reused).
+    """
+    materials = {}
+    for material in bpy.data.materials:
+        if link and material.library:
+            library = os.path.normpath(bpy.path.abspath(material.library.filepath))
+            if library == path:
+                materials.setdefault(material.name, material)
+        elif not link and not material.library:
+            source = material.get(SOURCE_PROPERTY)
+            if source and source.get("library") == path:
+                materials.setdefault(source.get("name"), material)
+
+    found = {name: materials[name] for name in names if name in materials}
+    reused = len(found)
+    missing = [name for name in names if name not in found]
+    if missing:
+        with bpy.data.libraries.load(path, link=link) as (data_from, data_to):
+            available = set(data_from.materials)
+            requested = [name for name in missing if name in available]
+            # A copy, as Blender replaces the list's names with the data-blocks
+            data_to.materials = list(requested)
+        for name in missing:
+            if name not in available:
+                print(f"Material {name} is no longer in {path}")
+        # Zipped with the names actually requested, so they stay aligned
+        for name, material in zip(requested, data_to.materials):
+            if material is None:
+                print(f"Could not load material {name} from {path}")
+                continue
+            if not link:
+                material[SOURCE_PROPERTY] = {"library": path, "name": name}
+            found[name] = material
+            print(f"{'Linked' if link else 'Appended'} material: {name}")
+    return found, len(found) - reused, reused
+
+
+class PreviewQueue:
+    """
+    Materials waiting for their preview, drained a few per timer tick so
+    Blender stays responsive while it renders them in the background.
+    """
+
+    def __init__(self, materials):
+        self.pending = deque(materials)
+
+    def tick(self):
+        for _ in range(PREVIEWS_PER_TICK):
+            if not self.pending:
+                return None
+            material = self.pending.popleft()
+            try:
+                material.preview_ensure()
+            except ReferenceError:
+                # Removed (or undone) since it was queued
+                continue
+        return PREVIEW_INTERVAL if self.pending else None
+
+    def start(self):
+        if self.pending:
+            bpy.app.timers.register(self.tick, first_interval=PREVIEW_INTERVAL)
+
+
+def import_material_library(
+    library_path="",
+    materials="",
+    assign_to_selected=True,
+    link=True,
+    previews=True,
+):
     """
     Imports and organizes materials from a library.
     Creates basic PBR materials with common properties.
+
+    Materials are matched to existing ones by a signature of their values,
+    so running the import again reuses them instead of adding copies.
+
+    External libraries are indexed once (the index is cached on disk and
+    refreshed when the file's mtime changes) and only the materials that
+    are actually assigned are created, linked or appended.
+
+    Parameters:
+    - library_path: .blend file, or JSON or TOML file of material
+      definitions; empty for the built-in library (default: "")
+    - materials: Comma-separated library materials to load; empty for one
+      per selected mesh, or the whole library when not assigning
+      (default: "")
+    - assign_to_selected: Give the selected meshes the loaded materials
+      in turn (default: True)
+    - link: Link materials from a .blend library instead of appending
+      them (default: True)
+    - previews: Render previews of the loaded materials in the background
+      (default: True)
     """
-    # Material definitions
-    materials = [
-        {
-            "name": "Metal_Steel",
-            "base_color": (0.7, 0.7, 0.8, 1.0),
-            "metallic": 1.0,
-            "roughness": 0.2,
-        },
-        {
-            "name": "Wood_Oak",
-            "base_color": (0.6, 0.4, 0.2, 1.0),
-            "metallic": 0.0,
-            "roughness": 0.8,
-        },
-        {
-            "name": "Plastic_Red",
-            "base_color": (0.8, 0.1, 0.1, 1.0),
-            "metallic": 0.0,
-            "roughness": 0.4,
-        },
-        {
-            "name": "Glass_Clear",
-            "base_color": (1.0, 1.0, 1.0, 0.1),
-            "metallic": 0.0,
-            "roughness": 0.0,
-            "transmission": 1.0,
-        },
-        {
-            "name": "Concrete_Gray",
-            "base_color": (0.5, 0.5, 0.5, 1.0),
-            "metallic": 0.0,
-            "roughness": 0.9,
-        },
-    ]
-
-    created_materials = []
-
-    for mat_data in materials:
-        # Create new material
-        mat = bpy.data.materials.new(name=mat_data["name"])
-        mat.use_nodes = True
-
-        # Get the principled BSDF node
-        bsdf = mat.node_tree.nodes.get("Principled BSDF")
-
-        if bsdf:
-            # Set base color
-            bsdf.inputs["Base Color"].default_value = mat_data["base_color"]
-
-            # Set metallic
-            bsdf.inputs["Metallic"].default_value = mat_data["metallic"]
-
-            # Set roughness
-            bsdf.inputs["Roughness"].default_value = mat_data["roughness"]
-
-            # Set transmission if specified
-            if "transmission" in mat_data:
-                bsdf.inputs["Transmission"].default_value = mat_data["transmission"]
-
-        created_materials.append(mat.name)
-        print(f"Created material: {mat.name}")
-
-    # Apply materials to selected objects
-    selected_objects = [
-        obj for obj in bpy.context.selected_objects if obj.type == "MESH"
-    ]
-
-    if selected_objects:
-        for i, obj in enumerate(selected_objects):
-            if i < len(created_materials):
-                mat_name = created_materials[i]
-                mat = bpy.data.materials.get(mat_name)
-
-                if mat:
-                    # Clear existing materials
-                    obj.data.materials.clear()
-
-                    # Assign new material
-                    obj.data.materials.append(mat)
-                    print(f"Applied {mat_name} to {obj.name}")
+    start = time.perf_counter()
+    objects = []
+    mesh_count = None
+    if assign_to_selected:
+        objects = [obj for obj in bpy.context.selected_objects if obj.type == "MESH"]
+        mesh_count = len({obj.data for obj in objects})
+
+    if library_path:
+        path = os.path.normpath(bpy.path.abspath(library_path))
+        index = LibraryIndex(index_path())
+        try:
+            entry, read = index.entry(path)
+        except (OSError, ValueError) as e:
+            print(f"Could not load material library {path}: {str(e)}")
+            return
+        try:
+            index.save()
+        except OSError as e:
+            print(f"Could not save material library index: {str(e)}")
+        print(
+            f"{'Indexed' if read else 'Using cached index of'} {path}: "
+            f"{len(entry['materials'])} materials"
+        )
+        names = wanted_names(entry["materials"], materials, mesh_count)
+        definitions = entry.get("definitions")
+    else:
+        path = None
+        definitions = [normalize_definition(d) for d in DEFAULT_LIBRARY]
+        names = wanted_names([d["name"] for d in definitions], materials, mesh_count)
+
+    if definitions is None:
+        loaded, created, reused = load_blend_materials(path, names, link)
+        summary = f"{'Linked' if link else 'Appended'} {created}, reused {reused}"
+    else:
+        wanted = set(names)
+        loaded, created, updated, reused = import_materials(
+            [d for d in definitions if d["name"] in wanted]
+        )
+        summary = f"Created {created}, updated {updated}, reused {reused}"
+    library = list(dict.fromkeys(loaded[name] for name in names if name in loaded))
+
+    if objects and library:
+        changed = assign_to_meshes(objects, library)
+        print(
+            f"Assigned materials to {len(objects)} objects "
+            f"({mesh_count} meshes, {changed} changed)"
+        )
+
+    if previews:
+        PreviewQueue(library).start()
 
     print(
-        f"Material library import completed! Created {len(created_materials)} materials."
+        f"Material library import completed in {time.perf_counter() - start:.2f}s! "
+        f"{summary} materials."
     )
 
 
+def main():
+    """
+    Main function to execute the material importer script.
+    This function will be called when the script is executed from the UI.
+    """
+    # Default parameters - these will be overridden by the UI
+    library_path = ""
+    materials = ""
+    assign_to_selected = True
+    link = True
+    previews = True
+
+    import_material_library(library_path, materials, assign_to_selected, link, previews)
+
+
 # Run the function
 if __name__ == "__main__":
-    import_material_library()
+    main()
@@ -1,78 +1,375 @@
+import time
+
 import bpy
 import bmesh
+import numpy as np
+
+MERGE_DISTANCE = 0.0001
+FILL_HOLE_SIDES = 4
+MERGE_BMESH = "bmesh"
+MERGE_GRID = "grid"
+GRID_PAIR_CHUNK = 1 << 22
+
+# Half of the 26 neighbouring cells; the mirrored half is covered when the
+# neighbour looks back at this cell.
+NEIGHBOUR_CELLS = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+
+# ---------------------------------------------------------------------------
+# Grid merge: plain NumPy, no Blender types.
+# ---------------------------------------------------------------------------
 
 
-def cleanup_mesh():
+def _cell_points(starts, counts, cells):
     """
-    Cleans up mesh geometry by removing doubles, fixing normals,
-    and optimizing topology for better performance.
+    Sorted positions of the points in the given cells, and the cell of each.
     """
-    # Get the active object
-    obj = bpy.context.active_object
+    sizes = counts[cells]
+    owner = np.repeat(cells, sizes)
+    run_starts = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return np.arange(sizes.sum()) - run_starts + starts[owner], owner
 
-    if obj is None or obj.type != "MESH":
-        print("Please select a mesh object")
+
+def _close_pairs(coords, points, lo, hi, distance):
+    """
+    Yields (first, second) position arrays of the points closer than
+    distance, checking each of points against the sorted range lo:hi.
+    Candidates are expanded in chunks of about GRID_PAIR_CHUNK pairs to
+    bound memory.
+    """
+    lengths = np.maximum(hi - lo, 0)
+    ends = np.cumsum(lengths)
+    if not len(ends) or not ends[-1]:
         return
+    splits = np.searchsorted(
+        ends, np.arange(GRID_PAIR_CHUNK, ends[-1], GRID_PAIR_CHUNK)
+    )
+    bounds = np.unique(np.concatenate(([0], splits + 1, [len(ends)])))
+    limit = distance * distance
+
+    for begin, end in zip(bounds[:-1], bounds[1:]):
+        counts = lengths[begin:end]
+        total = counts.sum()
+        if not total:
+            continue
+        first = np.repeat(points[begin:end], counts)
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        second = np.arange(total) - run_starts + np.repeat(lo[begin:end], counts)
+        diff = coords[first] - coords[second]
+        close = np.einsum("ij,ij->i", diff, diff) <= limit
+        yield first[close], second[close]
+
 
-    # Enter edit mode
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode="EDIT")
+def _components(count, first, second):
+    """
+    Lowest index of each vertex's connected component over the given edges.
+    """
+    labels = np.arange(count)
+    if not len(first):
+        return labels
+    while True:
+        low = np.minimum(labels[first], labels[second])
+        np.minimum.at(labels, first, low)
+        np.minimum.at(labels, second, low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels[first], labels[second]):
+            return labels
 
-    # Select all geometry
-    bpy.ops.mesh.select_all(action="SELECT")
 
-    # Create bmesh instance
-    bm = bmesh.from_edit_mesh(obj.data)
+def grid_merge_targets(coords, distance):
+    """
+    Maps every vertex to the vertex it merges into: the lowest index among
+    all vertices linked to it by chains of pairs closer than distance.
+    Unmerged vertices map to themselves.
+
+    Points are quantized to cells of size distance, so close pairs are
+    either in the same cell or in one of its neighbours.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    count = len(coords)
+    if count < 2:
+        return np.arange(count)
+
+    if distance <= 0:
+        _, first, inverse = np.unique(
+            coords, axis=0, return_index=True, return_inverse=True
+        )
+        return first[inverse.reshape(-1)]
 
-    # Store original stats
-    original_verts = len(bm.verts)
-    original_faces = len(bm.faces)
+    cells = np.floor(coords / distance).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    extent = cells.max(axis=0) + 2
+    # Keys may wrap around int64 for huge extents; that only adds candidates
+    # the distance test rejects.
+    with np.errstate(over="ignore"):
+        strides = np.array([extent[1] * extent[2], extent[2], 1], dtype=np.int64)
+        keys = (cells * strides).sum(axis=1)
 
+    order = np.argsort(keys, kind="stable")
+    sorted_coords = coords[order]
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(
+        np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+    )
+    cell_keys = sorted_keys[starts]
+    counts = np.diff(np.append(starts, count))
+    ends = starts + counts
+
+    # Pairs inside one cell, then against each neighbouring cell that exists
+    points, owner = _cell_points(starts, counts, np.flatnonzero(counts > 1))
+    ranges = [(points, points + 1, ends[owner])]
+    for offset in NEIGHBOUR_CELLS:
+        with np.errstate(over="ignore"):
+            wanted = cell_keys + np.dot(np.array(offset, dtype=np.int64), strides)
+        found = np.minimum(np.searchsorted(cell_keys, wanted), len(cell_keys) - 1)
+        cells = np.flatnonzero(cell_keys[found] == wanted)
+        points, owner = _cell_points(starts, counts, cells)
+        neighbour = found[owner]
+        ranges.append((points, starts[neighbour], ends[neighbour]))
+
+    first, second = [], []
+    for points, lo, hi in ranges:
+        for a, b in _close_pairs(sorted_coords, points, lo, hi, distance):
+            first.append(order[a])
+            second.append(order[b])
+    if not first:
+        return np.arange(count)
+    return _components(count, np.concatenate(first), np.concatenate(second))
+
+
+# ---------------------------------------------------------------------------
+# Blender side.
+# ---------------------------------------------------------------------------
+
+
+def read_coords(mesh):
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+
+def weld_targets(bm, targets):
+    """
+    Welds BMesh vertices onto their grid merge targets; weld_verts remaps
+    edges and faces and drops the ones that collapse.
+    """
+    merged = np.flatnonzero(targets != np.arange(len(targets)))
+    if not len(merged):
+        return
+    bm.verts.ensure_lookup_table()
+    verts = bm.verts
+    targetmap = {
+        verts[source]: verts[target]
+        for source, target in zip(merged.tolist(), targets[merged].tolist())
+    }
+    bmesh.ops.weld_verts(bm, targetmap=targetmap)
+
+
+def loose_geometry(bm):
+    """
+    Vertices without edges and edges without faces.
+    """
+    verts = [vert for vert in bm.verts if not vert.link_edges]
+    edges = [edge for edge in bm.edges if not edge.link_faces]
+    return verts, edges
+
+
+def interior_faces(bm):
+    """
+    Faces whose every edge is shared by more than two faces, which is what
+    select_interior_faces picks in edit mode.
+    """
+    return [
+        face
+        for face in bm.faces
+        if all(len(edge.link_faces) > 2 for edge in face.edges)
+    ]
+
+
+def cleanup_bmesh(
+    bm,
+    merge_distance=MERGE_DISTANCE,
+    fill_hole_sides=FILL_HOLE_SIDES,
+    triangulate=True,
+    targets=None,
+):
+    """
+    Runs the whole cleanup on one BMesh with bmesh.ops, in the same order as
+    the edit mode operator chain it replaces. With grid merge targets the
+    vertices are welded onto them instead of running remove_doubles.
+    """
     # Remove doubles/merge vertices
-    bpy.ops.mesh.remove_doubles(threshold=0.0001)
+    if targets is None:
+        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=merge_distance)
+    else:
+        weld_targets(bm, targets)
 
     # Remove degenerate geometry
-    bpy.ops.mesh.delete_loose()
+    verts, edges = loose_geometry(bm)
+    if edges:
+        bmesh.ops.delete(bm, geom=edges, context="EDGES")
+    if verts:
+        bmesh.ops.delete(
+            bm, geom=[vert for vert in verts if vert.is_valid], context="VERTS"
+        )
 
     # Fill holes
-    bpy.ops.mesh.fill_holes(sides=4)
+    if fill_hole_sides:
+        bmesh.ops.holes_fill(bm, edges=bm.edges, sides=fill_hole_sides)
 
     # Recalculate normals
-    bpy.ops.mesh.normals_make_consistent(inside=False)
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
 
     # Remove interior faces
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.mesh.select_interior_faces()
-    bpy.ops.mesh.delete(type="FACE")
-
-    # Select all again for final cleanup
-    bpy.ops.mesh.select_all(action="SELECT")
+    faces = interior_faces(bm)
+    if faces:
+        bmesh.ops.delete(bm, geom=faces, context="FACES_ONLY")
 
     # Triangulate faces for better compatibility
-    bpy.ops.mesh.quads_convert_to_tris(quad_method="BEAUTY", ngon_method="BEAUTY")
+    if triangulate:
+        bmesh.ops.triangulate(
+            bm, faces=bm.faces, quad_method="BEAUTY", ngon_method="BEAUTY"
+        )
+
+
+def cleanup_mesh_data(
+    mesh, merge_mode=MERGE_BMESH, merge_distance=MERGE_DISTANCE, **options
+):
+    """
+    Cleans one mesh data-block in object mode and returns
+    (verts before, faces before, verts after, faces after).
+    """
+    targets = None
+    if merge_mode == MERGE_GRID:
+        targets = grid_merge_targets(read_coords(mesh), merge_distance)
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        original = (len(bm.verts), len(bm.faces))
+        cleanup_bmesh(bm, merge_distance, targets=targets, **options)
+        cleaned = (len(bm.verts), len(bm.faces))
+        bm.to_mesh(mesh)
+    finally:
+        bm.free()
+    mesh.update()
+    return original + cleaned
+
+
+def selected_meshes():
+    """
+    Mesh data-blocks of the selected objects (or the active object), each
+    listed once with the objects that share it.
+    """
+    objects = list(bpy.context.selected_objects)
+    if not objects and bpy.context.active_object:
+        objects = [bpy.context.active_object]
+
+    users = {}
+    for obj in objects:
+        if obj.type == "MESH":
+            users.setdefault(obj.data, []).append(obj)
+    return users
+
+
+def cleanup_mesh(
+    merge_distance=MERGE_DISTANCE,
+    fill_hole_sides=FILL_HOLE_SIDES,
+    triangulate=True,
+    merge_mode=MERGE_BMESH,
+):
+    """
+    Cleans up mesh geometry by removing doubles, fixing normals,
+    and optimizing topology for better performance.
+
+    Every selected mesh is processed with bmesh only; meshes shared by
+    several objects are cleaned once. merge_mode "grid" finds doubles with
+    NumPy instead of remove_doubles, which is much faster on scan meshes
+    with millions of vertices.
+    """
+    if merge_mode not in (MERGE_BMESH, MERGE_GRID):
+        print(f"Unknown merge mode {merge_mode!r}, expected 'bmesh' or 'grid'")
+        return
+
+    meshes = selected_meshes()
+
+    if not meshes:
+        print("Please select a mesh object")
+        return
+
+    # Edit mode keeps its own copy of the geometry, so flush it first
+    if bpy.context.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+    start = time.perf_counter()
+    total_verts_removed = 0
+    cleaned_count = 0
 
-    # Update bmesh
-    bmesh.update_edit_mesh(obj.data)
+    for mesh, objects in meshes.items():
+        names = ", ".join(obj.name for obj in objects)
 
-    # Get new stats
-    new_verts = len(bm.verts)
-    new_faces = len(bm.faces)
+        if mesh.library:
+            print(f"Skipping {names} (linked mesh {mesh.name})")
+            continue
 
-    # Return to object mode
-    bpy.ops.object.mode_set(mode="OBJECT")
+        mesh_start = time.perf_counter()
+        original_verts, original_faces, new_verts, new_faces = cleanup_mesh_data(
+            mesh,
+            merge_distance=merge_distance,
+            fill_hole_sides=fill_hole_sides,
+            triangulate=triangulate,
+            merge_mode=merge_mode,
+        )
+        elapsed = time.perf_counter() - mesh_start
 
-    # Calculate improvements
-    verts_removed = original_verts - new_verts
-    faces_changed = new_faces - original_faces
+        # Calculate improvements
+        verts_removed = original_verts - new_verts
+        faces_changed = new_faces - original_faces
+        total_verts_removed += verts_removed
+        cleaned_count += 1
 
-    print(f"Mesh cleanup completed for {obj.name}:")
-    print(f"  - Vertices: {original_verts} → {new_verts} ({verts_removed} removed)")
-    print(f"  - Faces: {original_faces} → {new_faces} ({faces_changed:+d})")
+        print(f"Mesh cleanup completed for {names} ({elapsed * 1000:.1f} ms):")
+        if len(objects) > 1:
+            print(
+                f"  - Shared mesh {mesh.name} cleaned once for {len(objects)} objects"
+            )
+        print(f"  - Vertices: {original_verts} → {new_verts} ({verts_removed} removed)")
+        print(f"  - Faces: {original_faces} → {new_faces} ({faces_changed:+d})")
+
+    print("-" * 50)
+    print(
+        f"Cleaned {cleaned_count} meshes in {time.perf_counter() - start:.2f}s, "
+        f"{total_verts_removed} vertices removed"
+    )
     print("  - Normals recalculated")
-    print("  - Doubles removed")
+    print(f"  - Doubles removed ({merge_mode} merge)")
     print("  - Holes filled")
 
 
+def main():
+    """
+    Main function to execute the mesh cleanup script.
+    This function will be called when the script is executed from the UI.
+    """
+    # Default parameters - these will be overridden by the UI
+    merge_distance = 0.0001
+    fill_hole_sides = 4
+    triangulate = True
+    merge_mode = "bmesh"
+
+    cleanup_mesh(merge_distance, fill_hole_sides, triangulate, merge_mode)
+
+
 # Run the function
 if __name__ == "__main__":
-    cleanup_mesh()
+    main()
@@ -1,106 +1,508 @@
+import time
+
 import bpy
-import bmesh
-import mathutils
-import random
+import numpy as np
+
+TRUNK_SEGMENTS = 16
+TRUNK_RINGS = 5
+BRANCH_SEGMENTS = 8
+# Leaf clusters, as the operator-based version made them with
+# primitive_ico_sphere_add(subdivisions=1)
+LEAF_SUBDIVISIONS = 1
+COLLECTION_NAME = "Procedural_Trees"
+FOREST_COLLECTION_NAME = "Forest"
+VARIANTS_COLLECTION_NAME = "Forest_Tree_Variants"
+SCATTER_OBJECTS = "objects"
+SCATTER_GEOMETRY_NODES = "geometry_nodes"
+
+
+# ---------------------------------------------------------------------------
+# Geometry: plain NumPy. A part is (verts (V, 3), loops, sizes) where loops
+# lists the vertex indices of all faces back to back and sizes holds the
+# number of corners of each face.
+# ---------------------------------------------------------------------------
+
+
+def cylinder(segments, rings, profile=None):
+    """
+    Capped cylinder of radius 1 and depth 1 centred on the origin, with
+    optional per-ring radius scale.
+    """
+    angle = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    z = np.linspace(-0.5, 0.5, rings)
+    radius = np.ones(rings) if profile is None else np.asarray(profile)
+
+    verts = np.empty((rings, segments, 3))
+    verts[..., 0] = np.cos(angle) * radius[:, None]
+    verts[..., 1] = np.sin(angle) * radius[:, None]
+    verts[..., 2] = z[:, None]
+
+    ring = np.arange(rings - 1)[:, None] * segments
+    this = np.arange(segments)
+    following = (this + 1) % segments
+    quads = np.stack(
+        [
+            ring + this,
+            ring + following,
+            ring + segments + following,
+            ring + segments + this,
+        ],
+        axis=-1,
+    ).reshape(-1)
+    bottom = this[::-1]
+    top = (rings - 1) * segments + this
+
+    loops = np.concatenate([quads, bottom, top])
+    sizes = np.concatenate([np.full((rings - 1) * segments, 4), [segments, segments]])
+    return verts.reshape(-1, 3), loops, sizes
+
+
+def ico_sphere(subdivisions=LEAF_SUBDIVISIONS):
+    """
+    Unit icosphere counting subdivisions like primitive_ico_sphere_add:
+    1 is the plain icosahedron (12 vertices), 2 (the operator's default)
+    splits every face in four once (42 vertices), and so on.
+    """
+    t = (1 + 5**0.5) / 2
+    verts = [
+        (-1, t, 0), (1, t, 0), (-1, -t, 0), (1, -t, 0),
+        (0, -1, t), (0, 1, t), (0, -1, -t), (0, 1, -t),
+        (t, 0, -1), (t, 0, 1), (-t, 0, -1), (-t, 0, 1),
+    ]  # fmt: skip
+    faces = [
+        (0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+        (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+        (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+        (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1),
+    ]  # fmt: skip
+
+    midpoints = {}
+
+    def midpoint(a, b):
+        key = (min(a, b), max(a, b))
+        if key not in midpoints:
+            midpoints[key] = len(verts)
+            verts.append(tuple(np.add(verts[a], verts[b]) / 2))
+        return midpoints[key]
+
+    for _ in range(subdivisions - 1):
+        subdivided = []
+        for a, b, c in faces:
+            ab, bc, ca = midpoint(a, b), midpoint(b, c), midpoint(c, a)
+            subdivided += [(a, ab, ca), (b, bc, ab), (c, ca, bc), (ab, bc, ca)]
+        faces = subdivided
+        midpoints.clear()
+
+    verts = np.array(verts, dtype=float)
+    verts /= np.linalg.norm(verts, axis=1)[:, None]
+    return verts, np.array(faces).reshape(-1), np.full(len(faces), 3)
+
+
+def euler_matrices(angles):
+    """
+    Rotation matrices (N, 3, 3) for XYZ Euler angles, as Blender applies them.
+    """
+    sx, sy, sz = np.sin(angles).T
+    cx, cy, cz = np.cos(angles).T
+    matrices = np.empty((len(angles), 3, 3))
+    matrices[:, 0] = np.stack(
+        [cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz], -1
+    )
+    matrices[:, 1] = np.stack(
+        [cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz], -1
+    )
+    matrices[:, 2] = np.stack([-sy, sx * cy, cx * cy], -1)
+    return matrices
+
+
+def instance_part(part, scales, matrices=None, offsets=None):
+    """
+    Copies of one part, each scaled, rotated and moved, as a single part.
+    """
+    verts, loops, sizes = part
+    count = len(scales)
+    placed = verts[None] * scales[:, None, :]
+    if matrices is not None:
+        placed = np.einsum("nij,nvj->nvi", matrices, placed)
+    if offsets is not None:
+        placed += offsets[:, None, :]
+    shifted = loops[None] + (np.arange(count) * len(verts))[:, None]
+    return placed.reshape(-1, 3), shifted.reshape(-1), np.tile(sizes, count)
+
+
+def combine(parts):
+    verts, loops, sizes = [], [], []
+    offset = 0
+    for part_verts, part_loops, part_sizes in parts:
+        verts.append(part_verts)
+        loops.append(part_loops + offset)
+        sizes.append(part_sizes)
+        offset += len(part_verts)
+    return np.concatenate(verts), np.concatenate(loops), np.concatenate(sizes)
+
+
+def tree_geometry(rng, leaf=None):
+    """
+    Trunk, branches and leaves of one tree, drawn from rng, as one part.
+    """
+    leaf = leaf if leaf is not None else ico_sphere()
+
+    # Trunk with some taper
+    profile = np.linspace(1.0, 0.7, TRUNK_RINGS) * (
+        1 + 0.15 * np.sin(np.linspace(0, np.pi, TRUNK_RINGS))
+    )
+    trunk = instance_part(
+        cylinder(TRUNK_SEGMENTS, TRUNK_RINGS, profile),
+        np.array([[0.5, 0.5, 4.0]]),
+        offsets=np.array([[0.0, 0.0, 2.0]]),
+    )
+
+    # Branches spread around the trunk
+    branch_count = rng.integers(5, 9)
+    angles = 2 * np.pi * np.arange(branch_count) / branch_count
+    angles += np.radians(rng.uniform(-30, 30, branch_count))
+    radius = rng.uniform(0.1, 0.3, branch_count)
+    rotations = np.stack(
+        [
+            rng.uniform(-0.5, 0.5, branch_count),
+            rng.uniform(0.3, 0.8, branch_count),
+            angles,
+        ],
+        axis=-1,
+    )
+    offsets = np.stack(
+        [
+            rng.uniform(0.5, 1.5, branch_count),
+            rng.uniform(-0.5, 0.5, branch_count),
+            rng.uniform(2, 4, branch_count),
+        ],
+        axis=-1,
+    )
+    branches = instance_part(
+        cylinder(BRANCH_SEGMENTS, 2),
+        np.stack([radius, radius, rng.uniform(1.5, 3, branch_count)], axis=-1),
+        euler_matrices(rotations),
+        offsets,
+    )
+
+    # Leaves as squashed icospheres
+    leaf_count = rng.integers(15, 26)
+    leaf_scales = rng.uniform([0.8, 0.8, 0.6], [1.2, 1.2, 1.0], (leaf_count, 3))
+    leaf_scales *= rng.uniform(0.3, 0.6, leaf_count)[:, None]
+    leaves = instance_part(
+        leaf,
+        leaf_scales,
+        offsets=rng.uniform([-2, -2, 3], [2, 2, 6], (leaf_count, 3)),
+    )
+
+    return combine([trunk, branches, leaves])
+
+
+def scatter_transforms(rng, count, variant_count, area_size, scale_range=(0.7, 1.3)):
+    """
+    Random placements over a square area centred on the origin: locations
+    (N, 3), Z rotations, uniform scales and the variant used by each.
+    """
+    half = area_size / 2
+    locations = np.zeros((count, 3))
+    locations[:, :2] = rng.uniform(-half, half, (count, 2))
+    rotations = rng.uniform(0, 2 * np.pi, count)
+    scales = rng.uniform(*scale_range, count)
+    variants = rng.integers(0, variant_count, count)
+    return locations, rotations, scales, variants
+
+
+# ---------------------------------------------------------------------------
+# Blender side: meshes and objects through the data API, no operators.
+# ---------------------------------------------------------------------------
+
 
+def build_mesh(name, part):
+    """
+    New mesh data-block filled from a part with foreach_set.
+    """
+    verts, loops, sizes = part
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.loops.add(len(loops))
+    mesh.polygons.add(len(sizes))
+
+    mesh.vertices.foreach_set("co", verts.astype(np.float32).reshape(-1))
+    mesh.loops.foreach_set("vertex_index", loops.astype(np.int32))
+    mesh.polygons.foreach_set("loop_start", (np.cumsum(sizes) - sizes).astype(np.int32))
+    # Face sizes follow from loop_start in newer Blender versions
+    if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", sizes.astype(np.int32))
 
-def create_procedural_tree():
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def tree_rng(seed, index):
+    """
+    Independent stream per tree, so tree i is the same whatever the count.
+    """
+    return np.random.default_rng([seed, index])
+
+
+def create_procedural_tree(seed=None):
     """
     Generates a realistic tree using procedural modeling techniques.
     Creates trunk, branches, and leaves with natural variation.
     """
-    # Clear existing mesh
-    bpy.ops.object.select_all(action="DESELECT")
+    rng = np.random.default_rng(seed)
+    mesh = build_mesh("Procedural_Tree", tree_geometry(rng))
+    tree = bpy.data.objects.new("Procedural_Tree", mesh)
+    bpy.context.collection.objects.link(tree)
+
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    tree.select_set(True)
+    bpy.context.view_layer.objects.active = tree
+
+    print(
+        f"Procedural tree generated successfully! "
+        f"({len(mesh.vertices)} vertices, {len(mesh.polygons)} faces)"
+    )
+    return tree
+
+
+def create_procedural_trees(count=1, seed=0, spacing=8.0, as_instances=False):
+    """
+    Generates count trees on a grid in their own collection.
 
-    # Create trunk
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.5, depth=4, location=(0, 0, 2))
+    Parameters:
+    - count: Number of trees (default: 1)
+    - seed: Random seed; the same seed gives the same trees (default: 0)
+    - spacing: Distance between trees in the grid (default: 8.0)
+    - as_instances: Share one tree mesh between all objects, each with its
+      own rotation and scale, instead of building a mesh per tree (default: False)
+    """
+    if count <= 1:
+        return [create_procedural_tree(seed)]
 
-    trunk = bpy.context.active_object
-    trunk.name = "Tree_Trunk"
+    start = time.perf_counter()
+    collection = bpy.data.collections.new(COLLECTION_NAME)
+    bpy.context.scene.collection.children.link(collection)
 
-    # Enter edit mode for trunk modification
-    bpy.ops.object.mode_set(mode="EDIT")
+    columns = int(np.ceil(np.sqrt(count)))
+    grid = np.indices((columns, columns)).reshape(2, -1).T[:count]
+    locations = (grid - (columns - 1) / 2) * spacing
 
-    # Add some taper to the trunk
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.transform.tosphere(value=0.3)
+    layout_rng = np.random.default_rng([seed, count])
+    rotations = layout_rng.uniform(0, 2 * np.pi, count)
+    scales = layout_rng.uniform(0.8, 1.2, count)
 
-    # Add subdivision for detail
-    bpy.ops.mesh.subdivide(number_cuts=3)
+    leaf = ico_sphere()
+    shared = None
+    if as_instances:
+        shared = build_mesh("Procedural_Tree", tree_geometry(tree_rng(seed, 0), leaf))
 
-    # Return to object mode
-    bpy.ops.object.mode_set(mode="OBJECT")
+    trees = []
+    vertex_count = 0
+    for index in range(count):
+        if shared:
+            mesh = shared
+        else:
+            geometry = tree_geometry(tree_rng(seed, index), leaf)
+            mesh = build_mesh(f"Procedural_Tree_{index + 1:03d}", geometry)
+        vertex_count += len(mesh.vertices)
 
-    # Create branches
-    branch_count = random.randint(5, 8)
+        tree = bpy.data.objects.new(f"Procedural_Tree_{index + 1:03d}", mesh)
+        tree.location = (*locations[index], 0.0)
+        if shared:
+            tree.rotation_euler.z = rotations[index]
+            tree.scale = (scales[index],) * 3
+        collection.objects.link(tree)
+        trees.append(tree)
 
-    for i in range(branch_count):
-        # Random branch position and rotation
-        height = random.uniform(2, 4)
-        angle = (360 / branch_count) * i + random.uniform(-30, 30)
+    mesh_count = 1 if shared else count
+    print(
+        f"Generated {count} trees ({mesh_count} meshes, {vertex_count} vertices) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return trees
 
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=random.uniform(0.1, 0.3),
-            depth=random.uniform(1.5, 3),
-            location=(0, 0, height),
-        )
 
-        branch = bpy.context.active_object
-        branch.name = f"Tree_Branch_{i+1}"
+def hidden_collection(name):
+    """
+    New collection linked to the scene but excluded from the view layer, so
+    its objects only show up through instancing.
+    """
+    collection = bpy.data.collections.new(name)
+    bpy.context.scene.collection.children.link(collection)
+    bpy.context.view_layer.layer_collection.children[collection.name].exclude = True
+    collection.hide_render = True
+    return collection
+
+
+def enabled_output(node):
+    """
+    The visible output of a node whose outputs depend on its data type.
+    """
+    return next(socket for socket in node.outputs if socket.enabled)
+
 
-        # Rotate and position branch
-        branch.rotation_euler = (
-            random.uniform(-0.5, 0.5),
-            random.uniform(0.3, 0.8),
-            mathutils.radians(angle),
+def add_group_socket(group, name, in_out):
+    if hasattr(group, "interface"):
+        group.interface.new_socket(
+            name=name, in_out=in_out, socket_type="NodeSocketGeometry"
         )
+    elif in_out == "INPUT":
+        group.inputs.new("NodeSocketGeometry", name)
+    else:
+        group.outputs.new("NodeSocketGeometry", name)
+
+
+def scatter_node_group(variants):
+    """
+    Geometry nodes group that instances the variants collection on every
+    point, picking the variant, Z rotation and scale from point attributes.
+    """
+    group = bpy.data.node_groups.new("Forest_Scatter", "GeometryNodeTree")
+    add_group_socket(group, "Geometry", "INPUT")
+    add_group_socket(group, "Geometry", "OUTPUT")
+    nodes, links = group.nodes, group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+
+    collection_info = nodes.new("GeometryNodeCollectionInfo")
+    collection_info.transform_space = "ORIGINAL"
+    collection_info.inputs["Collection"].default_value = variants
+    collection_info.inputs["Separate Children"].default_value = True
+    collection_info.inputs["Reset Children"].default_value = True
+
+    def named_attribute(name, data_type):
+        node = nodes.new("GeometryNodeInputNamedAttribute")
+        node.data_type = data_type
+        node.inputs["Name"].default_value = name
+        return enabled_output(node)
+
+    rotation = nodes.new("ShaderNodeCombineXYZ")
+    links.new(named_attribute("rotation_z", "FLOAT"), rotation.inputs["Z"])
+
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+    instance.inputs["Pick Instance"].default_value = True
+    links.new(group_input.outputs["Geometry"], instance.inputs["Points"])
+    links.new(enabled_output(collection_info), instance.inputs["Instance"])
+    links.new(named_attribute("variant", "INT"), instance.inputs["Instance Index"])
+    links.new(rotation.outputs["Vector"], instance.inputs["Rotation"])
+    links.new(named_attribute("scale", "FLOAT"), instance.inputs["Scale"])
+    links.new(instance.outputs["Instances"], group_output.inputs["Geometry"])
+    return group
+
 
-        # Move branch outward
-        branch.location.x += random.uniform(0.5, 1.5)
-        branch.location.y += random.uniform(-0.5, 0.5)
-
-    # Create leaves using icospheres
-    leaf_count = random.randint(15, 25)
-
-    for i in range(leaf_count):
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=random.uniform(0.3, 0.6),
-            subdivisions=1,
-            location=(
-                random.uniform(-2, 2),
-                random.uniform(-2, 2),
-                random.uniform(3, 6),
-            ),
+def build_point_cloud(name, locations, rotations, scales, variants):
+    """
+    Mesh of loose vertices carrying the scatter attributes.
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(locations))
+    mesh.vertices.foreach_set("co", locations.astype(np.float32).reshape(-1))
+    for attribute, attribute_type, values in (
+        ("variant", "INT", variants.astype(np.int32)),
+        ("rotation_z", "FLOAT", rotations.astype(np.float32)),
+        ("scale", "FLOAT", scales.astype(np.float32)),
+    ):
+        mesh.attributes.new(attribute, attribute_type, "POINT").data.foreach_set(
+            "value", values
         )
+    mesh.update()
+    return mesh
+
 
-        leaf = bpy.context.active_object
-        leaf.name = f"Tree_Leaf_{i+1}"
+def create_forest(
+    tree_count=1000,
+    variant_count=8,
+    area_size=200.0,
+    seed=0,
+    mode=SCATTER_GEOMETRY_NODES,
+):
+    """
+    Scatters tree_count trees over a square area using a small pool of tree
+    variants, so memory grows with the variants rather than the trees.
+
+    Parameters:
+    - tree_count: Number of placed trees (default: 1000)
+    - variant_count: Distinct tree meshes in the pool (default: 8)
+    - area_size: Side of the square area in metres (default: 200.0)
+    - seed: Random seed for variants and placements (default: 0)
+    - mode: "geometry_nodes" instances the pool on one point cloud;
+      "objects" adds a linked duplicate object per tree (default: "geometry_nodes")
+    """
+    if mode not in (SCATTER_OBJECTS, SCATTER_GEOMETRY_NODES):
+        print(f"Unknown scatter mode {mode!r}, expected 'objects' or 'geometry_nodes'")
+        return None
 
-        # Scale leaves randomly
-        leaf.scale = (
-            random.uniform(0.8, 1.2),
-            random.uniform(0.8, 1.2),
-            random.uniform(0.6, 1.0),
+    start = time.perf_counter()
+    variant_count = max(1, min(variant_count, tree_count))
+
+    # Variant pool, built once
+    leaf = ico_sphere()
+    variants = hidden_collection(VARIANTS_COLLECTION_NAME)
+    meshes = []
+    for index in range(variant_count):
+        mesh = build_mesh(
+            f"Forest_Tree_{index + 1:02d}", tree_geometry(tree_rng(seed, index), leaf)
         )
+        variants.objects.link(bpy.data.objects.new(mesh.name, mesh))
+        meshes.append(mesh)
+    pool_time = time.perf_counter() - start
+
+    locations, rotations, scales, picks = scatter_transforms(
+        np.random.default_rng([seed, tree_count]), tree_count, variant_count, area_size
+    )
+
+    forest = bpy.data.collections.new(FOREST_COLLECTION_NAME)
+    bpy.context.scene.collection.children.link(forest)
 
-    # Select all tree parts
-    bpy.ops.object.select_all(action="DESELECT")
-    for obj in bpy.context.scene.objects:
-        if obj.name.startswith("Tree_"):
-            obj.select_set(True)
+    if mode == SCATTER_GEOMETRY_NODES:
+        points = build_point_cloud("Forest_Points", locations, rotations, scales, picks)
+        scatter = bpy.data.objects.new("Forest_Scatter", points)
+        modifier = scatter.modifiers.new("Forest_Scatter", "NODES")
+        modifier.node_group = scatter_node_group(variants)
+        forest.objects.link(scatter)
+    else:
+        for index in range(tree_count):
+            tree = bpy.data.objects.new(
+                f"Forest_Tree_{index + 1:05d}", meshes[picks[index]]
+            )
+            tree.location = locations[index]
+            tree.rotation_euler.z = rotations[index]
+            tree.scale = (scales[index],) * 3
+            forest.objects.link(tree)
 
-    # Set trunk as active
-    bpy.context.view_layer.objects.active = trunk
+    elapsed = time.perf_counter() - start
+    vertex_count = sum(len(mesh.vertices) for mesh in meshes)
+    print(f"Forest generated ({mode}):")
+    print(f"  - Instances: {tree_count} from {variant_count} variants")
+    print(f"  - Variant pool: {vertex_count} vertices, built in {pool_time:.2f}s")
+    print(f"  - Build time: {elapsed:.2f}s")
+    return forest
 
-    # Join all parts
-    bpy.ops.object.join()
 
-    # Rename final object
-    bpy.context.active_object.name = "Procedural_Tree"
+def main():
+    """
+    Main function to execute the tree generator script.
+    This function will be called when the script is executed from the UI.
+    """
+    # Default parameters - these will be overridden by the UI
+    tree_count = 1
+    seed = 0
+    spacing = 8.0
+    as_instances = False
+    scatter = False
+    variant_count = 8
+    area_size = 200.0
+    scatter_mode = "geometry_nodes"
 
-    print("Procedural tree generated successfully!")
+    if scatter:
+        create_forest(tree_count, variant_count, area_size, seed, scatter_mode)
+    else:
+        create_procedural_trees(tree_count, seed, spacing, as_instances)
 
 
 # Run the function
 if __name__ == "__main__":
-    create_procedural_tree()
+    main()
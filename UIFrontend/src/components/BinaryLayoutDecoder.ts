@@ -0,0 +1,88 @@
+import type {
+  BlenderArea,
+  BlenderLayout,
+  BlenderRegion,
+  BlenderWindow,
+} from "../types";
+
+export const LAYOUT_BINARY_PREFIX = "LAYOUT_BIN:";
+
+const LAYOUT_BINARY_VERSION = 1;
+const HEADER_SIZE = 32;
+const RECORD_FIELDS = 6;
+
+export function decodeBinaryLayout(base64: string): BlenderLayout | null {
+  const binary = atob(base64);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+
+  if (bytes.length < HEADER_SIZE) return null;
+  const view = new DataView(bytes.buffer);
+  if (view.getUint8(0) !== LAYOUT_BINARY_VERSION) return null;
+
+  const windowCount = view.getUint16(2, true);
+  const seq = view.getUint32(20, true);
+  const recordCount = view.getUint32(24, true);
+  const stringsOffset = view.getUint32(28, true);
+
+  const decoder = new TextDecoder();
+  const strings: string[] = [];
+  const stringCount = view.getUint16(stringsOffset, true);
+  let offset = stringsOffset + 2;
+  for (let i = 0; i < stringCount; i++) {
+    const length = view.getUint16(offset, true);
+    offset += 2;
+    strings.push(decoder.decode(bytes.subarray(offset, offset + length)));
+    offset += length;
+  }
+
+  const records = new Int32Array(
+    bytes.buffer,
+    HEADER_SIZE,
+    recordCount * RECORD_FIELDS
+  );
+  let cursor = 0;
+  const next = () => {
+    const record = records.subarray(cursor, cursor + RECORD_FIELDS);
+    cursor += RECORD_FIELDS;
+    return record;
+  };
+
+  const windows: BlenderWindow[] = [];
+  for (let w = 0; w < windowCount; w++) {
+    const [x, y, width, height, name, areaCount] = next();
+    const areas: BlenderArea[] = [];
+    for (let a = 0; a < areaCount; a++) {
+      const [type, ax, ay, aWidth, aHeight, regionCount] = next();
+      const regions: BlenderRegion[] = [];
+      for (let r = 0; r < regionCount; r++) {
+        const [rType, rx, ry, rWidth, rHeight, alignment] = next();
+        regions.push({
+          type: strings[rType],
+          x: rx,
+          y: ry,
+          width: rWidth,
+          height: rHeight,
+          alignment: strings[alignment],
+        });
+      }
+      areas.push({
+        type: strings[type],
+        x: ax,
+        y: ay,
+        width: aWidth,
+        height: aHeight,
+        regions,
+      });
+    }
+    windows.push({
+      x,
+      y,
+      width,
+      height,
+      screen: { name: strings[name], areas },
+    });
+  }
+
+  return { seq, windows };
+}
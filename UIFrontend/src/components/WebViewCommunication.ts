@@ -1,4 +1,12 @@
-import type { BlenderLayout } from "../types";
+import type {
+  BlenderLayout,
+  BlenderLayoutDelta,
+  ScriptRunResult,
+} from "../types";
+import {
+  decodeBinaryLayout,
+  LAYOUT_BINARY_PREFIX,
+} from "./BinaryLayoutDecoder";
 
 interface WebView2 {
   postMessage: (message: string) => void;
@@ -7,6 +15,8 @@ interface WebView2 {
     listener: (event: MessageEvent<string>) => void
   ) => void;
 }
+const SCRIPT_RESULT_PREFIX = "SCRIPT_RESULT:";
+
 interface WindowWithWebview extends Window {
   chrome?: { webview?: WebView2 };
 }
@@ -17,9 +27,13 @@ export interface WebViewCommunication {
   reportClickableAreas: () => void;
   sendMessage: (message: string) => void;
   onLayoutReceived: (callback: (layout: BlenderLayout) => void) => void;
+  onScriptResult: (callback: (result: ScriptRunResult) => void) => void;
 }
 class WebViewCommunicationImpl implements WebViewCommunication {
   private layoutCallback: ((layout: BlenderLayout) => void) | null = null;
+  private scriptResultCallback: ((result: ScriptRunResult) => void) | null =
+    null;
+  private layout: BlenderLayout | null = null;
   private reportingInterval: number | null = null;
   private get webview(): WebView2 | undefined {
     return (window as WindowWithWebview).chrome?.webview;
@@ -36,15 +50,67 @@ class WebViewCommunicationImpl implements WebViewCommunication {
   private setupMessageListener(): void {
     this.webview?.addEventListener("message", (event: MessageEvent<string>) => {
       try {
-        const blenderLayout: BlenderLayout = JSON.parse(event.data);
+        if (event.data.startsWith(SCRIPT_RESULT_PREFIX)) {
+          this.scriptResultCallback?.(
+            JSON.parse(event.data.slice(SCRIPT_RESULT_PREFIX.length))
+          );
+          return;
+        }
+
+        const message: BlenderLayout | BlenderLayoutDelta | null =
+          event.data.startsWith(LAYOUT_BINARY_PREFIX)
+            ? decodeBinaryLayout(
+                event.data.slice(LAYOUT_BINARY_PREFIX.length)
+              )
+            : JSON.parse(event.data);
+        if (!message) return;
 
-        this.layoutCallback?.(blenderLayout);
+        const blenderLayout = this.applyLayoutMessage(message);
+
+        if (blenderLayout) this.layoutCallback?.(blenderLayout);
       } catch {
         return;
       }
     });
   }
 
+  private applyLayoutMessage(
+    message: BlenderLayout | BlenderLayoutDelta
+  ): BlenderLayout | null {
+    if (!("delta" in message)) {
+      this.layout = message;
+      return message;
+    }
+
+    if (!this.layout || message.seq !== (this.layout.seq ?? 0) + 1) {
+      this.layout = null;
+      return null;
+    }
+
+    const windows = this.layout.windows.map((window, index) => ({
+      ...window,
+      screen: {
+        ...window.screen,
+        areas: window.screen.areas.slice(0, message.area_counts[index]),
+      },
+    }));
+
+    message.windows.forEach(([index, { name, ...rect }]) => {
+      windows[index] = {
+        ...windows[index],
+        ...rect,
+        screen: { ...windows[index].screen, name },
+      };
+    });
+
+    message.areas.forEach(([windowIndex, areaIndex, area]) => {
+      windows[windowIndex].screen.areas[areaIndex] = area;
+    });
+
+    this.layout = { seq: message.seq, windows };
+    return this.layout;
+  }
+
   startClickableAreasReporting(intervalMs: number = 2000): void {
     this.stopClickableAreasReporting();
     this.reportingInterval = window.setInterval(() => {
@@ -86,6 +152,10 @@ class WebViewCommunicationImpl implements WebViewCommunication {
   onLayoutReceived(callback: (layout: BlenderLayout) => void): void {
     this.layoutCallback = callback;
   }
+
+  onScriptResult(callback: (result: ScriptRunResult) => void): void {
+    this.scriptResultCallback = callback;
+  }
 }
 export const webViewCommunication: WebViewCommunication =
   new WebViewCommunicationImpl();
@@ -205,7 +205,8 @@ const ProductCatalogWindow: React.FC<ScriptCatalogWindowProps> = ({
   const sendScriptToBlender = (
     scriptContent: string,
     script: BlenderScript,
-    params: Record<string, ParameterValue> = {}
+    params: Record<string, ParameterValue> = {},
+    prefix: "SCRIPT_LOAD:" | "SCRIPT_RUN:" = "SCRIPT_LOAD:"
   ) => {
     const scriptData = {
       name: script.name,
@@ -213,7 +214,7 @@ const ProductCatalogWindow: React.FC<ScriptCatalogWindowProps> = ({
       timestamp: Date.now(),
       parameters: params,
     };
-    const ipcMessage = `SCRIPT_LOAD:${JSON.stringify(scriptData)}`;
+    const ipcMessage = `${prefix}${JSON.stringify(scriptData)}`;
 
     webViewCommunication.sendMessage(ipcMessage);
   };
@@ -243,6 +244,19 @@ const ProductCatalogWindow: React.FC<ScriptCatalogWindowProps> = ({
     }
   };
 
+  const handleRunInBlender = () => {
+    if (selectedScript) {
+      sendScriptToBlender(
+        scriptContent,
+        selectedScript,
+        scriptParameters,
+        "SCRIPT_RUN:"
+      );
+      setIsParameterWindowOpen(false);
+      onClose();
+    }
+  };
+
   const handleCloseParameterWindow = () => {
     setIsParameterWindowOpen(false);
     setSelectedScript(null);
@@ -330,6 +344,12 @@ const ProductCatalogWindow: React.FC<ScriptCatalogWindowProps> = ({
             >
               Send to Blender
             </button>
+            <button
+              onClick={handleRunInBlender}
+              className="parameter-send-btn"
+            >
+              Run in Blender
+            </button>
           </div>
         </div>
       </div>
@@ -4,7 +4,12 @@ import ReactDOM from "react-dom/client";
 import ProductCatalogWindow from "./components/product-catalog/ProductCatalogWindow";
 import MixboxWindow from "./components/mixbox/MixboxWindow";
 import { windowManager } from "./components/WindowManager";
-import type { DockInfo, BlenderLayout, LayoutData } from "./types";
+import type {
+  DockInfo,
+  BlenderLayout,
+  LayoutData,
+  ScriptRunResult,
+} from "./types";
 import { webViewCommunication } from "./components/WebViewCommunication";
 import { anchorZonesManager } from "./components/AnchorZonesManager";
 import { dragDropManager } from "./components/DragDropManager";
@@ -59,6 +64,32 @@ webViewCommunication.onLayoutReceived((layout: BlenderLayout) => {
   blenderLayout = layout;
   updateAnchorZones();
 });
+// The catalog closes once a run is sent, so results are logged here
+webViewCommunication.onScriptResult(logScriptResult);
+
+function logScriptResult(result: ScriptRunResult): void {
+  const tracing = result.memory_traced ? " (includes memory tracing)" : "";
+  const memory =
+    result.peak_memory === null
+      ? ""
+      : `, peak ${Math.round(result.peak_memory / 1024)} KB`;
+  const summary = `${result.name}: ${result.status} in ${(
+    result.wall_time * 1000
+  ).toFixed(1)} ms${tracing}${memory}`;
+
+  if (result.status === "error") {
+    console.error(summary, result.error);
+  } else {
+    console.info(summary);
+  }
+  if (result.stdout) {
+    console.log(
+      result.stdout_truncated
+        ? `${result.stdout}\n[output truncated]`
+        : result.stdout
+    );
+  }
+}
 
 function updateAnchorZones(): void {
   const layoutWindow = blenderLayout?.windows?.[0];
@@ -17,25 +17,68 @@ export interface DockInfo {
   areaIndex: number;
 }
 
+export interface BlenderRegion {
+  type: string;
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+  alignment: string;
+}
+
 export interface BlenderArea {
+  type: string;
   x: number;
   y: number;
   width: number;
   height: number;
+  regions: BlenderRegion[];
 }
 
 export interface BlenderWindow {
+  x: number;
+  y: number;
   width: number;
   height: number;
   screen: {
+    name: string;
     areas: BlenderArea[];
   };
 }
 
 export interface BlenderLayout {
+  seq?: number;
   windows: BlenderWindow[];
 }
 
+export interface BlenderWindowHeader {
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+  name: string;
+}
+
+export interface BlenderLayoutDelta {
+  delta: true;
+  seq: number;
+  windows: [number, BlenderWindowHeader][];
+  areas: [number, number, BlenderArea][];
+  area_counts: number[];
+}
+
+export interface ScriptRunResult {
+  name: string;
+  status: "ok" | "error";
+  wall_time: number;
+  peak_memory: number | null;
+  memory_traced: boolean;
+  stdout: string;
+  stdout_truncated: boolean;
+  error: string | null;
+  timestamp: number | null;
+}
+
 export interface LayoutData {
   window: BlenderWindow;
   areas: BlenderArea[];
@@ -7,7 +7,9 @@
 #include <array>
 #include <atomic>
 #include <bit>
+#include <cstdint>
 #include <cstdio>
+#include <cstring>
 #include <filesystem>
 #include <format>
 #include <iomanip>
@@ -17,6 +19,7 @@
 #include <span>
 #include <sstream>
 #include <string>
+#include <string_view>
 #include <tchar.h>
 #include <thread>
 #include <vector>
@@ -24,13 +27,20 @@
 const wchar_t *const SCRIPT_PIPE_NAME = L"\\\\.\\pipe\\BlenderScriptPipe";
 const wchar_t *const LAYOUT_PIPE_NAME = L"\\\\.\\pipe\\BlenderWebViewPipe";
 
-constexpr int LAYOUT_PREFIX_LENGTH = 7;
+constexpr std::string_view LAYOUT_PREFIX = "LAYOUT:";
+constexpr std::string_view LAYOUT_DELTA_PREFIX = "LAYOUT_DELTA:";
+constexpr uint8_t LAYOUT_BINARY_VERSION = 1;
+constexpr size_t LAYOUT_BINARY_HEADER_SIZE = 32;
+constexpr size_t LAYOUT_BINARY_RECT_OFFSET = 4;
+constexpr std::wstring_view LAYOUT_BINARY_WEB_PREFIX = L"LAYOUT_BIN:";
+constexpr std::string_view SCRIPT_RESULT_PREFIX = "SCRIPT_RESULT:";
 
 constexpr int DEFAULT_WINDOW_X = 100;
 constexpr int DEFAULT_WINDOW_Y = 100;
 constexpr int DEFAULT_WINDOW_WIDTH = 800;
 constexpr int DEFAULT_WINDOW_HEIGHT = 600;
 constexpr int TIMER_INTERVAL_MS = 50;
+constexpr DWORD SCRIPT_PIPE_WAIT_MS = 1000;
 
 constexpr int SSCANF_EXPECTED_ARGS = 4;
 constexpr int PIPE_INSTANCE_COUNT = 1;
@@ -71,19 +81,43 @@ static auto Utf8ToWide(const std::string &utf8) -> std::wstring {
   return result;
 }
 
+static auto WriteAll(HANDLE hPipe, const char *data, size_t length) -> bool {
+  size_t total = 0;
+  while (total < length) {
+    DWORD bytesWritten = 0;
+    if (WriteFile(hPipe, data + total, (DWORD)(length - total), &bytesWritten,
+                  nullptr) == 0) {
+      return false;
+    }
+    total += bytesWritten;
+  }
+  return true;
+}
+
 void sendScriptToBlender(const std::wstring &scriptMessage) {
   std::string narrowMessage = WideToUtf8(scriptMessage);
-  if (narrowMessage.empty()) {
+  if (narrowMessage.empty() || narrowMessage.size() > MAX_FRAME_SIZE) {
     return;
   }
 
   HANDLE hPipe = CreateFileW(SCRIPT_PIPE_NAME, GENERIC_WRITE, 0, nullptr,
                              OPEN_EXISTING, 0, nullptr);
 
+  // Every Blender pipe instance may be busy reading another script; wait for
+  // one to free up instead of dropping the message.
+  if (hPipe == INVALID_HANDLE_VALUE && GetLastError() == ERROR_PIPE_BUSY &&
+      WaitNamedPipeW(SCRIPT_PIPE_NAME, SCRIPT_PIPE_WAIT_MS) != 0) {
+    hPipe = CreateFileW(SCRIPT_PIPE_NAME, GENERIC_WRITE, 0, nullptr,
+                        OPEN_EXISTING, 0, nullptr);
+  }
+
   if (hPipe != INVALID_HANDLE_VALUE) {
-    DWORD bytesWritten = 0;
-    WriteFile(hPipe, narrowMessage.c_str(), (DWORD)narrowMessage.length(),
-              &bytesWritten, nullptr);
+    auto length = static_cast<uint32_t>(narrowMessage.size());
+    std::array<char, FRAME_HEADER_SIZE> header{};
+    std::memcpy(header.data(), &length, FRAME_HEADER_SIZE);
+    if (WriteAll(hPipe, header.data(), header.size())) {
+      WriteAll(hPipe, narrowMessage.data(), narrowMessage.size());
+    }
     CloseHandle(hPipe);
   }
 }
@@ -170,9 +204,30 @@ static auto GetWebBrowser() -> WebView2Browser & {
   return instance;
 }
 
+// Frames can arrive faster than the UI thread drains them, so each message
+// owns its string until HandleLayoutUpdateMessage releases it.
+static auto PostLayoutUpdate(std::wstring message) -> void {
+  auto layoutMessage = std::make_unique<std::wstring>(std::move(message));
+  if (PostMessage(GetMainWindow(), WM_LAYOUT_UPDATE, 0,
+                  std::bit_cast<LPARAM>(layoutMessage.get())) != 0) {
+    layoutMessage.release();
+  }
+}
+
+static auto LayoutPrefixLength(std::string_view message) -> size_t {
+  if (message.starts_with(LAYOUT_DELTA_PREFIX)) {
+    return LAYOUT_DELTA_PREFIX.size();
+  }
+  if (message.starts_with(LAYOUT_PREFIX)) {
+    return LAYOUT_PREFIX.size();
+  }
+  return 0;
+}
+
 static auto ProcessLayoutMessage(std::span<const char> buffer) -> void {
-  if (buffer.size() < LAYOUT_PREFIX_LENGTH ||
-      strncmp(buffer.data(), "LAYOUT:", LAYOUT_PREFIX_LENGTH) != 0) {
+  size_t prefixLength =
+      LayoutPrefixLength(std::string_view(buffer.data(), buffer.size()));
+  if (prefixLength == 0) {
     return;
   }
 
@@ -181,14 +236,14 @@ static auto ProcessLayoutMessage(std::span<const char> buffer) -> void {
   int blenderWidth = 0;
   int blenderHeight = 0;
   std::string bufferStr(buffer.data(), buffer.size());
-  size_t pipePos = bufferStr.find('|', LAYOUT_PREFIX_LENGTH);
+  size_t pipePos = bufferStr.find('|', prefixLength);
 
   if (pipePos == std::string::npos) {
     return;
   }
 
   std::string layoutData =
-      bufferStr.substr(LAYOUT_PREFIX_LENGTH, pipePos - LAYOUT_PREFIX_LENGTH);
+      bufferStr.substr(prefixLength, pipePos - prefixLength);
   std::istringstream iss(layoutData);
   std::string token;
   std::vector<int> values;
@@ -211,41 +266,127 @@ static auto ProcessLayoutMessage(std::span<const char> buffer) -> void {
   blenderWidth = values[2];
   blenderHeight = values[3];
 
+  // Python only sends a layout when something changed, and deltas must reach
+  // the frontend in order, so forward every message even if the overlay
+  // itself did not move.
   HWND blenderWindow = FindBlenderWindow();
-  if (!UpdateOverlayPosition(GetMainWindow(), blenderWindow, blenderX, blenderY,
-                             blenderWidth, blenderHeight)) {
-    return;
-  }
+  UpdateOverlayPosition(GetMainWindow(), blenderWindow, blenderX, blenderY,
+                        blenderWidth, blenderHeight);
 
   size_t jsonStart = pipePos + 1;
   std::string jsonData = bufferStr.substr(jsonStart);
   auto wideJson = Utf8ToWide(jsonData);
 
-  thread_local std::wstring currentLayoutMessage;
-  currentLayoutMessage = wideJson;
-  PostMessage(GetMainWindow(), WM_LAYOUT_UPDATE, 0,
-              static_cast<LPARAM>(
-                  reinterpret_cast<intptr_t>(currentLayoutMessage.c_str())));
+  PostLayoutUpdate(std::move(wideJson));
 }
 
-static auto ProcessPipeData(HANDLE hPipe) -> void {
-  std::array<char, BUFFER_SIZE> buffer{};
-  DWORD bytesRead = 0;
-  bool success = ReadFile(hPipe, buffer.data(), buffer.size() - 1, &bytesRead,
-                          nullptr) != 0;
+static auto AppendBase64(std::wstring &output, std::span<const char> data)
+    -> void {
+  constexpr std::wstring_view ALPHABET =
+      L"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/";
+  output.reserve(output.size() + ((data.size() + 2) / 3) * 4);
+
+  size_t index = 0;
+  for (; index + 2 < data.size(); index += 3) {
+    uint32_t triple = (static_cast<uint8_t>(data[index]) << 16) |
+                      (static_cast<uint8_t>(data[index + 1]) << 8) |
+                      static_cast<uint8_t>(data[index + 2]);
+    output += ALPHABET[(triple >> 18) & 0x3F];
+    output += ALPHABET[(triple >> 12) & 0x3F];
+    output += ALPHABET[(triple >> 6) & 0x3F];
+    output += ALPHABET[triple & 0x3F];
+  }
+
+  size_t remaining = data.size() - index;
+  if (remaining == 0) {
+    return;
+  }
+  uint32_t triple = static_cast<uint8_t>(data[index]) << 16;
+  if (remaining == 2) {
+    triple |= static_cast<uint8_t>(data[index + 1]) << 8;
+  }
+  output += ALPHABET[(triple >> 18) & 0x3F];
+  output += ALPHABET[(triple >> 12) & 0x3F];
+  output += remaining == 2 ? ALPHABET[(triple >> 6) & 0x3F] : L'=';
+  output += L'=';
+}
 
-  if (success && bytesRead > 0) {
-    buffer.at(bytesRead) = '\0';
-    ProcessLayoutMessage(std::span<const char>{buffer.data(), bytesRead});
+// Binary layouts (see layout_codec.py) carry the window rect at a fixed
+// offset, so only the header is read here; the frontend decodes the rest.
+static auto ProcessBinaryLayoutMessage(std::span<const char> buffer) -> void {
+  if (buffer.size() < LAYOUT_BINARY_HEADER_SIZE) {
+    return;
+  }
+
+  std::array<int32_t, SSCANF_EXPECTED_ARGS> rect{};
+  std::memcpy(rect.data(), buffer.data() + LAYOUT_BINARY_RECT_OFFSET,
+              sizeof(rect));
+
+  HWND blenderWindow = FindBlenderWindow();
+  UpdateOverlayPosition(GetMainWindow(), blenderWindow, rect[0], rect[1],
+                        rect[2], rect[3]);
+
+  std::wstring message(LAYOUT_BINARY_WEB_PREFIX);
+  AppendBase64(message, buffer);
+  PostLayoutUpdate(std::move(message));
+}
+
+static auto ProcessFrame(std::span<const char> frame) -> void {
+  std::string_view message(frame.data(), frame.size());
+  if (!frame.empty() &&
+      static_cast<uint8_t>(frame[0]) == LAYOUT_BINARY_VERSION) {
+    ProcessBinaryLayoutMessage(frame);
+  } else if (message.starts_with(SCRIPT_RESULT_PREFIX)) {
+    // Script run results are forwarded with their prefix for the frontend.
+    PostLayoutUpdate(Utf8ToWide(std::string(message)));
+  } else {
+    ProcessLayoutMessage(frame);
+  }
+}
+
+static auto ReadExact(HANDLE hPipe, char *destination, DWORD length) -> bool {
+  DWORD total = 0;
+  while (total < length) {
+    DWORD bytesRead = 0;
+    if (ReadFile(hPipe, destination + total, length - total, &bytesRead,
+                 nullptr) == 0 ||
+        bytesRead == 0) {
+      return false;
+    }
+    total += bytesRead;
+  }
+  return true;
+}
+
+static auto ReadFrame(HANDLE hPipe, std::vector<char> &frame) -> bool {
+  std::array<char, FRAME_HEADER_SIZE> header{};
+  if (!ReadExact(hPipe, header.data(), FRAME_HEADER_SIZE)) {
+    return false;
+  }
+
+  uint32_t length = 0;
+  std::memcpy(&length, header.data(), FRAME_HEADER_SIZE);
+  if (length > MAX_FRAME_SIZE) {
+    return false;
+  }
+
+  frame.resize(length);
+  return ReadExact(hPipe, frame.data(), length);
+}
+
+static auto ProcessPipeData(HANDLE hPipe) -> void {
+  std::vector<char> frame;
+  frame.reserve(BUFFER_SIZE);
+  while (ReadFrame(hPipe, frame)) {
+    ProcessFrame(std::span<const char>{frame.data(), frame.size()});
   }
 }
 
 static auto CreateAndConnectPipe() -> HANDLE {
-  HANDLE hPipe =
-      CreateNamedPipeW(LAYOUT_PIPE_NAME, PIPE_ACCESS_INBOUND,
-                       PIPE_TYPE_MESSAGE | PIPE_READMODE_MESSAGE | PIPE_WAIT,
-                       PIPE_INSTANCE_COUNT, BUFFER_SIZE, BUFFER_SIZE,
-                       EXIT_SUCCESS_CODE, nullptr);
+  HANDLE hPipe = CreateNamedPipeW(
+      LAYOUT_PIPE_NAME, PIPE_ACCESS_INBOUND,
+      PIPE_TYPE_BYTE | PIPE_READMODE_BYTE | PIPE_WAIT, PIPE_INSTANCE_COUNT,
+      BUFFER_SIZE, BUFFER_SIZE, EXIT_SUCCESS_CODE, nullptr);
 
   if (hPipe == INVALID_HANDLE_VALUE) {
     return INVALID_HANDLE_VALUE;
@@ -262,6 +403,8 @@ static auto CreateAndConnectPipe() -> HANDLE {
   return hPipe;
 }
 
+// One client connection carries a stream of length-prefixed frames; the pipe
+// is only recreated once Blender disconnects or sends a malformed frame.
 void handleIPC(const std::stop_token &stopToken) {
   while (!stopToken.stop_requested()) {
     HANDLE hPipe = CreateAndConnectPipe();
@@ -411,14 +554,17 @@ static auto HandleTimerMessage(HWND hWnd, WPARAM wParam) -> void {
 }
 
 static auto HandleLayoutUpdateMessage(LPARAM lParam) -> void {
-  if (GetWebBrowser().webviewController) {
-    wil::com_ptr<ICoreWebView2> webview;
-    HRESULT hResult =
-        GetWebBrowser().webviewController->get_CoreWebView2(&webview);
-    if (SUCCEEDED(hResult) && webview) {
-      const auto *messagePtr = std::bit_cast<const wchar_t *>(lParam);
-      webview->PostWebMessageAsString(messagePtr);
-    }
+  std::unique_ptr<std::wstring> layoutMessage(
+      std::bit_cast<std::wstring *>(lParam));
+  if (!layoutMessage || !GetWebBrowser().webviewController) {
+    return;
+  }
+
+  wil::com_ptr<ICoreWebView2> webview;
+  HRESULT hResult =
+      GetWebBrowser().webviewController->get_CoreWebView2(&webview);
+  if (SUCCEEDED(hResult) && webview) {
+    webview->PostWebMessageAsString(layoutMessage->c_str());
   }
 }
 
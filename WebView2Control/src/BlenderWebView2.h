@@ -5,6 +5,8 @@
 #include <string>
 
 constexpr DWORD BUFFER_SIZE = 8192;
+constexpr DWORD FRAME_HEADER_SIZE = 4;
+constexpr DWORD MAX_FRAME_SIZE = 64 * 1024 * 1024;
 constexpr UINT WM_LAYOUT_UPDATE = WM_USER + 1;
 constexpr UINT POSITION_TIMER_ID = 1;
 
@@ -101,7 +101,8 @@ auto WebView2Browser::OnWebMessageReceived(
   LPWSTR pwStr = nullptr;
   if (SUCCEEDED(args->TryGetWebMessageAsString(&pwStr))) {
     std::wstring message = pwStr;
-    if (message.starts_with(L"SCRIPT_LOAD:")) {
+    if (message.starts_with(L"SCRIPT_LOAD:") ||
+        message.starts_with(L"SCRIPT_RUN:")) {
       thread_local std::wstring currentScriptMessage;
       currentScriptMessage = message;
       ::PostMessage(hWndParent_, WM_SCRIPT_MESSAGE, 0,
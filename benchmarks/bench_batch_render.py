@@ -0,0 +1,123 @@
+"""Runs batch_render's worker pool against a fake Blender executable.
+
+Uses ``fake_blender.py`` as the worker, so the scheduling, output parsing and
+thread tuning can be exercised without Blender. Renders a set of camera jobs
+with 1, 2 and 4 workers, checks that every output was reported and written,
+shows that a failing worker is reported without stopping the others, and
+replays an interrupted animation render through the resume manifest.
+
+Run from the repo root: python benchmarks/bench_batch_render.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+batch_render = catalog_scripts.load("batch_render")
+
+FAKE_BLENDER = [
+    sys.executable,
+    os.path.join(os.path.dirname(__file__), "fake_blender.py"),
+]
+CAMERAS = 8
+WORKER_COUNTS = (1, 2, 4)
+
+
+def make_jobs(directory, cameras):
+    return [
+        batch_render.RenderJob(camera, os.path.join(directory, f"{camera}_"), 1)
+        for camera in cameras
+    ]
+
+
+def main():
+    os.environ.setdefault("FAKE_BLENDER_SECONDS", "0.2")
+    cameras = [f"Camera_{index}" for index in range(CAMERAS)]
+
+    for workers in WORKER_COUNTS:
+        with tempfile.TemporaryDirectory() as directory:
+            events = []
+            scheduler = batch_render.RenderScheduler(
+                FAKE_BLENDER,
+                "snapshot.blend",
+                "Scene",
+                workers,
+                threads=batch_render.threads_per_worker(workers, cpu_count=64),
+                on_event=lambda kind, job, detail: events.append(kind),
+            )
+            start = time.perf_counter()
+            jobs = scheduler.run(make_jobs(directory, cameras))
+            elapsed = time.perf_counter() - start
+
+            outputs = [path for job in jobs for path in job.outputs]
+            assert all(job.ok for job in jobs)
+            assert len(outputs) == CAMERAS and all(map(os.path.isfile, outputs))
+            print(
+                f"{workers} workers x {scheduler.threads:2d} threads: "
+                f"{elapsed:5.2f}s for {CAMERAS} cameras, {len(events)} events"
+            )
+
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = make_jobs(directory, ["Camera_0", "fail", "Camera_1"])
+        jobs.append(
+            batch_render.RenderJob("Camera_2", os.path.join(directory, "anim_"), 1, 4)
+        )
+        batch_render.RenderScheduler(FAKE_BLENDER, "snapshot.blend", "Scene").run(jobs)
+        for job in jobs:
+            print(
+                f"  {job.camera}: returncode {job.returncode}, {len(job.outputs)} outputs"
+            )
+        assert [job.ok for job in jobs] == [True, False, True, True]
+        assert len(jobs[-1].outputs) == 4
+
+    with tempfile.TemporaryDirectory() as directory:
+        manifest_path = os.path.join(directory, batch_render.MANIFEST_NAME)
+
+        def pending_jobs():
+            manifest = batch_render.RenderManifest(manifest_path)
+            jobs = [
+                batch_render.RenderJob(
+                    camera, os.path.join(directory, f"{camera}_"), *chunk
+                )
+                for camera in cameras[:4]
+                for chunk in batch_render.frame_chunks(1, 24, 6)
+            ]
+            pending = [job for job in jobs if not manifest.is_complete(job, ".png")]
+            return manifest, jobs, pending
+
+        def render(manifest, jobs):
+            def record(kind, job, detail):
+                if kind == "finished":
+                    manifest.record(job, ".png")
+
+            scheduler = batch_render.RenderScheduler(
+                FAKE_BLENDER, "snapshot.blend", "Scene", 4, on_event=record
+            )
+            start = time.perf_counter()
+            scheduler.run(jobs)
+            return time.perf_counter() - start
+
+        os.environ["FAKE_BLENDER_SECONDS"] = "0.02"
+        manifest, jobs, pending = pending_jobs()
+        first = render(manifest, pending)
+        os.remove(jobs[5].expected_outputs(".png")[2])
+        with open(jobs[9].expected_outputs(".png")[0], "ab") as file:
+            file.write(b"truncated")
+
+        manifest, jobs, pending = pending_jobs()
+        assert [job.key for job in pending] == [jobs[5].key, jobs[9].key]
+        resumed = render(manifest, pending)
+        assert not pending_jobs()[2]
+        print(
+            f"resume: {len(jobs)} chunk jobs in {first:.2f}s, "
+            f"rerun {len(pending)} damaged chunks in {resumed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
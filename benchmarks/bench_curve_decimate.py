@@ -0,0 +1,140 @@
+"""Checks and times curve_optimizer's vectorized keyframe reduction.
+
+Compares ``decimate_keys`` with a plain recursive Ramer-Douglas-Peucker on
+small random curves (up to SEGMENT_KEYS keys, where both must agree exactly;
+longer curves are only checked against the error bound), then times it on
+mocap-like curves (smooth motion plus sensor noise, one key per frame) of up
+to 1M keys and reports how many keys are kept and the resulting max error.
+Finally reduces a batch of mocap-like
+actions with ``reduce_curves`` in this process and in the process pool the
+batch mode uses, and checks both agree with reducing each curve on its own.
+
+Run from the repo root: python benchmarks/bench_curve_decimate.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+curve_optimizer = catalog_scripts.load("curve_optimizer")
+
+TOLERANCE = 0.001
+CHECK_SIZES = (3, 10, 200, 1024, 5000)
+TIMING_SIZES = (1_000, 100_000, 1_000_000)
+BATCH_ACTIONS = 100
+BATCH_CURVES = 30
+BATCH_KEYS = 1_000
+
+
+def recursive_rdp(times, values, tolerance):
+    keep = np.zeros(len(times), dtype=bool)
+    keep[[0, -1]] = True
+
+    def split(start, end):
+        if end - start < 2:
+            return
+        t0, t1, v0, v1 = times[start], times[end], values[start], values[end]
+        slope = (v1 - v0) / (t1 - t0) if t1 != t0 else 0.0
+        inner = slice(start + 1, end)
+        error = np.abs(values[inner] - (v0 + (times[inner] - t0) * slope))
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            keep[start + 1 + worst] = True
+            split(start, start + 1 + worst)
+            split(start + 1 + worst, end)
+
+    split(0, len(times) - 1)
+    return keep
+
+
+def mocap_curve(rng, count):
+    times = np.arange(count, dtype=np.float64)
+    phase = times / 120.0
+    values = np.sin(phase) + 0.3 * np.sin(phase * 3.7) + rng.normal(0, 0.0002, count)
+    return times, values
+
+
+def main():
+    rng = np.random.default_rng(0)
+    sys.setrecursionlimit(10_000)
+    for count in CHECK_SIZES:
+        for label, values in (
+            ("random", rng.normal(0, 1, count)),
+            ("steps", np.repeat(rng.integers(0, 3, count // 2 + 1), 2)[:count] * 1.0),
+        ):
+            times = np.sort(rng.choice(count * 4, count, replace=False)).astype(float)
+            expected = recursive_rdp(times, values, 0.1)
+            actual = curve_optimizer.decimate_keys(times, values, 0.1)
+            if count <= curve_optimizer.SEGMENT_KEYS:
+                assert np.array_equal(actual, expected), (label, count)
+            assert curve_optimizer.max_error(times, values, actual) <= 0.1
+            print(f"{label:>7} {count:5d} keys: ok, {actual.sum()} kept")
+
+    # Segments spanning removed keys become LINEAR, the others keep their mode
+    bezier = np.full(6, 2, dtype=np.int32)
+    keep = np.array([True, True, False, False, True, True])
+    written = curve_optimizer.decimated_interpolation(bezier, keep)
+    assert written.tolist() == [2, curve_optimizer.INTERPOLATION_LINEAR, 2, 2]
+    print("interpolation of decimated segments: ok")
+
+    for count in TIMING_SIZES:
+        times, values = mocap_curve(rng, count)
+        start = time.perf_counter()
+        keep = curve_optimizer.decimate_keys(times, values, TOLERANCE)
+        elapsed = time.perf_counter() - start
+        error = curve_optimizer.max_error(times, values, keep)
+        assert error <= TOLERANCE
+        print(
+            f"{count:8d} keys: {elapsed * 1e3:8.1f} ms, kept {keep.sum()} "
+            f"({keep.mean():.1%}), max error {error:.6f}"
+        )
+
+    actions = []
+    for _ in range(BATCH_ACTIONS):
+        co = np.concatenate(
+            [
+                np.stack(mocap_curve(rng, BATCH_KEYS), axis=1)
+                for _ in range(BATCH_CURVES)
+            ]
+        ).astype(np.float32)
+        actions.append((co, np.arange(BATCH_CURVES + 1) * BATCH_KEYS))
+
+    start = time.perf_counter()
+    inline = [
+        curve_optimizer.reduce_curves(co, offsets, TOLERANCE) for co, offsets in actions
+    ]
+    elapsed = time.perf_counter() - start
+    for (co, offsets), (keep, errors) in zip(actions[:5], inline):
+        for i, (begin, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+            times, values = co[begin:end, 0], co[begin:end, 1]
+            expected = curve_optimizer.decimate_keys(times, values, TOLERANCE)
+            assert np.array_equal(keep[begin:end], expected)
+            error = curve_optimizer.max_error(times, values, expected)
+            assert np.isclose(errors[i], error)
+    print(f"batch of {len(actions)} actions inline: {elapsed * 1e3:8.1f} ms")
+
+    processes = os.cpu_count() or 1
+    start = time.perf_counter()
+    pool, reduce = curve_optimizer.worker_pool(processes)
+    with pool:
+        futures = [
+            pool.submit(reduce, co, offsets, TOLERANCE) for co, offsets in actions
+        ]
+        pooled = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    for (keep, errors), (pool_keep, pool_errors) in zip(inline, pooled):
+        assert np.array_equal(keep, pool_keep) and np.array_equal(errors, pool_errors)
+    print(
+        f"batch of {len(actions)} actions in {processes} processes: "
+        f"{elapsed * 1e3:8.1f} ms (including pool start-up)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Times export_manager's OBJ, STL and PLY writers on 200 synthetic objects.
+
+Each object is a subdivided grid with UVs and vertex colours, prepared once
+the way export_mesh leaves it after evaluating an object. The writers run
+serially, as batch_export_manager runs them, and then on thread pools of
+increasing size to show why it does not use one: the OBJ writer's string
+formatting holds the GIL. The files are sanity checked. Finally
+replays an incremental export through ExportIndex with a few objects
+changed, to show the cost of hashing against the writes it saves, and
+checks that pruning from another source file leaves those files alone.
+
+Run from the repo root: python benchmarks/bench_export_writers.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+export_manager = catalog_scripts.load("export_manager")
+
+OBJECTS = 200
+GRID = 48
+WORKER_COUNTS = (1, 2, 4)
+REPEAT = 3
+SOURCE = "bench.blend"
+
+
+def grid_mesh(name, rng):
+    side = GRID + 1
+    x, y = np.meshgrid(np.arange(side), np.arange(side))
+    heights = rng.random(side * side) * 0.1
+    positions = np.column_stack([x.ravel(), y.ravel(), heights]).astype(np.float32)
+
+    corner = (np.arange(GRID)[:, None] * side + np.arange(GRID)).ravel()
+    loop_vertices = np.column_stack(
+        [corner, corner + 1, corner + side + 1, corner + side]
+    ).ravel()
+    loop_count = len(loop_vertices)
+    sizes = np.full(GRID * GRID, 4, dtype=np.int32)
+    starts = np.arange(GRID * GRID, dtype=np.int32) * 4
+    triangles = np.column_stack(
+        [starts, starts + 1, starts + 2, starts, starts + 2, starts + 3]
+    ).reshape(-1, 3)
+    normals = np.tile(np.array([0, 0, 1], dtype=np.float32), (loop_count, 1))
+
+    return export_manager.ExportMesh(
+        name,
+        positions,
+        loop_vertices,
+        normals,
+        starts,
+        sizes,
+        triangles,
+        loop_uvs=positions[loop_vertices, :2] / GRID,
+        loop_colors=rng.random((loop_count, 4)).astype(np.float32),
+        poly_materials=np.zeros(len(sizes), dtype=np.int32),
+        materials=[("Material", (0.8, 0.2, 0.2, 1.0))],
+    )
+
+
+def write_all(meshes, directory, workers):
+    tasks = [
+        (writer, os.path.join(directory, f"{mesh.name}.{fmt}"), mesh)
+        for mesh in meshes
+        for fmt, writer in export_manager.MESH_WRITERS.items()
+    ]
+    start = time.perf_counter()
+    if workers == 0:
+        for writer, path, mesh in tasks:
+            writer(path, mesh)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(*task) for task in tasks]:
+                future.result()
+    return time.perf_counter() - start
+
+
+def check(directory, mesh):
+    stl = os.path.join(directory, f"{mesh.name}.stl")
+    assert os.path.getsize(stl) == 84 + 50 * len(mesh.triangles)
+
+    with open(os.path.join(directory, f"{mesh.name}.ply"), "rb") as file:
+        data = file.read()
+    header, body = data.split(b"end_header\n", 1)
+    vertex_count = int(header.split(b"element vertex ")[1].split(b"\n")[0])
+    vertex_size = 4 * 8 + 4
+    face_bytes = len(mesh.poly_sizes) + 4 * len(mesh.loop_vertices)
+    assert len(body) == vertex_count * vertex_size + face_bytes
+
+    with open(os.path.join(directory, f"{mesh.name}.obj"), encoding="utf-8") as file:
+        faces = sum(line.startswith("f ") for line in file)
+    assert faces == len(mesh.poly_sizes)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    meshes = [grid_mesh(f"Object_{index:03d}", rng) for index in range(OBJECTS)]
+    loops = sum(len(mesh.loop_vertices) for mesh in meshes)
+    print(
+        f"{OBJECTS} objects, {loops} corners, formats {list(export_manager.MESH_WRITERS)}"
+    )
+
+    for workers in (0, *WORKER_COUNTS):
+        # Best of a few runs, so the first configuration is not charged for
+        # warming up the allocator and the file system
+        elapsed = float("inf")
+        for _ in range(REPEAT):
+            with tempfile.TemporaryDirectory() as directory:
+                elapsed = min(elapsed, write_all(meshes, directory, workers))
+                check(directory, meshes[0])
+        label = "serial" if workers == 0 else f"{workers} threads"
+        print(
+            f"{label:>10}: {elapsed:6.2f}s ({elapsed / OBJECTS * 1e3:.1f} ms per object)"
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, export_manager.INDEX_NAME)
+        for run, changed in (("first", OBJECTS), ("rerun", 5)):
+            for mesh in meshes[:changed]:
+                mesh.positions[0, 2] += 1.0
+            index = export_manager.ExportIndex(index_path, SOURCE)
+            start = time.perf_counter()
+            written = skipped = 0
+            saved = 0.0
+            for mesh in meshes:
+                mesh_hash = export_manager.mesh_digest(mesh)
+                for fmt, writer in export_manager.MESH_WRITERS.items():
+                    path = os.path.join(directory, f"{mesh.name}.{fmt}")
+                    digest = export_manager.export_digest(mesh_hash, fmt)
+                    if index.is_current(mesh.name, fmt, digest, path):
+                        skipped += 1
+                        saved += index.seconds(mesh.name, fmt)
+                        continue
+                    seconds = export_manager.timed_write(writer, path, mesh)
+                    index.record(mesh.name, fmt, digest, path, seconds)
+                    written += 1
+            index.save()
+            elapsed = time.perf_counter() - start
+            print(
+                f"incremental {run}: {elapsed:5.2f}s, {written} written, "
+                f"{skipped} skipped, {saved:.2f}s saved"
+            )
+        assert written == 5 * len(export_manager.MESH_WRITERS)
+
+        other = export_manager.ExportIndex(index_path, "other.blend")
+        assert other.prune(set()) == []
+        assert all(
+            os.path.isfile(os.path.join(directory, f"{mesh.name}.{fmt}"))
+            for mesh in meshes
+            for fmt in export_manager.MESH_WRITERS
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Checks and times mesh_cleanup's NumPy grid merge.
+
+First compares ``grid_merge_targets`` with a brute-force O(n^2) reference on
+small random point clouds, including clustered ones where chains of close
+points join into one cluster. Then times it on clouds of up to 5M points
+shaped like a scan mesh with split edges: every vertex duplicated a few times
+with sub-threshold jitter.
+
+Run from the repo root: python benchmarks/bench_grid_merge.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+mesh_cleanup = catalog_scripts.load("mesh_cleanup")
+
+DISTANCE = 0.0001
+CHECK_SIZES = (2, 50, 500, 2000)
+TIMING_SIZES = (100_000, 1_000_000, 5_000_000)
+COPIES = 4
+
+
+def brute_force_targets(coords, distance):
+    count = len(coords)
+    diff = coords[:, None, :] - coords[None, :, :]
+    close = np.einsum("ijk,ijk->ij", diff, diff) <= distance * distance
+
+    targets = np.full(count, -1)
+    for start in range(count):
+        if targets[start] >= 0:
+            continue
+        stack = [start]
+        targets[start] = start
+        while stack:
+            vertex = stack.pop()
+            for other in np.flatnonzero(close[vertex] & (targets < 0)):
+                targets[other] = start
+                stack.append(other)
+    return targets
+
+
+def scan_cloud(rng, count, distance):
+    unique = rng.random((count // COPIES, 3)) * 10.0
+    jitter = rng.uniform(-0.2, 0.2, (len(unique) * COPIES, 3)) * distance
+    return np.repeat(unique, COPIES, axis=0) + jitter
+
+
+def check(rng):
+    for count in CHECK_SIZES:
+        for label, coords, distance in (
+            ("uniform", rng.random((count, 3)), 0.05),
+            ("clustered", rng.random((count, 3)) * 0.2, 0.02),
+            ("integer grid", rng.integers(0, 4, (count, 3)).astype(float), 1.0),
+            ("exact", rng.integers(0, 3, (count, 3)).astype(float), 0.0),
+        ):
+            expected = brute_force_targets(coords, distance)
+            actual = mesh_cleanup.grid_merge_targets(coords, distance)
+            assert np.array_equal(actual, expected), (label, count)
+            merged = np.count_nonzero(actual != np.arange(count))
+            print(f"{label:>12} {count:5d} points: ok, {merged} merged")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    check(rng)
+
+    for count in TIMING_SIZES:
+        coords = scan_cloud(rng, count, DISTANCE).astype(np.float32)
+        start = time.perf_counter()
+        targets = mesh_cleanup.grid_merge_targets(coords, DISTANCE)
+        elapsed = time.perf_counter() - start
+        kept = np.count_nonzero(targets == np.arange(len(targets)))
+        print(
+            f"{count:9d} points: {elapsed * 1e3:8.1f} ms, {kept} kept "
+            f"(expected {count // COPIES})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Times image_resizer's NumPy resampling core on synthetic 4K images.
+
+Covers area-average downscales, bilinear resizes, row banding under a memory
+cap and a small batch spread over a thread pool, the way resize_all_images
+schedules it.
+
+Run from the repo root: python benchmarks/bench_image_resample.py
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+image_resizer = catalog_scripts.load("image_resizer")
+
+SIZE_4K = 4096
+MB = 1024 * 1024
+
+
+def measure(label, function, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:>40}: {best * 1e3:8.1f} ms")
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    source = rng.random((SIZE_4K, SIZE_4K, 4), dtype=np.float32)
+    out = np.empty((1024, 1024, 4), dtype=np.float32)
+    resample = image_resizer.resample
+
+    measure(
+        "4K -> 1K area",
+        lambda: resample(source, 1024, 1024, image_resizer.AREA, out=out),
+    )
+    measure(
+        "4K -> 1K area, 64 MB band cap",
+        lambda: resample(source, 1024, 1024, image_resizer.AREA, 64 * MB, out=out),
+    )
+    measure(
+        "4K -> 1K bilinear",
+        lambda: resample(source, 1024, 1024, image_resizer.BILINEAR, out=out),
+    )
+    measure(
+        "4K -> 3000x1500 area (fractional)",
+        lambda: resample(source, 3000, 1500, image_resizer.AREA, 64 * MB),
+    )
+    half = source[::2, ::2].copy()
+    measure(
+        "2K -> 4K bilinear, 64 MB band cap",
+        lambda: resample(half, SIZE_4K, SIZE_4K, image_resizer.AUTO, 64 * MB),
+        repeat=1,
+    )
+    del half
+
+    batch = [rng.random((2048, 2048, 4), dtype=np.float32) for _ in range(8)]
+    workers = os.cpu_count() or 1
+    for threads in sorted({1, workers}):
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            measure(
+                f"8 x 2K -> 1K, {threads} thread(s)",
+                lambda: list(
+                    pool.map(
+                        lambda pixels: resample(pixels, 1024, 1024, max_bytes=64 * MB),
+                        batch,
+                    )
+                ),
+                repeat=1,
+            )
+
+
+if __name__ == "__main__":
+    main()
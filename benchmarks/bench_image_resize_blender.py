@@ -0,0 +1,104 @@
+"""Compares image_resizer end to end with a plain ``image.scale()``.
+
+``write_pixels`` keeps each image's data-block by calling ``image.scale()``
+to reallocate its buffer before overwriting it, so every resized image is
+also resampled once by Blender on the main thread. This measures that cost
+next to the whole read, resample and write path and next to ``scale()``
+alone, for byte and float images. The noise images are generated ones
+standing in for file images, which take the scale() path; the cost of the
+generated-size reallocation that write_pixels uses for generated images is
+shown as well.
+
+Needs Blender; run from the repo root:
+blender -b --factory-startup --python benchmarks/bench_image_resize_blender.py
+"""
+
+import os
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+image_resizer = catalog_scripts.load("image_resizer")
+
+SIZES = ((2048, 1024), (4096, 1024))
+IMAGE_COUNT = 4
+
+
+def noise_image(name, size, is_float, rng):
+    image = bpy.data.images.new(name, size, size, alpha=True, float_buffer=is_float)
+    pixels = rng.random(size * size * 4, dtype=np.float32)
+    image.pixels.foreach_set(pixels)
+    return image
+
+
+def reallocate_generated(image, size):
+    """What write_pixels does instead of scale() for generated images."""
+    image.generated_width = size
+    image.generated_height = size
+    return image.pixels[0]  # The buffer is rebuilt on first access
+
+
+def measure(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    rng = np.random.default_rng(0)
+
+    for is_float in (False, True):
+        for source, target in SIZES:
+            scaled = [
+                noise_image(f"scale_{i}", source, is_float, rng)
+                for i in range(IMAGE_COUNT)
+            ]
+            resized = [image.copy() for image in scaled]
+            generated = [image.copy() for image in scaled]
+
+            plain = measure(lambda: [image.scale(target, target) for image in scaled])
+            regenerate = measure(
+                lambda: [reallocate_generated(image, target) for image in generated]
+            )
+
+            read = resample = reallocate = write = 0.0
+            for image in resized:
+                start = time.perf_counter()
+                pixels = image_resizer.read_pixels(image)
+                read += time.perf_counter() - start
+                start = time.perf_counter()
+                pixels = image_resizer.resample(pixels, target, target)
+                resample += time.perf_counter() - start
+                # write_pixels, split into its scale() and its pixel transfer
+                start = time.perf_counter()
+                image.scale(target, target)
+                reallocate += time.perf_counter() - start
+                start = time.perf_counter()
+                pixels = image_resizer.match_channels(pixels, image.channels)
+                image.pixels.foreach_set(pixels.ravel())
+                image.update()
+                write += time.perf_counter() - start
+            total = read + resample + reallocate + write
+
+            kind = "float" if is_float else "byte"
+            print(
+                f"{IMAGE_COUNT} x {kind:>5} {source} -> {target}: "
+                f"scale() only {plain * 1e3:8.1f} ms | resizer {total * 1e3:8.1f} ms "
+                f"(read {read * 1e3:.1f}, resample {resample * 1e3:.1f}, "
+                f"scale() {reallocate * 1e3:.1f}, write {write * 1e3:.1f}; "
+                f"scale() is {reallocate / total:.0%}) | "
+                f"generated-size realloc {regenerate * 1e3:.1f} ms"
+            )
+            for image in scaled + resized + generated:
+                bpy.data.images.remove(image)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Pushes large scripts and layouts through the framed Python reader.
+
+Compares the reusable-buffer ``FrameReader`` with the previous approach of
+reading 8 KB chunks into a fresh buffer per message and decoding a copy.
+
+Run from the repo root: python benchmarks/bench_ipc_reader.py
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import ipc_transport  # noqa: E402
+from PythonScript import layout_codec  # noqa: E402
+
+from bench_layout_codec import RECT, make_snapshot  # noqa: E402
+
+MESSAGE_COUNT = 50
+SCRIPT_LOAD_PREFIX = b"SCRIPT_LOAD:"
+
+
+def make_script_message(size):
+    content = ("print('x')\n" * (size // 11 + 1))[:size]
+    data = {"name": "Big Script", "content": content, "parameters": {}}
+    return SCRIPT_LOAD_PREFIX + json.dumps(data).encode("utf-8")
+
+
+def make_layout_message():
+    snapshot = make_snapshot(1, 500, random.Random(0))
+    encoder = layout_codec.LayoutDeltaEncoder()
+    return encoder.encode(RECT, snapshot).encode("utf-8")
+
+
+def framed_reader(read_fd, prefix):
+    reader = ipc_transport.FrameReader(lambda view: os.readv(read_fd, [view]))
+    for _ in range(MESSAGE_COUNT):
+        frame = reader.read_frame()
+        if prefix == SCRIPT_LOAD_PREFIX:
+            ipc_transport.decode_json_frame(frame, prefix)
+        else:
+            separator = frame[:64].tobytes().index(b"|") + 1
+            json.loads(str(frame[separator:], "utf-8"))
+    return reader.capacity
+
+
+def chunked_reader(read_fd, prefix, sizes):
+    for size in sizes:
+        data = bytearray()
+        remaining = size
+        while remaining:
+            chunk = os.read(read_fd, min(8192, remaining))
+            data.extend(chunk)
+            remaining -= len(chunk)
+        text = data.decode("utf-8")
+        json.loads(
+            text[len(prefix) :] if text.startswith("SCRIPT") else text.partition("|")[2]
+        )
+
+
+def run(name, message, prefix):
+    for label, framed in (("chunked 8 KB", False), ("framed reader", True)):
+        read_fd, write_fd = os.pipe()
+        payload = ipc_transport.encode_frame(message) if framed else message
+        result = {}
+
+        def consume():
+            if framed:
+                result["capacity"] = framed_reader(read_fd, prefix)
+            else:
+                chunked_reader(read_fd, prefix, [len(message)] * MESSAGE_COUNT)
+
+        thread = threading.Thread(target=consume)
+        start = time.perf_counter()
+        thread.start()
+        connection = ipc_transport.FdConnection(write_fd)
+        for _ in range(MESSAGE_COUNT):
+            connection.write_all(payload)
+        thread.join()
+        elapsed = time.perf_counter() - start
+        connection.close()
+        os.close(read_fd)
+
+        megabytes = len(message) * MESSAGE_COUNT / 1e6
+        extra = f", buffer {result['capacity'] // 1024} KB" if framed else ""
+        print(
+            f"{name:>14} {label:>13}: {elapsed / MESSAGE_COUNT * 1e3:7.2f} ms/msg, "
+            f"{megabytes / elapsed:7.1f} MB/s{extra}"
+        )
+
+
+def main():
+    run("1 MB script", make_script_message(1024 * 1024), SCRIPT_LOAD_PREFIX)
+    run("500-area", make_layout_message(), b"LAYOUT:")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measures framed transport throughput and latency over local stand-in pipes.
+
+Run from the repo root: python benchmarks/bench_ipc_transport.py
+"""
+
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import ipc_transport  # noqa: E402
+
+FRAME_COUNT = 20000
+PAYLOAD_SIZE = 1024
+STAMP = struct.Struct("<d")
+
+
+def run(name, connection, readinto):
+    latencies = []
+
+    def reader():
+        frame_reader = ipc_transport.FrameReader(readinto)
+        for _ in range(FRAME_COUNT):
+            payload = frame_reader.read_frame()
+            if payload is None:
+                break
+            (sent_at,) = STAMP.unpack_from(payload)
+            latencies.append(time.perf_counter() - sent_at)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+
+    transport = ipc_transport.FramedTransport(lambda: connection)
+    padding = b"x" * (PAYLOAD_SIZE - STAMP.size)
+    start = time.perf_counter()
+    for _ in range(FRAME_COUNT):
+        transport.send(STAMP.pack(time.perf_counter()) + padding)
+    thread.join()
+    elapsed = time.perf_counter() - start
+    transport.close()
+
+    latencies.sort()
+    print(
+        f"{name:>10}: {FRAME_COUNT / elapsed:10.0f} frames/s, "
+        f"p50 {latencies[len(latencies) // 2] * 1e6:7.1f} us, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f} us"
+    )
+
+
+def main():
+    writer, reader = socket.socketpair()
+    run(
+        "socketpair",
+        ipc_transport.SocketConnection(writer),
+        reader.recv_into,
+    )
+    reader.close()
+
+    read_fd, write_fd = os.pipe()
+    run(
+        "os.pipe",
+        ipc_transport.FdConnection(write_fd),
+        lambda view: os.readv(read_fd, [view]),
+    )
+    os.close(read_fd)
+
+
+if __name__ == "__main__":
+    main()
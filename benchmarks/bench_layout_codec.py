@@ -0,0 +1,103 @@
+"""Compares full JSON layout pushes with the delta encoder outside Blender.
+
+Run from the repo root: python benchmarks/bench_layout_codec.py
+"""
+
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import layout_codec  # noqa: E402
+
+RECT = (0, 0, 2560, 1440)
+AREA_TYPES = ("VIEW_3D", "PROPERTIES", "OUTLINER", "TEXT_EDITOR", "NODE_EDITOR")
+REGION_TYPES = ("HEADER", "TOOLS", "UI", "WINDOW")
+
+
+def make_snapshot(window_count, area_count, rng):
+    return tuple(
+        (
+            0,
+            0,
+            2560,
+            1440,
+            f"Screen{w}",
+            tuple(
+                (
+                    rng.choice(AREA_TYPES),
+                    a * 40,
+                    a * 20,
+                    400,
+                    300,
+                    tuple(
+                        (region, a * 40, a * 20 + r * 10, 400, 30, "TOP")
+                        for r, region in enumerate(REGION_TYPES)
+                    ),
+                )
+                for a in range(area_count)
+            ),
+        )
+        for w in range(window_count)
+    )
+
+
+def resize_one_area(snapshot, rng):
+    windows = list(snapshot)
+    window = windows[rng.randrange(len(windows))]
+    areas = list(window[5])
+    index = rng.randrange(len(areas))
+    area = areas[index]
+    areas[index] = area[:3] + (area[3] + rng.randint(1, 10),) + area[4:]
+    windows[windows.index(window)] = window[:5] + (tuple(areas),)
+    return tuple(windows)
+
+
+def main():
+    rng = random.Random(0)
+    snapshot = make_snapshot(3, 35, rng)
+    frames = [snapshot]
+    for _ in range(200):
+        frames.append(resize_one_area(frames[-1], rng))
+
+    def full():
+        for frame in frames:
+            layout = layout_codec.snapshot_to_dict(frame)
+            json.dumps(layout, separators=(",", ":"))
+
+    def delta():
+        encoder = layout_codec.LayoutDeltaEncoder(keyframe_interval=float("inf"))
+        for frame in frames:
+            encoder.encode(RECT, frame)
+
+    def idle():
+        encoder = layout_codec.LayoutDeltaEncoder(keyframe_interval=float("inf"))
+        for _ in frames:
+            encoder.encode(RECT, snapshot)
+
+    encoder = layout_codec.LayoutDeltaEncoder(keyframe_interval=float("inf"))
+    decoder = layout_codec.LayoutDeltaDecoder()
+    full_bytes = delta_bytes = 0
+    for frame in frames:
+        message = encoder.encode(RECT, frame)
+        delta_bytes += len(message)
+        full_bytes += len(
+            json.dumps(layout_codec.snapshot_to_dict(frame), separators=(",", ":"))
+        )
+        _rect, layout = decoder.decode(message)
+        assert layout["windows"] == layout_codec.snapshot_to_dict(frame)["windows"]
+
+    runs = 5
+    for name, func in (("full json", full), ("delta", delta), ("idle", idle)):
+        seconds = min(timeit.repeat(func, number=1, repeat=runs)) / len(frames)
+        print(f"{name:>10}: {seconds * 1e6:8.1f} us/frame")
+    print(
+        f"bytes/frame: full {full_bytes // len(frames)}, delta {delta_bytes // len(frames)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Counts layout pushes per simulated event burst with fake Blender timers.
+
+Run from the repo root: python benchmarks/bench_layout_scheduler.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import layout_scheduler  # noqa: E402
+
+FRAME = 1 / 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTimers:
+    """Minimal stand-in for ``bpy.app.timers`` driven by a simulated frame loop.
+
+    Like Blender it matches functions by identity, so a fresh bound method
+    of an already registered one is not found.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.due = {}
+        self.functions = {}
+
+    def register(self, function, first_interval=0, persistent=False):
+        self.functions[id(function)] = function
+        self.due[id(function)] = self.clock() + first_interval
+
+    def is_registered(self, function):
+        return self.functions.get(id(function)) is function
+
+    def unregister(self, function):
+        if not self.is_registered(function):
+            raise ValueError("Error: function is not registered")
+        del self.functions[id(function)], self.due[id(function)]
+
+    def run_frame(self):
+        now = self.clock()
+        for key, due in list(self.due.items()):
+            if due <= now and key in self.due:
+                interval = self.functions[key]()
+                if interval is None:
+                    self.due.pop(key, None)
+                    self.functions.pop(key, None)
+                else:
+                    self.due[key] = now + interval
+
+
+def simulate(name, bursts, events_per_frame=0, burst_frames=1, probe_changes=False):
+    """Run ``bursts`` bursts of activity separated by one idle second each."""
+    clock = FakeClock()
+    timers = FakeTimers(clock)
+    probe_state = [0]
+    pushes = []
+
+    scheduler = layout_scheduler.LayoutPushScheduler(
+        lambda: pushes.append(clock()),
+        timers,
+        probe=lambda: probe_state[0],
+        clock=clock,
+    )
+    start = clock.now
+    scheduler.start()
+    for _ in range(3):
+        clock.now += FRAME
+        timers.run_frame()
+    pushes.clear()
+    scheduler.notifications = 0
+
+    latencies = []
+    for _ in range(bursts):
+        burst_start = clock.now + FRAME
+        for frame in range(burst_frames + int(1 / FRAME)):
+            clock.now += FRAME
+            if frame < burst_frames:
+                probe_state[0] += probe_changes
+                for _ in range(events_per_frame):
+                    scheduler.notify()
+            timers.run_frame()
+        first_push = next((t for t in pushes if t >= burst_start), None)
+        if first_push is not None:
+            latencies.append(first_push - burst_start)
+
+    # A restart must not leave the previous run's timers behind
+    scheduler.stop()
+    scheduler.start()
+    scheduler.stop()
+    assert not timers.due, timers.due
+
+    worst = f"{max(latencies) * 1000:5.1f} ms" if latencies else "    -"
+    print(
+        f"{name:>20}: {scheduler.notifications:5d} events -> "
+        f"{len(pushes) / max(bursts, 1):5.1f} serializations/burst, "
+        f"worst first-push latency {worst}, "
+        f"{scheduler.probes / (clock.now - start):4.1f} probes/s"
+    )
+
+
+def main():
+    simulate("idle", 10)
+    simulate("depsgraph burst", 10, events_per_frame=50)
+    simulate("sustained edits", 10, events_per_frame=5, burst_frames=30)
+    simulate("window drag (probe)", 10, burst_frames=60, probe_changes=True)
+    print("0.5 s polling thread: 2 serializations/s whether or not anything changed")
+
+
+if __name__ == "__main__":
+    main()
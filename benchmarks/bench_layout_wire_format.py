@@ -0,0 +1,51 @@
+"""Compares JSON and binary layout encoding on a synthetic 100-area layout.
+
+Run from the repo root: python benchmarks/bench_layout_wire_format.py
+"""
+
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import layout_codec  # noqa: E402
+
+from bench_layout_codec import RECT, make_snapshot  # noqa: E402
+
+
+def main():
+    snapshot = make_snapshot(1, 100, random.Random(0))
+
+    def encode_json():
+        layout = layout_codec.snapshot_to_dict(snapshot)
+        x, y, width, height = RECT
+        message = f"LAYOUT:{x},{y},{width},{height}|{json.dumps(layout, separators=(',', ':'))}"
+        return message.encode("utf-8")
+
+    def encode_binary():
+        return layout_codec.encode_binary_layout(RECT, snapshot)
+
+    json_payload = encode_json()
+    binary_payload = encode_binary()
+    json_body = json_payload.split(b"|", 1)[1]
+    assert layout_codec.decode_binary_layout(binary_payload)[1]["windows"] == (
+        json.loads(json_body)["windows"]
+    )
+
+    cases = (
+        ("json encode", encode_json),
+        ("binary encode", encode_binary),
+        ("json decode", lambda: json.loads(json_body)),
+        ("binary decode", lambda: layout_codec.decode_binary_layout(binary_payload)),
+    )
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=200, repeat=5)) / 200
+        print(f"{name:>14}: {seconds * 1e6:8.1f} us")
+    print(f"size: json {len(json_payload)} bytes, binary {len(binary_payload)} bytes")
+
+
+if __name__ == "__main__":
+    main()
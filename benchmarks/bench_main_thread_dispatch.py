@@ -0,0 +1,158 @@
+"""Drains a burst of script messages through fake ``bpy`` timers and windows.
+
+Messages are posted from several threads while a simulated frame loop runs the
+dispatcher's timer, and each handled message looks up the text editor area the
+way ``install_in_blender.handle_script_load_message`` does. Reports frames
+needed, the worst per-tick cost and how many area scans the cache avoided.
+
+Run from the repo root: python benchmarks/bench_main_thread_dispatch.py
+"""
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import main_thread_dispatch  # noqa: E402
+
+FRAME = 1 / 60
+MESSAGE_COUNT = 200
+POSTING_THREADS = 4
+HANDLE_COST = 0.0015
+SCREEN_CHANGE_EVERY = 50
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTimers:
+    """Minimal stand-in for ``bpy.app.timers`` driven by a simulated frame loop.
+
+    Like Blender it matches functions by identity, so a fresh bound method
+    of an already registered one is not found.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.due = {}
+        self.functions = {}
+
+    def register(self, function, first_interval=0, persistent=False):
+        self.functions[id(function)] = function
+        self.due[id(function)] = self.clock() + first_interval
+
+    def is_registered(self, function):
+        return self.functions.get(id(function)) is function
+
+    def unregister(self, function):
+        if not self.is_registered(function):
+            raise ValueError("Error: function is not registered")
+        del self.functions[id(function)], self.due[id(function)]
+
+    def run_frame(self):
+        """Run due timers, re-running zero-interval ones until the frame is spent."""
+        frame_end = self.clock() + FRAME
+        while True:
+            ran = False
+            for key, due in list(self.due.items()):
+                if due <= self.clock() and key in self.due:
+                    ran = True
+                    interval = self.functions[key]()
+                    if interval is None:
+                        self.due.pop(key, None)
+                        self.functions.pop(key, None)
+                    else:
+                        self.due[key] = self.clock() + interval
+            if not ran or self.clock() >= frame_end:
+                break
+        self.clock.now = max(self.clock.now, frame_end)
+
+
+def make_window_manager(windows=3, areas=12):
+    def area(area_type):
+        return SimpleNamespace(type=area_type, spaces=SimpleNamespace(active=None))
+
+    return SimpleNamespace(
+        windows=[
+            SimpleNamespace(
+                screen=SimpleNamespace(
+                    name=f"Screen {w}",
+                    areas=[area("VIEW_3D") for _ in range(areas - 1)]
+                    + [area("TEXT_EDITOR" if w == windows - 1 else "PROPERTIES")],
+                )
+            )
+            for w in range(windows)
+        ]
+    )
+
+
+def main():
+    clock = FakeClock()
+    timers = FakeTimers(clock)
+    window_manager = make_window_manager()
+    cache = main_thread_dispatch.TextEditorCache()
+    per_tick = []
+
+    def handle(message):
+        if message % SCREEN_CHANGE_EVERY == 0:
+            window_manager.windows[0].screen.name = f"Screen {message}"
+        area = cache.find(window_manager)
+        area.spaces.active = message
+        clock.now += HANDLE_COST
+
+    dispatcher = main_thread_dispatch.MainThreadDispatcher(handle, timers, clock=clock)
+    drain = dispatcher.drain
+
+    def counted_drain():
+        count = drain()
+        per_tick.append(count)
+        return count
+
+    dispatcher.drain = counted_drain
+    dispatcher.start()
+
+    posters = [
+        threading.Thread(
+            target=lambda offset: [
+                dispatcher.post(i)
+                for i in range(offset, MESSAGE_COUNT, POSTING_THREADS)
+            ],
+            args=(offset,),
+        )
+        for offset in range(POSTING_THREADS)
+    ]
+    for poster in posters:
+        poster.start()
+    for poster in posters:
+        poster.join()
+
+    frames = 0
+    while len(dispatcher):
+        timers.run_frame()
+        frames += 1
+    dispatcher.stop()
+    dispatcher.start()
+    dispatcher.stop()
+    assert not timers.due, timers.due
+
+    print(
+        f"{dispatcher.handled} messages in {frames} frames, "
+        f"max {max(per_tick)} per tick, "
+        f"worst tick {dispatcher.max_tick_duration * 1000:.1f} ms "
+        f"(budget {dispatcher.budget * 1000:.1f} ms)"
+    )
+    print(
+        f"text editor lookups: {cache.scans} scans, {cache.hits} cached "
+        f"(per-message scan: {MESSAGE_COUNT} scans)"
+    )
+
+
+if __name__ == "__main__":
+    main()
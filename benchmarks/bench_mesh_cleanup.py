@@ -0,0 +1,107 @@
+"""Compares mesh_cleanup's bmesh pipeline with the old edit mode operator chain.
+
+Builds high-poly UV spheres with every edge split, so each mesh is full of
+doubles, and cleans identical copies both ways. A second pass cleans several
+objects that share one mesh to show that shared data is processed once.
+
+Needs Blender; run from the repo root:
+blender -b --factory-startup --python benchmarks/bench_mesh_cleanup.py
+"""
+
+import os
+import sys
+import time
+
+import bmesh
+import bpy
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+mesh_cleanup = catalog_scripts.load("mesh_cleanup")
+
+SPHERE_SEGMENTS = ((64, 32), (256, 128), (512, 256))
+SHARED_USERS = 8
+
+
+def operator_cleanup(obj):
+    """The previous ``cleanup_mesh`` on one object, kept as the baseline."""
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    bpy.ops.mesh.select_all(action="SELECT")
+    bpy.ops.mesh.remove_doubles(threshold=0.0001)
+    bpy.ops.mesh.delete_loose()
+    bpy.ops.mesh.fill_holes(sides=4)
+    bpy.ops.mesh.normals_make_consistent(inside=False)
+    bpy.ops.mesh.select_all(action="SELECT")
+    bpy.ops.mesh.select_interior_faces()
+    bpy.ops.mesh.delete(type="FACE")
+    bpy.ops.mesh.select_all(action="SELECT")
+    bpy.ops.mesh.quads_convert_to_tris(quad_method="BEAUTY", ngon_method="BEAUTY")
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+
+def split_sphere(name, u_segments, v_segments):
+    mesh = bpy.data.meshes.new(name)
+    bm = bmesh.new()
+    bmesh.ops.create_uvsphere(
+        bm, u_segments=u_segments, v_segments=v_segments, radius=1.0
+    )
+    bmesh.ops.split_edges(bm, edges=bm.edges)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+def add_object(name, mesh):
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def select_only(objects):
+    for obj in bpy.context.view_layer.objects:
+        obj.select_set(obj in objects)
+    bpy.context.view_layer.objects.active = objects[0]
+
+
+def measure(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    for u_segments, v_segments in SPHERE_SEGMENTS:
+        source = split_sphere("source", u_segments, v_segments)
+        operator_obj = add_object("operators", source.copy())
+        bmesh_obj = add_object("bmesh", source.copy())
+
+        select_only([operator_obj])
+        operators = measure(lambda: operator_cleanup(operator_obj))
+        select_only([bmesh_obj])
+        bmesh_only = measure(lambda: mesh_cleanup.cleanup_mesh_data(bmesh_obj.data))
+
+        counts = [
+            (len(obj.data.vertices), len(obj.data.polygons))
+            for obj in (operator_obj, bmesh_obj)
+        ]
+        print(
+            f"{u_segments}x{v_segments}: {len(source.vertices):7d} verts in | "
+            f"operators {operators * 1e3:8.1f} ms, bmesh {bmesh_only * 1e3:8.1f} ms "
+            f"({operators / bmesh_only:4.1f}x) | out {counts[0]} vs {counts[1]}"
+        )
+
+    u_segments, v_segments = SPHERE_SEGMENTS[1]
+    shared = split_sphere("shared", u_segments, v_segments)
+    objects = [add_object(f"shared_{i}", shared) for i in range(SHARED_USERS)]
+    select_only(objects)
+    elapsed = measure(mesh_cleanup.cleanup_mesh)
+    print(f"{SHARED_USERS} objects sharing one mesh: {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Compares the AST parameter binder with the old line-scanning injector.
+
+Runs over the catalog scripts in ``UIFrontend/scripts`` and over synthetic
+scripts with long bodies and many parameters. ``cold`` includes parsing the
+template; ``warm`` is a cache hit, which is what every resend of a script
+with new values costs.
+
+Run from the repo root: python benchmarks/bench_parameter_binder.py
+"""
+
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import parameter_binder  # noqa: E402
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), "..", "UIFrontend", "scripts")
+
+
+def line_scan_apply(script_content, parameters):
+    """The previous ``apply_parameters_to_script``, kept as the baseline."""
+    lines = script_content.split("\n")
+    modified_lines = []
+    in_main_function = False
+
+    for line in lines:
+        if "def main():" in line:
+            in_main_function = True
+        elif (
+            in_main_function
+            and line.strip()
+            and not line.startswith(("    ", "\t", "#"))
+        ):
+            in_main_function = False
+
+        modified_line = line
+        if in_main_function:
+            for param_name, param_value in parameters.items():
+                if f"{param_name} =" in line and "=" in line:
+                    indent = line[: len(line) - len(line.lstrip())]
+
+                    if isinstance(param_value, bool):
+                        value_str = "True" if param_value else "False"
+                    elif isinstance(param_value, str):
+                        value_str = f"'{param_value}'"
+                    else:
+                        value_str = str(param_value)
+
+                    modified_line = f"{indent}{param_name} = {value_str}"
+                    break
+
+        modified_lines.append(modified_line)
+
+    return "\n".join(modified_lines)
+
+
+def synthetic_script(param_count, body_lines):
+    lines = ["import bpy", "", "", "def main():"]
+    lines += [f"    param_{i} = {i}" for i in range(param_count)]
+    lines += [
+        f"    value_{i} = param_{i % param_count} * {i}  # filler"
+        for i in range(body_lines)
+    ]
+    lines += ["", "", 'if __name__ == "__main__":', "    main()", ""]
+    return "\n".join(lines)
+
+
+def override_parameters(source):
+    template = parameter_binder.ScriptTemplate(source)
+    return {
+        name: f"it's {name}" if index % 2 else index * 3
+        for index, name in enumerate(template.names)
+    }
+
+
+def measure(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(name, source, parameters, repeat):
+    line_scan = measure(lambda: line_scan_apply(source, parameters), repeat)
+    cold = measure(
+        lambda: parameter_binder.ParameterBinder().bind(source, parameters), repeat
+    )
+    binder = parameter_binder.ParameterBinder()
+    binder.bind(source, parameters)
+    warm = measure(lambda: binder.bind(source, parameters), repeat)
+
+    bound = binder.bind(source, parameters)
+    compile(bound, name, "exec")
+    print(
+        f"{name:>28}: {len(source) // 1024:5d} KB, {len(parameters):3d} params | "
+        f"line scan {line_scan * 1e6:9.1f} us, "
+        f"cold {cold * 1e6:9.1f} us, warm {warm * 1e6:7.1f} us"
+    )
+
+
+def main():
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(SCRIPTS_DIR, "*.py"))):
+        with open(path, encoding="utf-8") as file:
+            corpus.append((os.path.basename(path), file.read()))
+
+    for name, source in corpus:
+        run(name, source, override_parameters(source), 200)
+
+    for param_count, body_lines in ((10, 1_000), (50, 10_000), (100, 20_000)):
+        source = synthetic_script(param_count, body_lines)
+        run(
+            f"synthetic {param_count}x{body_lines}",
+            source,
+            override_parameters(source),
+            5,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Replays a repetitive catalog workflow through the script cache.
+
+An artist re-sends a few catalog scripts with a handful of parameter sets.
+Reports hit rate, per-lookup cost on hits and misses, and how many text
+block rewrites a fake text block would have skipped.
+
+Run from the repo root: python benchmarks/bench_script_cache.py
+"""
+
+import glob
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import parameter_binder, script_cache  # noqa: E402
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), "..", "UIFrontend", "scripts")
+SENDS = 2000
+PARAMETER_SETS = 3
+
+
+class FakeText:
+    def __init__(self):
+        self.body = ""
+
+    def as_string(self):
+        return self.body
+
+
+def main():
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(SCRIPTS_DIR, "*.py"))):
+        with open(path, encoding="utf-8") as file:
+            sources[os.path.basename(path)] = file.read()
+
+    rng = random.Random(1)
+    workflow = [
+        (name, {"target_width": 512 * rng.randrange(1, PARAMETER_SETS + 1)})
+        for name in rng.choices(sorted(sources), k=SENDS)
+    ]
+
+    cache = script_cache.ScriptCache(parameter_binder.ParameterBinder().bind)
+    texts = {}
+    hit_time = miss_time = 0.0
+    for name, parameters in workflow:
+        hits = cache.hits
+        start = time.perf_counter()
+        script = cache.lookup(name, sources[name], parameters)
+        elapsed = time.perf_counter() - start
+        if cache.hits > hits:
+            hit_time += elapsed
+        else:
+            miss_time += elapsed
+
+        text = texts.setdefault(name, FakeText())
+        if cache.is_written(name, script) and text.as_string() == script.source:
+            cache.mark_skipped()
+        else:
+            text.body = script.source
+            cache.mark_written(name, script)
+
+    print(
+        f"{SENDS} sends: {cache.hits} hits ({cache.hits / SENDS:.0%}), "
+        f"{cache.misses} misses, {len(cache)} entries"
+    )
+    print(
+        f"lookup: hit {hit_time / max(cache.hits, 1) * 1e6:.1f} us, "
+        f"miss {miss_time / max(cache.misses, 1) * 1e6:.1f} us"
+    )
+    print(f"text writes: {cache.writes}, skipped {cache.writes_skipped}")
+
+
+if __name__ == "__main__":
+    main()
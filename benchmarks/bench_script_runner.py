@@ -0,0 +1,63 @@
+"""Measures the overhead ``run_script`` adds around a script.
+
+Compares bare ``exec`` with instrumented runs with and without
+``tracemalloc``, on a small allocation-heavy script that prints as it goes.
+
+Run from the repo root: python benchmarks/bench_script_runner.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import script_runner  # noqa: E402
+
+SCRIPT = """
+def main():
+    vertices = [(i * 0.5, i * 0.25, i * 0.125) for i in range(20_000)]
+    total = sum(x + y + z for x, y, z in vertices)
+    for index in range(50):
+        print(f"step {index}")
+    print(f"total {total:.1f}")
+
+
+if __name__ == "__main__":
+    main()
+"""
+REPEAT = 50
+
+
+def measure(function):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = function()
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main():
+    code = compile(SCRIPT, "bench_script", "exec")
+    plain, _ = measure(
+        lambda: exec(code, {"__name__": "__main__", "print": lambda *_: None})
+    )
+    untraced, _ = measure(lambda: script_runner.run_script(code, "bench_script"))
+    traced, result = measure(
+        lambda: script_runner.run_script(code, "bench_script", trace_memory=True)
+    )
+
+    for label, seconds in (
+        ("exec only", plain),
+        ("run, no tracing", untraced),
+        ("run, tracemalloc", traced),
+    ):
+        print(f"{label:>16}: {seconds * 1e3:7.2f} ms")
+    print(
+        f"last result: {result['status']}, "
+        f"peak {result['peak_memory'] / 1024:.0f} KB, "
+        f"{len(result['stdout'].splitlines())} stdout lines"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Bursts hundreds of SCRIPT_LOAD messages at the ingest server over local sockets.
+
+Each client connects, sends one framed message and disconnects, as the C++
+host does. A slow handler stands in for Blender so the queue's overflow
+policy is exercised.
+
+Run from the repo root: python benchmarks/bench_script_server.py
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PythonScript import ipc_transport  # noqa: E402
+from PythonScript import script_server  # noqa: E402
+
+SCRIPT_LOAD_PREFIX = b"SCRIPT_LOAD:"
+CLIENT_COUNT = 400
+SCRIPT_NAMES = 20
+HANDLE_SECONDS = 0.002
+
+
+class AcceptedSocket:
+    """Adapts an accepted socket to the ``readinto``/``close`` connection shape."""
+
+    def __init__(self, sock):
+        self.readinto = sock.recv_into
+        self.close = sock.close
+
+
+class SocketStandIn:
+    """Local listening socket playing the role of the named pipe instances."""
+
+    def __init__(self):
+        self.listener = socket.create_server(("127.0.0.1", 0), backlog=CLIENT_COUNT)
+        self.address = self.listener.getsockname()
+
+    def accept(self):
+        try:
+            connection, _ = self.listener.accept()
+        except OSError:
+            return None
+        return AcceptedSocket(connection)
+
+    def wake(self):
+        socket.create_connection(self.address).close()
+
+
+def send(address, message):
+    with socket.create_connection(address) as client:
+        client.sendall(ipc_transport.encode_frame(message))
+
+
+def run(policy):
+    stand_in = SocketStandIn()
+    handled = []
+
+    def handle(message):
+        time.sleep(HANDLE_SECONDS)
+        handled.append(message["name"])
+
+    server = script_server.ScriptIngestServer(
+        stand_in.accept,
+        lambda frame: ipc_transport.decode_json_frame(frame, SCRIPT_LOAD_PREFIX),
+        handle,
+        wake=stand_in.wake,
+        queue=script_server.BoundedMessageQueue(
+            max_depth=16, policy=policy, key=lambda message: message.get("name")
+        ),
+    )
+    server.start()
+
+    messages = [
+        SCRIPT_LOAD_PREFIX
+        + json.dumps(
+            {"name": f"script_{i % SCRIPT_NAMES}", "content": "x = 1\n" * 200}
+        ).encode("utf-8")
+        for i in range(CLIENT_COUNT)
+    ]
+    start = time.perf_counter()
+    clients = [
+        threading.Thread(target=send, args=(stand_in.address, message))
+        for message in messages
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    queue = server.queue
+    while (
+        queue.accepted + queue.coalesced + queue.rejected < CLIENT_COUNT
+        or len(handled) < queue.accepted - queue.dropped
+    ):
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    connections = server.connections
+    server.stop()
+    stand_in.listener.close()
+
+    print(
+        f"{policy:>8}: {connections} connections in {elapsed * 1e3:6.1f} ms, "
+        f"accepted {queue.accepted}, coalesced {queue.coalesced}, "
+        f"rejected {queue.rejected}, dropped {queue.dropped}, "
+        f"handled {len(handled)}, peak depth {queue.high_water}"
+    )
+
+
+def check_run_requests():
+    """Un-keyed run requests are never dropped; a full queue rejects instead."""
+    queue = script_server.BoundedMessageQueue(
+        max_depth=2, key=lambda message: None if message.get("run") else "load"
+    )
+    assert queue.put({"run": True, "id": 0}) and queue.put({"id": 1})
+    assert queue.put({"run": True, "id": 2}) and queue.dropped == 1
+    assert not queue.put({"run": True, "id": 3})
+    assert not queue.put({"id": 4}) and queue.rejected == 2
+    assert [queue.get(0)["id"], queue.get(0)["id"]] == [0, 2]
+    print("run requests: ok, none dropped, full queue rejects")
+
+
+def check_stop_rewakes():
+    """stop() keeps waking acceptors whose first wake was lost, as a busy pipe
+    refuses a wake connection."""
+    wakes = threading.Semaphore(0)
+    lost = [3]
+
+    def accept():
+        wakes.acquire()
+        return None
+
+    def wake():
+        if lost[0]:
+            lost[0] -= 1
+        else:
+            wakes.release()
+
+    server = script_server.ScriptIngestServer(accept, None, None, wake=wake)
+    server.start()
+    assert server.stop() and not server.running and not server._threads
+    print("stop: ok, all acceptors exited despite 3 lost wakes")
+
+
+def main():
+    check_run_requests()
+    check_stop_rewakes()
+    run(script_server.COALESCE)
+    run(script_server.REJECT)
+
+
+if __name__ == "__main__":
+    main()
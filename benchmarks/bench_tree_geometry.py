@@ -0,0 +1,87 @@
+"""Times tree_generator's NumPy geometry for single trees and batches.
+
+Also times the forest scatter: building a variant pool once and drawing
+placements for large tree counts, which is all the NumPy work create_forest
+does before handing the transforms to Blender.
+
+Builds the trunk, branch and leaf vertices and faces of seeded trees outside
+Blender and checks that every face references valid vertices, and that the
+leaf icosphere has primitive_ico_sphere_add's vertex counts. In Blender the
+remaining cost is one foreach_set per attribute per tree mesh.
+
+Run from the repo root: python benchmarks/bench_tree_geometry.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import catalog_scripts  # noqa: E402
+
+tree_generator = catalog_scripts.load("tree_generator")
+
+BATCH_SIZES = (1, 50, 500)
+SCATTER_SIZES = (1_000, 100_000, 1_000_000)
+VARIANTS = 8
+
+
+def check(part):
+    verts, loops, sizes = part
+    assert loops.min() >= 0 and loops.max() < len(verts)
+    assert sizes.sum() == len(loops)
+    assert np.isfinite(verts).all()
+
+
+def main():
+    # Vertex counts of primitive_ico_sphere_add at the same subdivisions
+    for subdivisions, vertex_count in ((1, 12), (2, 42), (3, 162)):
+        sphere = tree_generator.ico_sphere(subdivisions)
+        check(sphere)
+        assert len(sphere[0]) == vertex_count, (subdivisions, len(sphere[0]))
+        assert np.allclose(np.linalg.norm(sphere[0], axis=1), 1.0)
+
+    leaf = tree_generator.ico_sphere()
+    part = tree_generator.tree_geometry(tree_generator.tree_rng(0, 0), leaf)
+    check(part)
+    print(f"one tree: {len(part[0])} vertices, {len(part[2])} faces")
+
+    for count in BATCH_SIZES:
+        start = time.perf_counter()
+        vertex_count = 0
+        for index in range(count):
+            part = tree_generator.tree_geometry(tree_generator.tree_rng(0, index), leaf)
+            vertex_count += len(part[0])
+        elapsed = time.perf_counter() - start
+        print(
+            f"{count:4d} trees: {elapsed * 1e3:8.1f} ms "
+            f"({elapsed / count * 1e3:.2f} ms per tree, {vertex_count} vertices)"
+        )
+
+    start = time.perf_counter()
+    pool = [
+        tree_generator.tree_geometry(tree_generator.tree_rng(0, index), leaf)
+        for index in range(VARIANTS)
+    ]
+    pool_time = time.perf_counter() - start
+    pool_vertices = sum(len(part[0]) for part in pool)
+    print(f"{VARIANTS} variants: {pool_time * 1e3:8.1f} ms, {pool_vertices} vertices")
+
+    for count in SCATTER_SIZES:
+        start = time.perf_counter()
+        transforms = tree_generator.scatter_transforms(
+            np.random.default_rng([0, count]), count, VARIANTS, 200.0
+        )
+        elapsed = time.perf_counter() - start
+        size = sum(array.nbytes for array in transforms)
+        print(
+            f"{count:8d} placements: {elapsed * 1e3:8.1f} ms, "
+            f"{size / 2**20:.1f} MB of transforms"
+        )
+
+
+if __name__ == "__main__":
+    main()
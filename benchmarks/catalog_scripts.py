@@ -0,0 +1,34 @@
+"""Imports catalog scripts from ``UIFrontend/scripts`` outside of Blender.
+
+Catalog scripts are single files sent into Blender as text, so they import
+``bpy`` at module level even when most of their work is plain NumPy. Blender
+modules that cannot be imported here are registered as empty placeholder
+modules before loading, which lets benchmarks call the Blender-independent
+helpers; anything that actually touches Blender still fails with an
+AttributeError.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+import types
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), "..", "UIFrontend", "scripts")
+BLENDER_MODULES = ("bpy", "bmesh", "mathutils")
+
+
+def load(name):
+    for module_name in BLENDER_MODULES:
+        if module_name in sys.modules:
+            continue
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            sys.modules[module_name] = types.ModuleType(module_name)
+
+    path = os.path.join(SCRIPTS_DIR, f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"catalog_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,49 @@
+"""Stand-in for ``blender -b`` used to exercise batch_render's scheduler.
+
+Understands the arguments batch_render passes to its workers (``-t``, ``-o``,
+``-f`` or ``-s``/``-e``/``-a``, and the camera after ``--``). For each frame it
+sleeps, prints Blender-style ``Fra:`` progress and ``Saved:`` lines and writes
+a small file at the output path. ``FAKE_BLENDER_SECONDS`` sets the time per
+frame and a camera named ``fail`` exits with an error.
+"""
+
+import os
+import sys
+import time
+
+SECONDS_PER_FRAME = float(os.environ.get("FAKE_BLENDER_SECONDS", "0.1"))
+
+
+def option(args, name, default=None):
+    return args[args.index(name) + 1] if name in args else default
+
+
+def main():
+    args, camera = sys.argv[1:], None
+    if "--" in args:
+        args, camera = args[: args.index("--")], args[args.index("--") + 1]
+
+    prefix = option(args, "-o")
+    if "-f" in args:
+        frames = [int(option(args, "-f"))]
+    else:
+        frames = range(int(option(args, "-s")), int(option(args, "-e")) + 1)
+
+    print(f"Blender (fake) rendering {camera} with {option(args, '-t')} threads")
+    if camera == "fail":
+        print("Error: camera not found")
+        sys.exit(1)
+
+    for frame in frames:
+        for sample in (1, 2):
+            print(f"Fra:{frame} Mem:1.00M | Rendering {sample} / 2 samples", flush=True)
+            time.sleep(SECONDS_PER_FRAME / 2)
+        path = f"{prefix}{frame:04d}.png"
+        with open(path, "wb") as file:
+            file.write(b"\x89PNG fake frame")
+        print(f"Saved: '{path}'", flush=True)
+    print("Blender quit")
+
+
+if __name__ == "__main__":
+    main()
@@ -103,6 +103,15 @@ if errorlevel 1 (
     echo ERROR: Failed to copy Python addon file
     exit /b 1
 )
+for %%f in ("%PY_DIR%\*.py") do (
+    if /i not "%%~nxf"=="install_in_blender.py" (
+        copy /y "%%f" "%STAGING%\" >nul
+        if errorlevel 1 (
+            echo ERROR: Failed to copy Python module %%~nxf
+            exit /b 1
+        )
+    )
+)
 
 echo Copying web UI assets...
 if exist "%UI_DIR%\dist" (